@@ -1,4 +1,17 @@
-from importlib.metadata import distribution as __dist
+import typing
 
-__version__ = __dist("fabricius").version
-__author__ = __dist("fabricius").metadata["Author"]
+if typing.TYPE_CHECKING:
+    __version__: str
+    __author__: str
+
+
+def __getattr__(name: str) -> str:
+    # The package's metadata is only looked up once asked for, as it scans "sys.path".
+    if name not in ("__version__", "__author__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib.metadata import metadata
+
+    data = metadata("fabricius")
+    globals().update(__version__=data["Version"], __author__=data["Author"])
+    return globals()[name]
@@ -0,0 +1,3 @@
+from fabricius.app.cli import main
+
+main(prog_name="fabricius")
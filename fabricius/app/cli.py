@@ -0,0 +1,388 @@
+import contextlib
+import json
+import pathlib
+import sys
+import typing
+
+import click
+
+from fabricius.types import FileCommitResult
+
+if typing.TYPE_CHECKING:
+    from fabricius.models.stats import TemplateStats
+
+
+def _parse_extra_context(
+    _: click.Context, __: click.Parameter, values: tuple[str, ...]
+) -> dict[str, str]:
+    context: dict[str, str] = {}
+    for value in values:
+        key, separator, answer = value.partition("=")
+        if not separator:
+            raise click.BadParameter(f"'{value}' is not a key=value pair.")
+        context[key] = answer
+    return context
+
+
+def _file_json(result: FileCommitResult) -> dict[str, typing.Any]:
+    return {
+        "name": result["name"],
+        "destination": str(result["destination"]),
+        "state": result["state"],
+        "fake": result["fake"],
+        "bytes_written": result["bytes_written"],
+        "timings": result["timings"],
+    }
+
+
+def _project_json(
+    output_folder: pathlib.Path,
+    files: list[FileCommitResult],
+    stats: "TemplateStats | None",
+    error: BaseException | None,
+) -> dict[str, typing.Any]:
+    return {
+        "output_folder": str(output_folder),
+        "error": _describe(error) if error else None,
+        "files": [_file_json(result) for result in files],
+        "stats": stats.as_dict() if stats else None,
+    }
+
+
+def _describe(error: BaseException) -> str:
+    if isinstance(error, FileExistsError):
+        return f"{error.filename} already exists. (Use --overwrite-if-exists to overwrite it)"
+    return str(error)
+
+
+def _exit_code(error: BaseException) -> int:
+    return getattr(error, "exit_code", None) or 1
+
+
+@contextlib.contextmanager
+def _reading_template() -> typing.Iterator[None]:
+    # A template that cannot be read is the user's mistake, not worth a traceback.
+    from fabricius.exceptions import TemplateError
+
+    try:
+        yield
+    except TemplateError as exception:
+        raise click.ClickException(str(exception)) from exception
+
+
+def _watch(
+    template: pathlib.Path,
+    output_folder: pathlib.Path,
+    extra_context: dict[str, str],
+    hooks_mode: typing.Any,
+    poll: bool,
+) -> None:
+    from fabricius.readers.cookiecutter.watch import watch
+
+    def report(results: list[FileCommitResult], elapsed: float) -> None:
+        click.echo(f"Generated {len(results)} files into {output_folder} in {elapsed:.2f}s")
+
+    click.echo(f"Watching {template}, press Ctrl+C to stop.")
+    try:
+        watch(
+            template,
+            output_folder,
+            extra_context=extra_context,
+            polling=poll,
+            hooks_mode=hooks_mode,
+            callback=report,
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def _generate_with_daemon(
+    template: pathlib.Path,
+    output_dir: pathlib.Path,
+    extra_context: dict[str, str],
+    overwrite: bool,
+    jobs: int | None,
+    hooks_mode: typing.Any,
+    as_json: bool,
+    socket_path: pathlib.Path | None,
+) -> None:
+    # Only the standard library is imported, the daemon does everything else.
+    from fabricius.app.daemon import Request, default_socket_path, request
+
+    output_folder = output_dir.resolve()
+    payload = Request(
+        template=str(template.resolve()),
+        output_dir=str(output_folder),
+        context=extra_context,
+        overwrite=overwrite,
+        jobs=jobs,
+        hooks=hooks_mode,
+    )
+    files: list[dict[str, typing.Any]] = []
+    try:
+        for event in request(socket_path or default_socket_path(), payload):
+            if event["event"] == "file":
+                files.append(dict(event))
+    except OSError as exception:
+        raise click.ClickException(f"Cannot reach the daemon: {exception}") from exception
+    done = event
+
+    if as_json:
+        click.echo(
+            json.dumps(
+                {"output_folder": str(output_folder), "error": done["error"], "files": files}
+            )
+        )
+    elif done["error"] is None:
+        click.echo(f"Generated {len(files)} files into {output_folder}")
+    else:
+        click.echo(f"Failed to generate {output_folder}: {done['error']}", err=True)
+    if done["error"] is not None:
+        raise SystemExit(done["exit_code"])
+
+
+@click.group()
+def main() -> None:
+    """
+    Fabricius: The supportive templating engine for Python!
+    """
+
+
+@main.command()
+@click.argument("template", type=click.Path(exists=True, path_type=pathlib.Path))
+@click.argument("extra_context", nargs=-1, callback=_parse_extra_context)
+@click.option(
+    "-o",
+    "--output-dir",
+    type=click.Path(file_okay=False, path_type=pathlib.Path),
+    default=".",
+    show_default=True,
+    help="Where to generate the project. With --batch, the folder containing the projects.",
+)
+@click.option("--no-input", is_flag=True, help="Do not prompt, use the template's defaults.")
+@click.option(
+    "-f", "--overwrite-if-exists", "overwrite", is_flag=True, help="Overwrite existing files."
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Files rendered concurrently. With --batch, projects generated concurrently.",
+)
+@click.option(
+    "--batch",
+    type=click.File("r"),
+    help=(
+        "A JSON Lines file, with the answers of one project per line. Each project is generated "
+        "into the folder given by its '_output_dir' key, relative to --output-dir, or its line "
+        "number. Implies --no-input."
+    ),
+)
+@click.option(
+    "--hooks",
+    "hooks_mode",
+    type=click.Choice(["subprocess", "in-process", "worker"]),
+    default="subprocess",
+    show_default=True,
+    help="How to run Python hooks.",
+)
+@click.option(
+    "--json", "as_json", is_flag=True, help="Print the results & timings as JSON, for scripts."
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help=(
+        "Keep watching the template, and regenerate the files affected by each change. "
+        "Implies --no-input, and always overwrites the generated files. Cannot be used with "
+        "--overwrite-if-exists nor --jobs."
+    ),
+)
+@click.option("--poll", is_flag=True, help="With --watch, poll the template instead of inotify.")
+@click.option(
+    "--daemon",
+    "use_daemon",
+    is_flag=True,
+    help="Ask a running 'fabricius daemon' to generate the project. Implies --no-input.",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help="The socket of the daemon, with --daemon.",
+)
+def generate(
+    template: pathlib.Path,
+    extra_context: dict[str, str],
+    output_dir: pathlib.Path,
+    no_input: bool,
+    overwrite: bool,
+    jobs: int | None,
+    batch: typing.TextIO | None,
+    hooks_mode: typing.Any,
+    as_json: bool,
+    watch: bool,
+    poll: bool,
+    use_daemon: bool,
+    socket_path: pathlib.Path | None,
+) -> None:
+    """
+    Generate a project from a CookieCutter TEMPLATE, a folder or a zip/tar archive.
+
+    Answers can be given as EXTRA_CONTEXT, as key=value pairs.
+    """
+    if use_daemon:
+        if batch is not None or watch:
+            raise click.UsageError("--daemon cannot be used with --batch nor --watch.")
+        if hooks_mode == "in-process":
+            raise click.UsageError("--daemon cannot run hooks in-process.")
+        _generate_with_daemon(
+            template, output_dir, extra_context, overwrite, jobs, hooks_mode, as_json, socket_path
+        )
+        return
+
+    if watch:
+        if batch is not None or as_json:
+            raise click.UsageError("--watch cannot be used with --batch nor --json.")
+        if overwrite or jobs is not None:
+            raise click.UsageError(
+                "--watch always overwrites the generated files, one at a time. It cannot be "
+                "used with --overwrite-if-exists nor --jobs."
+            )
+        with _reading_template():
+            _watch(template, output_dir.resolve(), extra_context, hooks_mode, poll)
+        return
+
+    if batch is not None:
+        # Imported here so that "--help" stays fast.
+        from fabricius.readers.cookiecutter.batch import prepare
+
+        contexts: list[dict[str, typing.Any]] = []
+        output_folders: list[pathlib.Path] = []
+        for number, line in enumerate(batch, 1):
+            if not line.strip():
+                continue
+            try:
+                answers = json.loads(line)
+            except json.JSONDecodeError as exception:
+                raise click.BadParameter(
+                    f"Line {number} is not valid JSON: {exception}", param_hint="'--batch'"
+                ) from exception
+            if not isinstance(answers, dict):
+                raise click.BadParameter(
+                    f"Line {number} is not a JSON object.", param_hint="'--batch'"
+                )
+            context = {**extra_context, **answers}
+            output_folders.append(output_dir.joinpath(str(context.pop("_output_dir", number))))
+            contexts.append(context)
+
+        with _reading_template():
+            prepared = prepare(template, hooks_mode=hooks_mode)
+        results = prepared.generate_many(
+            contexts, output_folders, jobs=jobs, overwrite=overwrite, timings=as_json
+        )
+
+        failed = [result for result in results if result["error"]]
+        if as_json:
+            projects = [
+                _project_json(
+                    result["output_folder"], result["files"], result["stats"], result["error"]
+                )
+                for result in results
+            ]
+            click.echo(json.dumps({"projects": projects}))
+        else:
+            for result in results:
+                if result["error"]:
+                    click.echo(
+                        f"Failed {result['output_folder']}: {_describe(result['error'])}",
+                        err=True,
+                    )
+                else:
+                    click.echo(f"Generated {result['output_folder']}")
+        if failed:
+            raise SystemExit(_exit_code(typing.cast(BaseException, failed[0]["error"])))
+        return
+
+    from fabricius.readers.cookiecutter.setup import setup
+
+    output_folder = output_dir.resolve()
+    with _reading_template():
+        project = setup(
+            template,
+            output_folder,
+            extra_context=extra_context,
+            no_prompt=no_input,
+            hooks_mode=hooks_mode,
+        )
+
+    files: list[FileCommitResult] = []
+    error: Exception | None = None
+    try:
+        if as_json:
+            files = project.commit(overwrite=overwrite, jobs=jobs, timings=True)
+        elif sys.stdout.isatty():
+            from fabricius.app.ui import TemplateProgressBar
+
+            progress = TemplateProgressBar(len(project.files))
+            with progress.begin("Generating"):
+                files = project.commit(overwrite=overwrite, jobs=jobs)
+        else:
+            # Nothing would be rendered, don't pay for Rich's import.
+            from fabricius.app.headless import LogProgress
+
+            with LogProgress(len(project.files)).begin("Generating"):
+                files = project.commit(overwrite=overwrite, jobs=jobs)
+    except Exception as exception:
+        error = exception
+
+    if as_json:
+        click.echo(json.dumps(_project_json(output_folder, files, project.stats, error)))
+    elif error is None:
+        click.echo(f"Generated {len(files)} files into {output_folder}")
+    else:
+        click.echo(f"Failed to generate {output_folder}: {_describe(error)}", err=True)
+    if error is not None:
+        raise SystemExit(_exit_code(error))
+
+
+@main.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help=(
+        "The socket to listen on. By default, inside $XDG_RUNTIME_DIR or a private folder of the "
+        "temporary folder."
+    ),
+)
+@click.option(
+    "--hooks",
+    "hooks_mode",
+    type=click.Choice(["subprocess", "worker"]),
+    default="subprocess",
+    show_default=True,
+    help="How to run Python hooks, when a request does not tell. Never in-process.",
+)
+@click.option("--stop", is_flag=True, help="Stop the daemon listening on the socket.")
+def daemon(socket_path: pathlib.Path | None, hooks_mode: typing.Any, stop: bool) -> None:
+    """
+    Keep templates prepared in memory, and generate projects for 'fabricius generate --daemon'.
+    """
+    from fabricius.app.daemon import Daemon, default_socket_path, request
+
+    socket_path = socket_path or default_socket_path()
+    if stop:
+        try:
+            for _ in request(socket_path, {"command": "shutdown"}):
+                pass
+        except OSError as exception:
+            raise click.ClickException(f"Cannot reach the daemon: {exception}") from exception
+        click.echo(f"Stopped the daemon listening on {socket_path}")
+        return
+
+    click.echo(f"Listening on {socket_path}")
+    try:
+        Daemon(hooks_mode=hooks_mode).serve(socket_path)
+    except KeyboardInterrupt:
+        pass
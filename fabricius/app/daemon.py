@@ -0,0 +1,327 @@
+import json
+import logging
+import os
+import pathlib
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from fabricius.readers.cookiecutter.batch import PreparedTemplate
+    from fabricius.readers.cookiecutter.hooks import HookMode
+    from fabricius.types import FileCommitResult
+
+_log = logging.getLogger(__name__)
+
+PROTOCOL = 1
+"""
+The version of the protocol, sent back by ``ping``.
+"""
+
+
+class Request(typing.TypedDict, total=False):
+    """
+    A request sent to the daemon, as one line of JSON.
+
+    Either a ``command`` (``"ping"`` or ``"shutdown"``), or a project to generate, from a
+    ``template`` into an ``output_dir``.
+    """
+
+    command: str
+    template: str
+    """
+    The absolute path of the CookieCutter template, a folder or an archive.
+    """
+
+    output_dir: str
+    """
+    The absolute path of the folder to generate the project into.
+    """
+
+    context: dict[str, typing.Any]
+    """
+    The answers, the defaults are used for the others.
+    """
+
+    overwrite: bool
+    jobs: int | None
+    hooks: "HookMode"
+
+
+class Event(typing.TypedDict, total=False):
+    """
+    An event sent back by the daemon, as one line of JSON.
+
+    A generation sends a ``"file"`` event for each committed file, as soon as it is committed,
+    then a ``"done"`` event. A command sends a single ``"pong"`` or ``"done"`` event.
+    """
+
+    event: typing.Literal["file", "done", "pong"]
+    name: str
+    destination: str
+    state: str
+    output_dir: str
+    files: int
+    error: str | None
+    exit_code: int
+    elapsed: float
+    protocol: int
+    pid: int
+
+
+def default_socket_path() -> pathlib.Path:
+    """
+    The socket used when none is given: inside ``$XDG_RUNTIME_DIR`` if set, otherwise inside of
+    a folder of the temporary directory that only the current user can access, created by the
+    daemon.
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return pathlib.Path(runtime, "fabricius.sock")
+    return pathlib.Path(tempfile.gettempdir(), f"fabricius-{os.getuid()}", "daemon.sock")
+
+
+def _secure_directory(directory: str) -> None:
+    """
+    Create the folder of a socket if it does not exist, then check that no other user could
+    have placed or replaced the socket: the folder must belong to the current user, and must not
+    be writable by anyone else.
+
+    Raises
+    ------
+    :py:exc:`PermissionError` :
+        The folder is not safe to use.
+    """
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    status = os.lstat(directory)
+    if not stat.S_ISDIR(status.st_mode):
+        raise PermissionError(f"{directory} is not a folder.")
+    if status.st_uid != os.getuid():
+        raise PermissionError(f"{directory} belongs to another user.")
+    if status.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"{directory} can be written by other users.")
+
+
+class Daemon:
+    """
+    Generates CookieCutter projects for the clients of a Unix socket, keeping each template
+    prepared (Read, and its file templates compiled) in memory between requests, so that a
+    request only pays for rendering.
+
+    A template is prepared again once it is modified. (See
+    :py:func:`fabricius.readers.cookiecutter.snapshot.get_snapshot`)
+    """
+
+    hooks_mode: "HookMode"
+    """
+    How hooks are ran when a request does not tell. Requests are handled concurrently, so hooks
+    are never ran ``"in-process"``.
+    """
+
+    _templates: dict[tuple[str, str], "PreparedTemplate"]
+    _lock: threading.Lock
+    _server: "socketserver.ThreadingUnixStreamServer | None"
+
+    def __init__(self, *, hooks_mode: "HookMode" = "subprocess") -> None:
+        if hooks_mode == "in-process":
+            raise ValueError("The daemon cannot run hooks in-process.")
+        self.hooks_mode = hooks_mode
+        self._templates = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def prepare(self, template: str, hooks_mode: "HookMode") -> "PreparedTemplate":
+        """
+        Obtain a prepared template, preparing it again only if it was modified.
+        """
+        from fabricius.readers.cookiecutter.batch import prepare
+        from fabricius.readers.cookiecutter.setup import take_snapshot
+        from fabricius.readers.cookiecutter.snapshot import get_snapshot
+        from fabricius.sources.archive import open_template
+
+        key = (template, hooks_mode)
+        prepared = self._templates.get(key)
+        if prepared is not None:
+            snapshot = get_snapshot(open_template(template), take_snapshot)
+            if snapshot is prepared.snapshot:
+                return prepared
+        prepared = prepare(template, hooks_mode=hooks_mode)
+        with self._lock:
+            self._templates[key] = prepared
+        return prepared
+
+    def handle(self, request: Request, send: typing.Callable[[Event], None]) -> None:
+        """
+        Handle a request, sending its events.
+        """
+        command = request.get("command", "generate")
+        if command == "ping":
+            send(Event(event="pong", protocol=PROTOCOL, pid=os.getpid()))
+            return
+        if command == "shutdown":
+            send(Event(event="done", error=None, exit_code=0))
+            if self._server is not None:
+                # shutdown() waits for serve_forever() to return, which this thread blocks.
+                threading.Thread(target=self._server.shutdown).start()
+            return
+        if command != "generate":
+            send(Event(event="done", error=f"Unknown command '{command}'", exit_code=2))
+            return
+
+        start = time.perf_counter()
+        output_dir = request.get("output_dir", "")
+        committed = 0
+        lock = threading.Lock()
+
+        def file_committed(_: typing.Any, result: "FileCommitResult") -> None:
+            nonlocal committed
+            with lock:
+                committed += 1
+                send(
+                    Event(
+                        event="file",
+                        name=result["name"],
+                        destination=str(result["destination"]),
+                        state=result["state"],
+                    )
+                )
+
+        try:
+            if not os.path.isabs(request["template"]) or not os.path.isabs(output_dir):
+                raise ValueError("The template and the output folder must be absolute paths.")
+            hooks_mode = request.get("hooks", self.hooks_mode)
+            if hooks_mode == "in-process":
+                raise ValueError("The daemon cannot run hooks in-process.")
+            prepared = self.prepare(request["template"], hooks_mode)
+            project = prepared.build(request.get("context", {}), output_dir)
+            project.signals.after_file_commit.connect(file_committed)
+            project.commit(overwrite=request.get("overwrite", False), jobs=request.get("jobs"))
+        except Exception as exception:
+            from fabricius.app.cli import _describe
+
+            _log.info("Could not generate %s", output_dir, exc_info=True)
+            send(
+                Event(
+                    event="done",
+                    output_dir=output_dir,
+                    files=committed,
+                    error=_describe(exception),
+                    exit_code=getattr(exception, "exit_code", None) or 1,
+                    elapsed=time.perf_counter() - start,
+                )
+            )
+            return
+        send(
+            Event(
+                event="done",
+                output_dir=output_dir,
+                files=committed,
+                error=None,
+                exit_code=0,
+                elapsed=time.perf_counter() - start,
+            )
+        )
+
+    def serve(self, path: "str | os.PathLike[str]") -> None:
+        """
+        Listen on a Unix socket until a ``shutdown`` command is received. The socket can only
+        be used by the current user, and is removed once the daemon stops.
+
+        The folder of the socket is created if needed, and must belong to the current user
+        without being writable by others.
+
+        Raises
+        ------
+        :py:exc:`OSError` :
+            The socket is used by another daemon.
+        :py:exc:`PermissionError` :
+            The folder of the socket is not safe to use.
+        """
+        path = os.fspath(path)
+        _secure_directory(os.path.dirname(os.path.abspath(path)))
+        if os.path.exists(path):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                    probe.connect(path)
+            except OSError:
+                os.unlink(path)  # Left by a daemon that died.
+            else:
+                raise OSError(f"A daemon is already listening on {path}")
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                write_lock = threading.Lock()
+
+                def send(event: Event) -> None:
+                    with write_lock:
+                        self.wfile.write(json.dumps(event).encode("utf-8") + b"\n")
+                        self.wfile.flush()
+
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                    except json.JSONDecodeError as exception:
+                        send(
+                            Event(event="done", error=f"Invalid request: {exception}", exit_code=2)
+                        )
+                        continue
+                    daemon.handle(request, send)
+
+        previous_umask = os.umask(0o077)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(path, Handler)
+        finally:
+            os.umask(previous_umask)
+        server.daemon_threads = True
+        self._server = server
+        try:
+            with server:
+                server.serve_forever()
+        finally:
+            self._server = None
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def request(
+    path: "str | os.PathLike[str]", payload: Request, *, timeout: float | None = None
+) -> typing.Iterator[Event]:
+    """
+    Send a request to a daemon, and yield its events as they arrive, until its ``"done"`` or
+    ``"pong"`` event.
+
+    This module only imports the standard library at its top, so that a client stays fast to
+    start.
+
+    .. code-block:: py
+
+       for event in request(default_socket_path(), {"template": ..., "output_dir": ...}):
+           print(event)
+
+    Raises
+    ------
+    :py:exc:`OSError` :
+        No daemon is listening on the socket.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(os.fspath(path))
+        client.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with client.makefile("rb") as stream:
+            for line in stream:
+                event: Event = json.loads(line)
+                yield event
+                if event["event"] in ("done", "pong"):
+                    return
+    raise ConnectionError("The daemon closed the connection before answering.")
@@ -0,0 +1,94 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Generator
+
+from fabricius.app.signals import after_file_commit
+from fabricius.models.file import File
+from fabricius.types import FileCommitResult
+
+_log = logging.getLogger(__name__)
+
+
+class LogProgress:
+    """
+    Reports the progress of a commit through :py:mod:`logging`, instead of a progress bar.
+
+    Unlike :py:class:`fabricius.app.ui.TemplateProgressBar`, it does not need Rich, which makes
+    it suitable for batch jobs, containers and other places where nothing is watching a
+    terminal.
+    """
+
+    total_files: int
+    """
+    The total files to process.
+    """
+
+    interval: float
+    """
+    The minimum time, in seconds, between two progress messages.
+    """
+
+    logger: logging.Logger
+    """
+    The logger the progress is reported to, at the ``INFO`` level.
+    """
+
+    _completed: int
+    _bytes: int
+    _started: float
+    _last_report: float
+
+    def __init__(
+        self, total_files: int, *, interval: float = 1, logger: logging.Logger | None = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        total_files : :py:class:`int`
+            The total files to process.
+        interval : :py:class:`float`
+            The minimum time, in seconds, between two progress messages. Default to ``1``.
+        logger : :py:class:`logging.Logger`, optional
+            The logger to report the progress to. Default to this module's logger.
+        """
+        self.total_files = total_files
+        self.interval = interval
+        self.logger = logger or _log
+        self._completed = 0
+        self._bytes = 0
+        self._started = 0
+        self._last_report = 0
+
+    @contextmanager
+    def begin(self, first_message: str) -> Generator["LogProgress", Any, None]:
+        if not self.logger.isEnabledFor(logging.INFO):
+            # Nothing would be logged, don't even listen.
+            yield self
+            return
+
+        self.logger.info(first_message)
+        self._started = self._last_report = time.monotonic()
+        try:
+            after_file_commit.connect(self._increase)
+            yield self
+        finally:
+            after_file_commit.disconnect(self._increase)
+            self.logger.info(
+                "Committed %d/%d files (%d bytes) in %.2fs",
+                self._completed,
+                self.total_files,
+                self._bytes,
+                time.monotonic() - self._started,
+            )
+
+    def _increase(self, file: File, result: FileCommitResult) -> None:
+        self._completed += 1
+        self._bytes += result["bytes_written"]
+
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.logger.info(
+                "Committed %d/%d files, last: %s", self._completed, self.total_files, file.name
+            )
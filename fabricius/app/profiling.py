@@ -0,0 +1,142 @@
+import contextlib
+import cProfile
+import json
+import os
+import pathlib
+import threading
+import time
+import typing
+
+from fabricius.types import PathStrOrPath
+
+PROFILE_ENVIRONMENT_VARIABLE = "FABRICIUS_PROFILE"
+"""
+The environment variable that enables the profiling of commits when set to an output path.
+"""
+
+_lock = threading.Lock()
+_active = False
+_recorder: "TraceRecorder | None" = None
+_nothing = contextlib.nullcontext()
+
+
+class TraceRecorder:
+    """
+    Records spans as Chrome trace events, which can be loaded into ``chrome://tracing``,
+    `Perfetto <https://ui.perfetto.dev>`_ or `Speedscope <https://speedscope.app>`_.
+    """
+
+    events: list[dict[str, typing.Any]]
+    """
+    The recorded trace events.
+    """
+
+    def __init__(self) -> None:
+        self.events = []
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args: typing.Any) -> typing.Iterator[None]:
+        """
+        Record the time spent inside the context manager.
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            # list.append is atomic, no lock needed.
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": self._pid,
+                    "tid": threading.get_ident(),
+                    "args": args,
+                }
+            )
+
+    def dump(self, output: pathlib.Path) -> None:
+        """
+        Write the trace events into a JSON file.
+        """
+        output.write_text(json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"}))
+
+
+def span(name: str, category: str, **args: typing.Any) -> typing.ContextManager[None]:
+    """
+    Record a span inside the trace being captured, if any. Does nothing otherwise.
+
+    Parameters
+    ----------
+    name : :py:class:`str`
+        The name of the span.
+    category : :py:class:`str`
+        The category of the span. (For example, ``"file"``, ``"render"`` or ``"hook"``)
+    **args :
+        Additional information to attach to the span.
+    """
+    recorder = _recorder
+    if recorder is None:
+        return _nothing
+    return recorder.span(name, category, **args)
+
+
+@contextlib.contextmanager
+def profile(output: "PathStrOrPath | None" = None) -> typing.Iterator[None]:
+    """
+    Profile everything that happens inside the context manager.
+
+    If ``output`` ends with ``.json``, a Chrome trace is written, with one span per file, per
+    render and per hook. Otherwise, :py:mod:`cProfile` is used and its statistics are written,
+    ready to be read with :py:mod:`pstats`, ``snakeviz``, etc.
+
+    Nested profiles are ignored: only the outermost one is captured.
+
+    Parameters
+    ----------
+    output : :py:const:`fabricius.types.PathStrOrPath`, optional
+        Where to write the profile. Default to the value of the ``FABRICIUS_PROFILE``
+        environment variable. If neither are set, nothing is profiled.
+    """
+    global _active, _recorder
+
+    if output is None:
+        output = os.environ.get(PROFILE_ENVIRONMENT_VARIABLE) or None
+
+    with _lock:
+        if output is None or _active:
+            capture = False
+        else:
+            capture = _active = True
+
+    if not capture:
+        yield
+        return
+
+    assert output is not None
+    path = pathlib.Path(output)
+    try:
+        if path.suffix == ".json":
+            recorder = TraceRecorder()
+            _recorder = recorder
+            try:
+                with recorder.span("profile", "fabricius"):
+                    yield
+            finally:
+                _recorder = None
+                recorder.dump(path)
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                profiler.dump_stats(path)
+    finally:
+        _active = False
@@ -4,6 +4,7 @@ from fabricius.models.signal import Signal
 
 if typing.TYPE_CHECKING:
     from fabricius.models.file import File, FileCommitResult
+    from fabricius.models.stats import TemplateStats
     from fabricius.models.template import Template
 
     def before_file_commit_hint(file: File):
@@ -23,12 +24,16 @@ if typing.TYPE_CHECKING:
     ):
         ...
 
+    def on_template_stats_hint(template: Template[typing.Any], stats: TemplateStats):
+        ...
+
 else:
     before_file_commit_hint = None
     on_file_commit_fail_hint = None
     after_file_commit_hint = None
     before_template_commit_hint = None
     after_template_commit_hint = None
+    on_template_stats_hint = None
 
 
 before_file_commit = Signal(func_hint=before_file_commit_hint)
@@ -58,3 +63,123 @@ after_template_commit = Signal(func_hint=after_template_commit_hint)
 A Signal called when a :py:obj:`Template <fabricius.models.template.Template>` has committed all
 the files.
 """
+
+on_template_stats = Signal(func_hint=on_template_stats_hint)
+"""
+A Signal called when a :py:obj:`Template <fabricius.models.template.Template>` has been committed
+with ``timings=True``, with its :py:class:`TemplateStats <fabricius.models.stats.TemplateStats>`.
+Use it to forward the statistics to your metrics system.
+"""
+
+
+class FileSignals:
+    """
+    Signals scoped to a :py:obj:`File <fabricius.models.file.File>`.
+
+    Listeners connected to these signals are only called for the file they belong to. Sending
+    one of these signals also sends its parent, up to the global signals of this module.
+    """
+
+    before_file_commit: Signal[...]
+    """
+    Scoped version of :py:data:`before_file_commit <fabricius.app.signals.before_file_commit>`.
+    """
+
+    on_file_commit_fail: Signal[...]
+    """
+    Scoped version of :py:data:`on_file_commit_fail <fabricius.app.signals.on_file_commit_fail>`.
+    """
+
+    after_file_commit: Signal[...]
+    """
+    Scoped version of :py:data:`after_file_commit <fabricius.app.signals.after_file_commit>`.
+    """
+
+    def __init__(self, parent: "FileSignals | None" = None) -> None:
+        """
+        Parameters
+        ----------
+        parent : :py:class:`FileSignals`, optional
+            The signals to send after these ones. Default to the global signals.
+        """
+        self.before_file_commit = Signal(func_hint=before_file_commit_hint)
+        self.on_file_commit_fail = Signal(func_hint=on_file_commit_fail_hint)
+        self.after_file_commit = Signal(func_hint=after_file_commit_hint)
+        self.link(parent)
+
+    def link(self, parent: "FileSignals | None") -> None:
+        """
+        Change the signals to send after these ones.
+
+        Parameters
+        ----------
+        parent : :py:class:`FileSignals`, optional
+            The new parent. If ``None``, the global signals.
+        """
+        self.before_file_commit.parent = (
+            parent.before_file_commit if parent else before_file_commit
+        )
+        self.on_file_commit_fail.parent = (
+            parent.on_file_commit_fail if parent else on_file_commit_fail
+        )
+        self.after_file_commit.parent = parent.after_file_commit if parent else after_file_commit
+
+    def __iter__(self) -> typing.Iterator[Signal[...]]:
+        yield self.before_file_commit
+        yield self.on_file_commit_fail
+        yield self.after_file_commit
+
+    def clear(self) -> None:
+        """
+        Disconnect all the listeners of these signals. Parents are left untouched.
+        """
+        self.before_file_commit.clear()
+        self.on_file_commit_fail.clear()
+        self.after_file_commit.clear()
+
+
+class TemplateSignals(FileSignals):
+    """
+    Signals scoped to a :py:obj:`Template <fabricius.models.template.Template>`.
+
+    The file signals are sent for each file of the template.
+    """
+
+    before_template_commit: Signal[...]
+    """
+    Scoped version of
+    :py:data:`before_template_commit <fabricius.app.signals.before_template_commit>`.
+    """
+
+    after_template_commit: Signal[...]
+    """
+    Scoped version of
+    :py:data:`after_template_commit <fabricius.app.signals.after_template_commit>`.
+    """
+
+    on_template_stats: Signal[...]
+    """
+    Scoped version of :py:data:`on_template_stats <fabricius.app.signals.on_template_stats>`.
+    """
+
+    def __init__(self) -> None:
+        self.before_template_commit = Signal(
+            func_hint=before_template_commit_hint, parent=before_template_commit
+        )
+        self.after_template_commit = Signal(
+            func_hint=after_template_commit_hint, parent=after_template_commit
+        )
+        self.on_template_stats = Signal(func_hint=on_template_stats_hint, parent=on_template_stats)
+        super().__init__()
+
+    def __iter__(self) -> typing.Iterator[Signal[...]]:
+        yield from super().__iter__()
+        yield self.before_template_commit
+        yield self.after_template_commit
+        yield self.on_template_stats
+
+    def clear(self) -> None:
+        super().clear()
+        self.before_template_commit.clear()
+        self.after_template_commit.clear()
+        self.on_template_stats.clear()
@@ -1,17 +1,22 @@
 import logging
+import time
 from contextlib import contextmanager
 from typing import Any, Generator
 
+from rich import get_console
+from rich.console import Console
 from rich.progress import (
     BarColumn,
     Progress,
+    ProgressColumn,
+    Task,
     TaskID,
     TaskProgressColumn,
     TextColumn,
     TimeRemainingColumn,
 )
+from rich.text import Text
 
-from fabricius.app.main import logging
 from fabricius.app.signals import after_file_commit
 from fabricius.models.file import File
 from fabricius.types import FileCommitResult
@@ -19,6 +24,28 @@ from fabricius.types import FileCommitResult
 _log = logging.getLogger(__name__)
 
 
+def _format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class ThroughputColumn(ProgressColumn):
+    """
+    Renders the average number of files & bytes written per second.
+    """
+
+    def render(self, task: Task) -> Text:
+        elapsed = task.elapsed
+        if not elapsed:
+            return Text("", style="progress.data.speed")
+        files = task.completed / elapsed
+        size = task.fields.get("bytes", 0) / elapsed
+        return Text(f"{files:.0f} files/s {_format_size(size)}/s", style="progress.data.speed")
+
+
 class TemplateProgressBar:
     total_files: int
     """
@@ -30,30 +57,93 @@ class TemplateProgressBar:
 
     task: TaskID | None
 
-    def __init__(self, total_files: int) -> None:
+    refresh_interval: float
+    """
+    The minimum time, in seconds, between two updates of the progress bar.
+    """
+
+    enabled: bool
+    """
+    If the progress bar is rendered. It is not when the console is not a terminal.
+    """
+
+    _completed: int
+    _bytes: int
+    _last_name: str | None
+    _last_update: float
+
+    def __init__(
+        self,
+        total_files: int,
+        *,
+        refresh_per_second: float = 10,
+        console: Console | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        total_files : :py:class:`int`
+            The total files to process.
+        refresh_per_second : :py:class:`float`
+            How many times per second the progress bar is updated. Default to ``10``.
+        console : :py:class:`rich.console.Console`, optional
+            The console to render the progress bar into. Default to Rich's global console.
+        """
         self.total_files = total_files
+        console = console or get_console()
+        self.enabled = console.is_terminal
         self.progress = Progress(
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TaskProgressColumn(),
+            ThroughputColumn(),
             TimeRemainingColumn(),
+            console=console,
+            refresh_per_second=refresh_per_second,
             transient=True,
+            disable=not self.enabled,
         )
+        self.refresh_interval = 1 / refresh_per_second
         self.task = None
+        self._completed = 0
+        self._bytes = 0
+        self._last_name = None
+        self._last_update = 0
 
     @contextmanager
     def begin(self, first_message: str) -> Generator[Progress, Any, None]:
+        if not self.enabled:
+            # Nothing would be rendered, don't even listen.
+            yield self.progress
+            return
+
         try:
             after_file_commit.connect(self._increase)
-            self.task = self.progress.add_task(first_message, total=self.total_files)
+            self.task = self.progress.add_task(first_message, total=self.total_files, bytes=0)
             with self.progress as progress:
                 yield progress
         finally:
             after_file_commit.disconnect(self._increase)
+            self._update()
             self.progress.stop()
 
     def _increase(self, file: File, result: FileCommitResult) -> None:
+        self._completed += 1
+        self._bytes += result["bytes_written"]
+        self._last_name = file.name
+
+        now = time.monotonic()
+        if now - self._last_update >= self.refresh_interval:
+            self._last_update = now
+            self._update()
+
+    def _update(self) -> None:
         if self.task is None:
             _log.warning("Progress or task not detected. Ignoring.")
             return
-        self.progress.update(self.task, advance=1, description=file.name)
+        self.progress.update(
+            self.task,
+            completed=self._completed,
+            bytes=self._bytes,
+            description=self._last_name or self.progress.tasks[0].description,
+        )
@@ -0,0 +1,474 @@
+import abc
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import select
+import struct
+import sys
+import threading
+import time
+import typing
+
+from fabricius.models.file import File
+from fabricius.models.sink import Sink
+from fabricius.models.template import Template
+from fabricius.types import FileCommitResult
+
+_log = logging.getLogger(__name__)
+
+IGNORED = frozenset({".git", ".hg", ".svn", "__pycache__", ".mypy_cache", ".pytest_cache"})
+"""
+The directories that are not watched.
+"""
+
+DEFAULT_DEBOUNCE = 0.1
+"""
+The default time, in seconds, without any change after which a burst of changes is reported.
+"""
+
+
+class Watcher(abc.ABC):
+    """
+    Watches directories, recursively, for changes.
+    """
+
+    roots: list[pathlib.Path]
+    """
+    The watched directories.
+    """
+
+    def __init__(self, roots: typing.Iterable[pathlib.Path]) -> None:
+        self.roots = [pathlib.Path(root).resolve() for root in roots]
+
+    @abc.abstractmethod
+    def wait(self, timeout: float | None) -> set[pathlib.Path]:
+        """
+        Wait for changes, at most ``timeout`` seconds.
+
+        Returns
+        -------
+        :py:class:`set` of :py:class:`pathlib.Path` :
+            The paths that were created, modified or deleted. Empty if nothing changed.
+        """
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        """
+        Stop watching.
+        """
+
+    def changes(
+        self,
+        *,
+        debounce: float = DEFAULT_DEBOUNCE,
+        stop: threading.Event | None = None,
+        poll: float = 0.5,
+    ) -> typing.Iterator[set[pathlib.Path]]:
+        """
+        Yield the changes, in bursts: once a change happens, changes are collected until none
+        happened for ``debounce`` seconds. (For example, an editor saving many files at once)
+
+        Parameters
+        ----------
+        debounce : :py:class:`float`
+            The time, in seconds, without changes that ends a burst.
+        stop : :py:class:`threading.Event`, optional
+            Once set, the iteration stops. It is checked every ``poll`` seconds.
+        poll : :py:class:`float`
+            How often, in seconds, ``stop`` is checked.
+        """
+        while stop is None or not stop.is_set():
+            changed = self.wait(poll)
+            if not changed:
+                continue
+            while more := self.wait(debounce):
+                changed |= more
+            yield changed
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *_: typing.Any) -> None:
+        self.close()
+
+
+class PollingWatcher(Watcher):
+    """
+    Watches directories by listing them periodically, and comparing the modification time and
+    size of their files. Works everywhere.
+    """
+
+    interval: float
+    """
+    The time, in seconds, between two listings.
+    """
+
+    _state: dict[pathlib.Path, tuple[int, int]]
+
+    def __init__(self, roots: typing.Iterable[pathlib.Path], *, interval: float = 0.2) -> None:
+        super().__init__(roots)
+        self.interval = interval
+        self._state = self._scan()
+
+    def _scan(self) -> dict[pathlib.Path, tuple[int, int]]:
+        state: dict[pathlib.Path, tuple[int, int]] = {}
+        pending = [str(root) for root in self.roots]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in IGNORED:
+                                pending.append(entry.path)
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    state[pathlib.Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def wait(self, timeout: float | None) -> set[pathlib.Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            state = self._scan()
+            changed = {
+                path
+                for path in state.keys() | self._state.keys()
+                if state.get(path) != self._state.get(path)
+            }
+            self._state = state
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            remaining = self.interval if deadline is None else deadline - time.monotonic()
+            time.sleep(max(0, min(self.interval, remaining)))
+
+
+_IN_MODIFY = 0x2
+_IN_ATTRIB = 0x4
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ISDIR = 0x40000000
+_IN_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+
+class InotifyWatcher(Watcher):
+    """
+    Watches directories with Linux's inotify, through :py:mod:`ctypes`, so that changes are
+    known as soon as they happen, without listing anything.
+
+    New directories are watched as soon as they are created. If the kernel's event queue
+    overflows, the roots are reported as changed.
+    """
+
+    _libc: typing.Any
+    _fd: int
+    _directories: dict[int, pathlib.Path]
+
+    def __init__(self, roots: typing.Iterable[pathlib.Path]) -> None:
+        """
+        Raises
+        ------
+        :py:exc:`OSError` :
+            inotify is not available.
+        """
+        super().__init__(roots)
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux.")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._directories = {}
+        for root in self.roots:
+            self._add_tree(root)
+
+    def _add_tree(self, root: pathlib.Path) -> None:
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            descriptor = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), ctypes.c_uint32(_IN_MASK)
+            )
+            if descriptor < 0:
+                error = ctypes.get_errno()
+                if error == 28:  # ENOSPC: Too many watches.
+                    raise OSError(error, os.strerror(error), str(directory))
+                continue
+            self._directories[descriptor] = directory
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False) and entry.name not in IGNORED:
+                            pending.append(pathlib.Path(entry.path))
+            except OSError:
+                continue
+
+    def wait(self, timeout: float | None) -> set[pathlib.Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed: set[pathlib.Path] = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                descriptor, mask, _, length = _EVENT.unpack_from(buffer, offset)
+                raw_name = buffer[offset + _EVENT.size : offset + _EVENT.size + length]
+                offset += _EVENT.size + length
+                if mask & _IN_Q_OVERFLOW:
+                    changed.update(self.roots)
+                    continue
+                directory = self._directories.get(descriptor)
+                if directory is None:
+                    continue
+                if mask & _IN_IGNORED:
+                    del self._directories[descriptor]
+                    continue
+                name = os.fsdecode(raw_name.rstrip(b"\0"))
+                if name in IGNORED:
+                    continue
+                path = directory.joinpath(name) if name else directory
+                changed.add(path)
+                if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._add_tree(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def get_watcher(roots: typing.Iterable[pathlib.Path], *, polling: bool = False) -> Watcher:
+    """
+    Obtain the best watcher available: :py:class:`InotifyWatcher` on Linux, otherwise (Or if
+    ``polling`` is True) :py:class:`PollingWatcher`.
+    """
+    roots = list(roots)
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except OSError as exception:
+            _log.warning("Cannot use inotify, polling instead: %s", exception)
+    return PollingWatcher(roots)
+
+
+class IncrementalCommit:
+    """
+    Commits the templates it is given, but only the files that changed since the last commit:
+    files whose source, renderer or data changed, and files that used a template (For example,
+    a partial) that changed. (See :py:func:`fabricius.models.template.dependency_graph`)
+
+    The first commit is a regular :py:meth:`Template.commit()
+    <fabricius.models.template.Template.commit>`, with its signals (And hooks). The following
+    ones only commit files, the template's signals are not sent.
+
+    Files are recognized by their destination. The sources of the files that were not read yet
+    are compared by their modification time and size, so unchanged files are not read.
+    """
+
+    sink: Sink | None
+    """
+    Where the files are written. Default to the local disk.
+    """
+
+    _keys: dict[pathlib.Path, bytes | None]
+    """
+    The fingerprint of the inputs of each file, by destination.
+    """
+
+    _dependencies: dict[pathlib.Path, frozenset[str]]
+    """
+    The templates used by each file, by destination.
+    """
+
+    def __init__(self, *, sink: Sink | None = None) -> None:
+        self.sink = sink
+        self._keys = {}
+        self._dependencies = {}
+
+    @property
+    def committed(self) -> bool:
+        """
+        If a template was already committed.
+        """
+        return bool(self._keys)
+
+    def commit(
+        self, template: Template[typing.Any], changed: typing.Iterable[pathlib.Path] = ()
+    ) -> list[FileCommitResult]:
+        """
+        Commit the files of a template that changed since the last commit.
+
+        Parameters
+        ----------
+        template : :py:class:`fabricius.models.template.Template`
+            The template, built again from its sources.
+        changed : Iterable of :py:class:`pathlib.Path`
+            The paths that changed, used to find the files whose templates (For example,
+            partials) changed.
+
+        Returns
+        -------
+        :py:class:`list` of :py:class:`fabricius.types.FileCommitResult` :
+            The result of the files that were committed.
+        """
+        template_data = _digest(template.data)
+        keys: dict[pathlib.Path, bytes | None] = {}
+        for file in template.files:
+            file.with_data(template.data, overwrite=False)
+            keys[file.compute_destination()] = _file_key(
+                file, template_data if file.data == template.data else _digest(file.data)
+            )
+
+        if not self.committed:
+            results = template.commit(overwrite=True, sink=self.sink)
+        else:
+            names = _template_names(changed)
+            results = []
+            for file in template.files:
+                destination = file.compute_destination()
+                key = keys[destination]
+                if (
+                    key is not None
+                    and self._keys.get(destination) == key
+                    and not names & self._dependencies.get(destination, frozenset())
+                ):
+                    continue
+                file._attach_signals(template.signals)
+                results.append(file.commit(overwrite=True, sink=self.sink))
+
+        for destination in self._keys.keys() - keys.keys():
+            _log.info("%s is not generated anymore, it is kept as is", destination)
+        self._keys = keys
+        for result in results:
+            self._dependencies[result["destination"]] = result["dependencies"]
+        return results
+
+
+def _digest(data: typing.Any) -> bytes | None:
+    try:
+        dumped = json.dumps(data, sort_keys=True, default=repr)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(dumped.encode("utf-8")).digest()
+
+
+def _file_key(file: File, data: bytes | None) -> bytes | None:
+    if data is None:
+        return None
+
+    key = hashlib.sha256(data)
+    key.update(f"{file.renderer.__module__}.{file.renderer.__qualname__}\0".encode())
+    key.update(f"{file.verbatim}\0".encode())
+    if isinstance(file.source, pathlib.Path) and (file.verbatim or file._content is None):
+        try:
+            stat = file.source.stat()
+        except OSError:
+            return None
+        key.update(f"{file.source}\0{stat.st_mtime_ns}\0{stat.st_size}".encode())
+    elif file.content is not None:
+        key.update(file.content.encode("utf-8"))
+    return key.digest()
+
+
+def _template_names(paths: typing.Iterable[pathlib.Path]) -> set[str]:
+    # The name a renderer knows a template by is relative to a folder of its loader, which is
+    # not known here: use all the possible names.
+    names: set[str] = set()
+    for path in paths:
+        parts = path.parts
+        names.update("/".join(parts[index:]) for index in range(1, len(parts)))
+    return names
+
+
+def watch(
+    build: typing.Callable[[], Template[typing.Any]],
+    roots: typing.Iterable[pathlib.Path],
+    *,
+    debounce: float = DEFAULT_DEBOUNCE,
+    polling: bool = False,
+    sink: Sink | None = None,
+    stop: threading.Event | None = None,
+    callback: typing.Callable[[list[FileCommitResult], float], typing.Any] | None = None,
+) -> None:
+    """
+    Commit a template, then watch its sources and commit the files that changed, until
+    ``stop`` is set (Or the process is interrupted).
+
+    .. code-block:: py
+
+       watch(
+           lambda: Template.from_directory("source", "output", JinjaRenderer),
+           ["source"],
+       )
+
+    Parameters
+    ----------
+    build : Callable
+        Builds the template from its sources, called again after each burst of changes.
+    roots : Iterable of :py:class:`pathlib.Path`
+        The directories to watch.
+    debounce : :py:class:`float`
+        The time, in seconds, without changes after which the files are committed.
+    polling : :py:class:`bool`
+        If the directories are listed periodically instead of using inotify.
+    sink : :py:class:`fabricius.models.sink.Sink`, optional
+        Where to write the files. Default to the local disk.
+    stop : :py:class:`threading.Event`, optional
+        Once set, watching stops.
+    callback : Callable, optional
+        Called after each commit with the results of the committed files, and the time the
+        build & commit took, in seconds.
+    """
+    incremental = IncrementalCommit(sink=sink)
+
+    def update(changed: set[pathlib.Path]) -> None:
+        start = time.perf_counter()
+        try:
+            results = incremental.commit(build(), changed)
+        except Exception:
+            _log.exception("Could not generate the template")
+            return
+        elapsed = time.perf_counter() - start
+        _log.info("Committed %d files in %.3fs", len(results), elapsed)
+        if callback:
+            callback(results, elapsed)
+
+    with get_watcher(roots, polling=polling) as watcher:
+        update(set())
+        for changed in watcher.changes(debounce=debounce, stop=stop):
+            update(changed)
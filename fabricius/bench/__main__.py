@@ -0,0 +1,134 @@
+import fnmatch
+import json
+import pathlib
+
+import click
+
+from fabricius.bench.micro import CaseResult, Results, compare, get_cases, run
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+@click.command()
+@click.option(
+    "-k",
+    "--select",
+    "patterns",
+    multiple=True,
+    help="Only run the cases matching this glob pattern, such as 'render/jinja/*'. Repeatable.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help="Where to write the results, as JSON.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help="The results to compare against, as written by --output.",
+)
+@click.option(
+    "--save-baseline",
+    is_flag=True,
+    help="Write the results to --baseline, instead of comparing against it.",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=0.2,
+    show_default=True,
+    help="How much slower than the baseline a case may be, 0.2 being 20% slower.",
+)
+@click.option("--rounds", type=click.IntRange(min=1), default=5, show_default=True)
+@click.option(
+    "--min-time",
+    type=click.FloatRange(min=0),
+    default=0.05,
+    show_default=True,
+    help="The minimum time, in seconds, of each round.",
+)
+@click.option("--list", "list_cases", is_flag=True, help="List the cases, without running them.")
+def main(
+    patterns: tuple[str, ...],
+    output: pathlib.Path | None,
+    baseline: pathlib.Path | None,
+    save_baseline: bool,
+    threshold: float,
+    rounds: int,
+    min_time: float,
+    list_cases: bool,
+) -> None:
+    """
+    Run Fabricius' microbenchmarks: the renderers and File.commit().
+
+    Exits with status 1 if a case regressed compared to the baseline.
+    """
+    cases = [
+        case
+        for case in get_cases()
+        if not patterns or any(fnmatch.fnmatchcase(case.name, pattern) for pattern in patterns)
+    ]
+    if list_cases:
+        for case in cases:
+            click.echo(case.name)
+        return
+    if save_baseline and baseline is None:
+        raise click.UsageError("--save-baseline requires --baseline.")
+    reference: Results | None = None
+    if baseline is not None and not save_baseline:
+        # Checked before running the cases, which takes a while.
+        if not baseline.is_file():
+            raise click.BadParameter(
+                f"{baseline} does not exist, use --save-baseline to create it.",
+                param_hint="'--baseline'",
+            )
+        try:
+            reference = json.loads(baseline.read_text())
+        except ValueError as exception:
+            raise click.BadParameter(
+                f"{baseline} is not valid JSON: {exception}", param_hint="'--baseline'"
+            ) from exception
+
+    width = max((len(case.name) for case in cases), default=0)
+
+    def report(name: str, result: CaseResult) -> None:
+        click.echo(f"{name:<{width}}  {_format_time(result['median']):>10} per operation")
+
+    results = run(cases, rounds=rounds, min_time=min_time, callback=report)
+
+    if output is not None:
+        output.write_text(json.dumps(results, indent=2))
+    if baseline is None:
+        return
+    if save_baseline:
+        baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline.write_text(json.dumps(results, indent=2))
+        click.echo(f"Baseline saved to {baseline}")
+        return
+
+    assert reference is not None
+    try:
+        regressions = compare(results, reference, threshold=threshold)
+    except ValueError as exception:
+        raise click.ClickException(str(exception)) from exception
+    if not regressions:
+        click.echo(f"No regression compared to {baseline}.")
+        return
+    click.echo(f"{len(regressions)} regression(s) compared to {baseline}:", err=True)
+    for regression in regressions:
+        click.echo(
+            f"  {regression.name}: {_format_time(regression.baseline)} -> "
+            f"{_format_time(regression.current)} ({regression.ratio:.2f}x)",
+            err=True,
+        )
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main(prog_name="python -m fabricius.bench")
@@ -0,0 +1,260 @@
+import itertools
+import pathlib
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import typing
+
+from fabricius.models.file import File
+from fabricius.renderers.jinja_renderer import clear_caches
+from fabricius.renderers.registry import get_renderer
+
+FORMAT = 1
+"""
+The version of the format of the results, results of different formats cannot be compared.
+"""
+
+Operation = typing.Callable[[], object]
+
+
+class Case(typing.NamedTuple):
+    """
+    A benchmark case.
+    """
+
+    name: str
+    """
+    The name of the case, as ``group/parameter/parameter...``.
+    """
+
+    prepare: typing.Callable[[pathlib.Path], Operation]
+    """
+    Prepares what the case needs, given a temporary directory, and returns the operation to
+    measure.
+    """
+
+
+class CaseResult(typing.TypedDict):
+    """
+    The timings of a case, in seconds per operation.
+    """
+
+    median: float
+    minimum: float
+    rounds: int
+    number: int
+    """
+    How many times the operation was ran in each round.
+    """
+
+
+class Results(typing.TypedDict):
+    format: int
+    python: str
+    platform: str
+    results: dict[str, CaseResult]
+
+
+class Regression(typing.NamedTuple):
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+SIZES = {"tiny": 1, "medium": 200, "huge": 5_000}
+"""
+The number of lines of the templates, each line uses a variable.
+"""
+
+CONTEXTS = {"small": 5, "large": 5_000}
+"""
+The number of values inside the data contexts.
+"""
+
+_SYNTAXES = {
+    "format": "{{var{index}}}",
+    "string-template": "$var{index}",
+    "mustache": "{{{{ var{index} }}}}",
+    "jinja": "{{{{ var{index} }}}}",
+}
+
+
+_unique = itertools.count()
+"""
+Numbers the unique templates of all the cases, so that no case renders a template another
+case compiled.
+"""
+
+
+def make_template(renderer: str, lines: int) -> str:
+    """
+    Make a template of the given number of lines, in the syntax of a renderer of the registry.
+    """
+    syntax = _SYNTAXES[renderer]
+    return "\n".join(
+        f"Line {line}: " + syntax.format(index=line % CONTEXTS["small"]) for line in range(lines)
+    )
+
+
+def make_context(size: int) -> dict[str, typing.Any]:
+    return {f"var{index}": f"value {index}" for index in range(size)}
+
+
+def _render_case(renderer_name: str, lines: int, values: int, unique: bool) -> Case:
+    name = f"render/{renderer_name}/{_key(SIZES, lines)}/{_key(CONTEXTS, values)}/"
+    name += "unique" if unique else "repeated"
+
+    def prepare(_: pathlib.Path) -> Operation:
+        renderer = get_renderer(renderer_name)(make_context(values))
+        content = make_template(renderer_name, lines)
+        if not unique:
+            return lambda: renderer.render(content)
+
+        # A different template each time, so that nothing compiled can be reused.
+        return lambda: renderer.render(f"{next(_unique)}\n{content}")
+
+    return Case(name, prepare)
+
+
+def _commit_case(lines: int, fake: bool) -> Case:
+    name = f"commit/{_key(SIZES, lines)}/{'fake' if fake else 'real'}"
+
+    def prepare(directory: pathlib.Path) -> Operation:
+        content = make_template("format", lines)
+        data = make_context(CONTEXTS["small"])
+
+        def commit() -> None:
+            file = File("bench.txt").from_content(content).with_data(data).to_directory(directory)
+            if fake:
+                file.fake()
+            file.commit(overwrite=True)
+
+        return commit
+
+    return Case(name, prepare)
+
+
+def _key(mapping: dict[str, int], value: int) -> str:
+    return next(key for key, size in mapping.items() if size == value)
+
+
+def get_cases() -> list[Case]:
+    """
+    All the benchmark cases: each renderer with tiny, medium & huge templates, small & large
+    contexts, repeated & unique templates, then :py:meth:`File.commit()
+    <fabricius.models.file.File.commit>`, faked or not, with each template size.
+    """
+    cases = [
+        _render_case(renderer, lines, values, unique)
+        for renderer in _SYNTAXES
+        for lines in SIZES.values()
+        for values in CONTEXTS.values()
+        for unique in (False, True)
+    ]
+    cases.extend(_commit_case(lines, fake) for lines in SIZES.values() for fake in (True, False))
+    return cases
+
+
+def measure(operation: Operation, *, rounds: int = 5, min_time: float = 0.05) -> CaseResult:
+    """
+    Measure an operation: it is ran as many times as needed for a round to last at least
+    ``min_time`` seconds, then timed over ``rounds`` rounds.
+    """
+    operation()  # Warm up, for example, the caches.
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    timings = [elapsed / number]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        timings.append((time.perf_counter() - start) / number)
+
+    return CaseResult(
+        median=statistics.median(timings), minimum=min(timings), rounds=rounds, number=number
+    )
+
+
+def run(
+    cases: typing.Iterable[Case],
+    *,
+    rounds: int = 5,
+    min_time: float = 0.05,
+    callback: typing.Callable[[str, CaseResult], None] | None = None,
+) -> Results:
+    """
+    Run benchmark cases. The templates compiled by the renderers are forgotten before each case.
+
+    Parameters
+    ----------
+    cases : Iterable of :py:class:`Case`
+        The cases to run.
+    rounds : :py:class:`int`
+        How many times each case is timed.
+    min_time : :py:class:`float`
+        The minimum time, in seconds, of each round.
+    callback : Callable, optional
+        Called with the name and the result of each case, once it is measured.
+    """
+    results: dict[str, CaseResult] = {}
+    with tempfile.TemporaryDirectory(prefix="fabricius-bench-") as directory:
+        for case in cases:
+            # Each case starts without the templates compiled by the previous ones.
+            clear_caches()
+            result = measure(
+                case.prepare(pathlib.Path(directory)), rounds=rounds, min_time=min_time
+            )
+            results[case.name] = result
+            if callback:
+                callback(case.name, result)
+
+    return Results(
+        format=FORMAT,
+        python=sys.version.split()[0],
+        platform=platform.platform(),
+        results=results,
+    )
+
+
+def compare(current: Results, baseline: Results, *, threshold: float = 0.2) -> list[Regression]:
+    """
+    Compare results against a baseline, using the median of each case. Cases missing from either
+    results are ignored.
+
+    Parameters
+    ----------
+    threshold : :py:class:`float`
+        How much slower than the baseline a case may be before it is a regression. ``0.2`` means
+        20% slower.
+
+    Raises
+    ------
+    :py:exc:`ValueError` :
+        The results and the baseline have different formats.
+    """
+    if current["format"] != baseline["format"]:
+        raise ValueError("The results and the baseline have different formats.")
+
+    regressions: list[Regression] = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        if result["median"] > reference["median"] * (1 + threshold):
+            regressions.append(Regression(name, reference["median"], result["median"]))
+    return regressions
@@ -0,0 +1,370 @@
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import pathlib
+import shutil
+import tempfile
+import time
+import tracemalloc
+import typing
+
+import click
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+
+class Shape(typing.TypedDict):
+    """
+    The shape of a synthesized CookieCutter repository.
+    """
+
+    files: int
+    """
+    The number of files.
+    """
+
+    depth: int
+    """
+    How deep the directories are nested.
+    """
+
+    fan_out: int
+    """
+    How many directories each directory contains, until ``depth`` is reached.
+    """
+
+    file_size: int
+    """
+    The approximate size of each file, in bytes.
+    """
+
+    templated_names: float
+    """
+    The ratio, from 0 to 1, of files whose name is templated.
+    """
+
+    copied: float
+    """
+    The ratio, from 0 to 1, of files that match ``_copy_without_render``.
+    """
+
+
+class Phase(typing.TypedDict):
+    """
+    The resources used by one phase of a generation.
+    """
+
+    wall: float
+    """
+    The elapsed time, in seconds.
+    """
+
+    user: float
+    """
+    The CPU time spent by the process itself, in seconds.
+    """
+
+    system: float
+    """
+    The CPU time spent by the kernel on behalf of the process, in seconds. A phase whose system
+    time is a large part of its wall time is dominated by syscalls.
+    """
+
+
+class Report(typing.TypedDict):
+    """
+    The report of the generation of one synthesized repository.
+    """
+
+    shape: Shape
+    phases: dict[str, Phase]
+    """
+    The ``setup`` phase (Listing, reading ``cookiecutter.json``, rendering the names) and the
+    ``run`` phase (Reading, rendering & writing the files).
+    """
+
+    files_per_second: float
+    """
+    The number of files generated per second, over both phases.
+    """
+
+    peak_rss: int | None
+    """
+    The peak resident set size of the process, in bytes, if it can be known.
+    """
+
+    peak_traced: int | None
+    """
+    The peak size of the memory allocated by Python, in bytes, if :py:mod:`tracemalloc` was
+    enabled.
+    """
+
+
+def synthesize(path: pathlib.Path, shape: Shape) -> pathlib.Path:
+    """
+    Synthesize a CookieCutter repository of the given shape.
+
+    Files are spread evenly across the directories. Files whose name is templated are named
+    after the ``prefix`` variable, files that are copied end with ``.bin``.
+
+    Returns
+    -------
+    :py:class:`pathlib.Path` :
+        The repository. (Where ``cookiecutter.json`` is located)
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    path.joinpath("cookiecutter.json").write_text(
+        json.dumps(
+            {"project_slug": "project", "prefix": "generated", "_copy_without_render": ["*.bin"]}
+        )
+    )
+    root = path.joinpath("{{cookiecutter.project_slug}}")
+
+    directories = [root]
+    level = [root]
+    for depth in range(shape["depth"]):
+        level = [
+            directory.joinpath(f"d{depth}_{index}")
+            for directory in level
+            for index in range(shape["fan_out"])
+        ]
+        directories.extend(level)
+    for directory in directories:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    line = "{{ cookiecutter.project_slug }} is generated by {{ cookiecutter.prefix }}.\n"
+    content = line * max(1, shape["file_size"] // len(line))
+    for index in range(shape["files"]):
+        name = f"file{index}"
+        if _selected(index, shape["templated_names"]):
+            name = f"{{{{cookiecutter.prefix}}}}_{name}"
+        name += ".bin" if _selected(index, shape["copied"]) else ".txt"
+        directories[index % len(directories)].joinpath(name).write_text(content)
+
+    return path
+
+
+def _selected(index: int, ratio: float) -> bool:
+    # Spreads the selected files evenly, without randomness, so that runs are comparable.
+    return int((index + 1) * ratio) > int(index * ratio)
+
+
+def _usage() -> tuple[float, float, float]:
+    times = os.times()
+    return time.perf_counter(), times.user, times.system
+
+
+def _phase(start: tuple[float, float, float]) -> Phase:
+    end = _usage()
+    return Phase(wall=end[0] - start[0], user=end[1] - start[1], system=end[2] - start[2])
+
+
+def _peak_rss() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def measure(
+    shape: Shape,
+    *,
+    workdir: "str | None" = None,
+    trace_memory: bool = False,
+    profile: "str | None" = None,
+) -> Report:
+    """
+    Synthesize a repository, then generate it with :py:func:`setup()
+    <fabricius.readers.cookiecutter.setup.setup>` and :py:func:`run()
+    <fabricius.readers.cookiecutter.setup.run>`, headless, and report the resources used.
+
+    The peak RSS is the one of the whole process, use :py:func:`measure_isolated` to measure
+    each shape in its own process.
+
+    Parameters
+    ----------
+    shape : :py:class:`Shape`
+        The shape of the repository.
+    workdir : :py:class:`str`, optional
+        Where to synthesize the repository and generate it. Default to a temporary directory.
+    trace_memory : :py:class:`bool`
+        If the memory allocated by Python is traced, which slows the generation down.
+    profile : :py:class:`str`, optional
+        Where to write a profile of the ``run`` phase. (See :py:mod:`fabricius.app.profiling`)
+    """
+    from fabricius.readers.cookiecutter.setup import run, setup
+    from fabricius.readers.cookiecutter.snapshot import clear_snapshots
+
+    with tempfile.TemporaryDirectory(prefix="fabricius-scale-", dir=workdir) as directory:
+        repository = synthesize(pathlib.Path(directory, "template"), shape)
+        output = pathlib.Path(directory, "output")
+        clear_snapshots()
+
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            start = _usage()
+            template = setup(repository, output, no_prompt=True, cache=None)
+            setup_phase = _phase(start)
+
+            start = _usage()
+            run(template, profile=profile, no_prompt=True, progress=False)
+            run_phase = _phase(start)
+
+            peak_traced = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+
+    wall = setup_phase["wall"] + run_phase["wall"]
+    return Report(
+        shape=shape,
+        phases={"setup": setup_phase, "run": run_phase},
+        files_per_second=shape["files"] / wall if wall else 0,
+        peak_rss=_peak_rss(),
+        peak_traced=peak_traced,
+    )
+
+
+def measure_isolated(shape: Shape, **kwargs: typing.Any) -> Report:
+    """
+    Like :py:func:`measure`, but inside a new process, so that its peak RSS is its own.
+    """
+    with concurrent.futures.ProcessPoolExecutor(
+        1, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        return executor.submit(measure, shape, **kwargs).result()
+
+
+def _profile_path(profile: str, files: int) -> str:
+    # One profile per repository, named after its number of files: "profile.json" becomes
+    # "profile-1000.json".
+    path = pathlib.Path(profile)
+    return str(path.with_name(f"{path.stem}-{files}{path.suffix}"))
+
+
+def _format_size(size: int | None) -> str:
+    if size is None:
+        return "-"
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+@click.command()
+@click.option(
+    "-n",
+    "--files",
+    "file_counts",
+    type=click.IntRange(min=1, max=100_000),
+    multiple=True,
+    default=[1_000, 10_000],
+    show_default=True,
+    help="The number of files. Repeat it to check how the generation scales.",
+)
+@click.option("--depth", type=click.IntRange(min=0), default=3, show_default=True)
+@click.option("--fan-out", type=click.IntRange(min=1), default=4, show_default=True)
+@click.option(
+    "--file-size",
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help="The approximate size of each file, in bytes.",
+)
+@click.option(
+    "--templated-names",
+    type=click.FloatRange(0, 1),
+    default=0.3,
+    show_default=True,
+    help="The ratio of files whose name is templated.",
+)
+@click.option(
+    "--copied",
+    type=click.FloatRange(0, 1),
+    default=0.1,
+    show_default=True,
+    help="The ratio of files copied without being rendered.",
+)
+@click.option(
+    "--workdir",
+    type=click.Path(file_okay=False, exists=True),
+    help="Where to synthesize the repositories. Default to the temporary directory.",
+)
+@click.option("--tracemalloc", "trace_memory", is_flag=True, help="Trace Python's allocations.")
+@click.option(
+    "--profile",
+    help=(
+        "Write a profile of each run phase, see FABRICIUS_PROFILE. The number of files is added "
+        "to the name of each profile."
+    ),
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help="Where to write the reports, as JSON.",
+)
+def main(
+    file_counts: tuple[int, ...],
+    depth: int,
+    fan_out: int,
+    file_size: int,
+    templated_names: float,
+    copied: float,
+    workdir: str | None,
+    trace_memory: bool,
+    profile: str | None,
+    output: pathlib.Path | None,
+) -> None:
+    """
+    Generate synthesized CookieCutter repositories of growing sizes, each in its own process,
+    and report the time, memory and files per second of each.
+
+    The "scaling" column is the time per file compared to the smallest repository: it stays
+    close to 1 as long as the generation scales linearly.
+    """
+    reports: list[Report] = []
+    click.echo(
+        f"{'files':>8} {'setup':>9} {'run':>9} {'system':>7} {'files/s':>9} {'peak RSS':>10} "
+        f"{'traced':>10} {'scaling':>8}"
+    )
+    for files in sorted(file_counts):
+        shape = Shape(
+            files=files,
+            depth=depth,
+            fan_out=fan_out,
+            file_size=file_size,
+            templated_names=templated_names,
+            copied=copied,
+        )
+        report = measure_isolated(
+            shape,
+            workdir=workdir,
+            trace_memory=trace_memory,
+            profile=_profile_path(profile, files) if profile else None,
+        )
+        reports.append(report)
+
+        phases = report["phases"]
+        wall = sum(phase["wall"] for phase in phases.values())
+        system = sum(phase["system"] for phase in phases.values())
+        first = reports[0]
+        first_wall = sum(phase["wall"] for phase in first["phases"].values())
+        # A phase may be too short for the clock to see it, on coarse clocks.
+        scaling = (wall / files) / (first_wall / first["shape"]["files"]) if first_wall else 0
+        click.echo(
+            f"{files:>8} {phases['setup']['wall']:>8.2f}s {phases['run']['wall']:>8.2f}s "
+            f"{system / wall if wall else 0:>7.0%} {report['files_per_second']:>9.0f} "
+            f"{_format_size(report['peak_rss']):>10} {_format_size(report['peak_traced']):>10} "
+            f"{scaling:>8.2f}"
+        )
+
+    if output is not None:
+        output.write_text(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    main(prog_name="python -m fabricius.bench.scale")
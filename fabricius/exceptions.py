@@ -1,3 +1,6 @@
+import typing
+
+
 class FabriciusError(Exception):
     """
     An error was raised inside Fabricius.
@@ -8,6 +11,20 @@ class FabriciusError(Exception):
     def __init__(self, error: object | None = None) -> None:
         super().__init__(error or "Error inside Fabricius. No specific error raised.")
 
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        # Subclasses build their message from their own arguments, so they can't be rebuilt from
+        # ``args`` once pickled (For example, to be sent back from another process).
+        return (_rebuild, (type(self), str(self), self.__dict__))
+
+
+def _rebuild(
+    cls: type[FabriciusError], message: str, state: dict[str, typing.Any]
+) -> FabriciusError:
+    exception = cls.__new__(cls)
+    FabriciusError.__init__(exception, message)
+    exception.__dict__.update(state)
+    return exception
+
 
 class MissingRequiredValueError(FabriciusError):
     """
@@ -80,3 +97,18 @@ class TemplateError(FabriciusError):
             The reason for the error.
         """
         super().__init__(f"{template_name}: {reason}")
+
+
+class RendererNotFoundError(FabriciusError):
+    """
+    No renderer is registered with the requested name.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Parameters
+        ----------
+        name : str
+            The name of the renderer that was requested.
+        """
+        super().__init__(f"No renderer named '{name}' is registered.")
@@ -1,23 +1,36 @@
 import contextlib
+import os
 import pathlib
+import time
 import typing
 
 from typing_extensions import Self
 
+from fabricius.app.profiling import span
 from fabricius.app.signals import (
+    FileSignals,
     after_file_commit,
     before_file_commit,
     on_file_commit_fail,
 )
 from fabricius.exceptions import AlreadyCommittedError, MissingRequiredValueError
 from fabricius.models.renderer import Renderer
-from fabricius.renderers import (
-    ChevronRenderer,
-    JinjaRenderer,
-    PythonFormatRenderer,
-    StringTemplateRenderer,
+from fabricius.models.signal import ThreadedDispatcher, get_dispatchers
+from fabricius.models.sink import Sink
+from fabricius.renderers.python_format import PythonFormatRenderer
+from fabricius.sinks.local import LocalSink
+from fabricius.types import (
+    FILE_STATE,
+    Data,
+    FileCommitResult,
+    FileTimings,
+    LinkMode,
+    PathStrOrPath,
+    new_timings,
 )
-from fabricius.types import FILE_STATE, Data, FileCommitResult, PathStrOrPath
+
+if typing.TYPE_CHECKING:
+    from fabricius.sources.archive import ArchivePath, TemplateSource
 
 
 class File:
@@ -37,11 +50,6 @@ class File:
     The state of the file.
     """
 
-    content: str | None
-    """
-    The template's content.
-    """
-
     template_content: str | None
     """
     The content of the base template, if set.
@@ -62,11 +70,48 @@ class File:
     The data that will be passed to the renderer.
     """
 
+    dependencies: frozenset[str]
+    """
+    The name of the other templates the renderer used during the last generation.
+    (For example, templates included with Jinja's ``{% include %}``)
+    """
+
+    source: "TemplateSource | None"
+    """
+    The file template the content is read from, if it has not been read yet. It can be inside
+    an archive. (See :py:class:`fabricius.sources.ArchivePath`)
+    """
+
+    verbatim: bool
+    """
+    If the file is copied as is from :py:attr:`.source`, without being read nor rendered.
+    (See :py:meth:`.copy_from`)
+    """
+
+    _content: str | None
+
+    _signals: FileSignals | None
+    """
+    The signals scoped to this file, created upon first access of :py:attr:`.signals`.
+    """
+
+    _signals_parent: FileSignals | None
+    """
+    The scoped signals to send when this file has no scoped signals of its own.
+    (Typically, the signals of the template being committed)
+    """
+
     _will_fake: bool
     """
     If the file should fake its creation upon commit.
     """
 
+    _dispatchers: list[ThreadedDispatcher]
+    """
+    The dispatchers of the scoped signals, kept once a commit disconnected their listeners, so
+    that the template being committed can still wait for them.
+    """
+
     def __init__(self, name: str, extension: typing.Optional[str] = None) -> None:
         """
         Parameters
@@ -79,13 +124,64 @@ class File:
         """
         self.name = f"{name}.{extension}" if extension else name
         self.state = "pending"
-        self.content = None
+        self.source = None
+        self.verbatim = False
+        self._content = None
         self.destination = None
+        self.dependencies = frozenset()
         self._will_fake = False
+        self._signals = None
+        self._signals_parent = None
+        self._dispatchers = []
 
         self.renderer = PythonFormatRenderer
         self.data = {}
 
+    @property
+    def content(self) -> str | None:
+        """
+        The template's content.
+
+        If the file was set to lazily read a file template, it is read upon first access.
+        """
+        if self._content is None and self.source is not None:
+            self._content = self.source.read_text()
+            if not self.verbatim:
+                self.source = None
+        return self._content
+
+    @content.setter
+    def content(self, content: str | None) -> None:
+        self._content = content
+        self.source = None
+        self.verbatim = False
+
+    @property
+    def has_content(self) -> bool:
+        """
+        If the file has a content, or a file template to read it from. This does not read the
+        file template.
+        """
+        return self._content is not None or self.source is not None
+
+    @property
+    def signals(self) -> FileSignals:
+        """
+        The signals scoped to this file. Listeners connected to them are only called for this
+        file, and are disconnected once the file has been committed.
+        """
+        if self._signals is None:
+            self._signals = FileSignals(self._signals_parent)
+        return self._signals
+
+    def _attach_signals(self, parent: FileSignals | None) -> None:
+        """
+        Make the file's signals also send ``parent``'s signals. (``None`` for the global signals)
+        """
+        self._signals_parent = parent
+        if self._signals is not None:
+            self._signals.link(parent)
+
     def compute_destination(self) -> pathlib.Path:
         """
         Compute the destination of the file.
@@ -104,8 +200,6 @@ class File:
         if not self.destination:
             raise MissingRequiredValueError(self, "destination")
 
-        if not self.destination.exists() and (not self._will_fake):
-            self.destination.mkdir(parents=True)
         return self.destination.joinpath(self.name)
 
     @property
@@ -113,14 +207,14 @@ class File:
         # sourcery skip: reintroduce-else
         if not self.destination:
             return "destination"
-        if not self.content:
+        if not self.has_content:
             return "content"
         if self.state == "persisted":
             return "state"
 
         return True
 
-    def from_file(self, path: str | pathlib.Path) -> Self:
+    def from_file(self, path: "str | pathlib.Path | ArchivePath", *, lazy: bool = False) -> Self:
         """
         Read the content from a file template.
 
@@ -131,11 +225,34 @@ class File:
 
         Parameters
         ----------
-        path : :py:class:`str` or :py:class:`pathlib.Path`
-            The path of the file template.
+        path : :py:class:`str`, :py:class:`pathlib.Path` or :py:class:`fabricius.sources.ArchivePath`
+            The path of the file template. Files inside an archive are read straight from it.
+        lazy : :py:class:`bool`
+            If the file template should only be read once its content is needed. In this case,
+            :py:exc:`FileNotFoundError` is raised upon reading. Default to ``False``.
+        """
+        path = _resolve(path)
+        if lazy:
+            self._content = None
+            self.source = path
+            self.verbatim = False
+        else:
+            self.content = path.read_text()
+        return self
+
+    def copy_from(self, path: "str | pathlib.Path | ArchivePath") -> Self:
+        """
+        Copy a file as is upon commit, without reading it nor rendering it. Useful for files
+        that are not templates, such as images or other binary files.
+
+        Parameters
+        ----------
+        path : :py:class:`str`, :py:class:`pathlib.Path` or :py:class:`fabricius.sources.ArchivePath`
+            The path of the file to copy.
         """
-        path = pathlib.Path(path).resolve()
-        self.content = path.read_text()
+        self._content = None
+        self.source = _resolve(path)
+        self.verbatim = True
         return self
 
     def from_content(self, content: str) -> Self:
@@ -174,6 +291,8 @@ class File:
         """
         Use chevron (Mustache) to render the template.
         """
+        from fabricius.renderers.mustache import ChevronRenderer
+
         self.renderer = ChevronRenderer
         return self
 
@@ -181,6 +300,8 @@ class File:
         """
         Use string.Template to render the template.
         """
+        from fabricius.renderers.python_string_template import StringTemplateRenderer
+
         self.renderer = StringTemplateRenderer
         return self
 
@@ -188,22 +309,61 @@ class File:
         """
         Use Jinja2 to render the template.
         """
+        from fabricius.renderers.jinja_renderer import JinjaRenderer
+
         self.renderer = JinjaRenderer
         return self
 
-    def with_renderer(self, renderer: typing.Type[Renderer]) -> Self:
+    def with_renderer(self, renderer: "typing.Type[Renderer] | str") -> Self:
         """
         Use a custom renderer to render the template.
 
         Parameters
         ----------
-        renderer : Type of :py:class:`fabricius.models.renderer.Renderer`
+        renderer : Type of :py:class:`fabricius.models.renderer.Renderer` or :py:class:`str`
             The renderer to use to format the file.
             It must be not initialized.
+            If a string, the name of a renderer of the registry, such as ``"jinja"``, or one
+            installed by a plugin. (See :py:class:`fabricius.renderers.registry.RendererRegistry`)
+
+        Raises
+        ------
+        :py:exc:`fabricius.exceptions.RendererNotFoundError` :
+            No renderer is registered with the given name.
         """
+        if isinstance(renderer, str):
+            from fabricius.renderers.registry import registry
+
+            renderer = registry.get(renderer)
         self.renderer = renderer
         return self
 
+    def use_renderer_for_extension(self, *, strip: bool = True) -> Self:
+        """
+        Use the renderer registered for the file's extension, for example, Jinja for a
+        ``README.md.j2`` file. If no renderer is registered for it, the renderer is unchanged.
+
+        Only the renderer that is chosen is imported.
+        (See :py:class:`fabricius.renderers.registry.RendererRegistry`)
+
+        Parameters
+        ----------
+        strip : :py:class:`bool`
+            If the renderer's extension is removed from the file's name, so that ``README.md.j2``
+            is saved as ``README.md``. Default to ``True``.
+        """
+        from fabricius.renderers.registry import registry
+
+        match = registry.match(self.name)
+        if match is None:
+            return self
+
+        extension, name = match
+        self.renderer = registry.get(name)
+        if strip and len(self.name) > len(extension):
+            self.name = self.name[: -len(extension)]
+        return self
+
     def with_data(self, data: Data, *, overwrite: bool = True) -> Self:
         """
         Add data to pass to the template.
@@ -254,12 +414,18 @@ class File:
         :py:class:`str` :
             The final content of the file.
         """
-        if not self.content:
+        if self.content is None:
             raise MissingRequiredValueError(self, "content")
 
-        return self.renderer(self.data).render(self.content)
+        with span(self.name, "render", renderer=self.renderer.__name__):
+            renderer = self.renderer(self.data)
+            final_content = renderer.render(self.content)
+        self.dependencies = renderer.dependencies
+        return final_content
 
-    def commit(self, *, overwrite: bool = False) -> FileCommitResult:
+    def commit(
+        self, *, overwrite: bool = False, sink: Sink | None = None, timings: bool = False
+    ) -> FileCommitResult:
         """
         Save the file to the disk.
 
@@ -268,6 +434,12 @@ class File:
         overwrite : :py:class:`bool`
             If a file exist at the given path, shall the overwrite parameter say if the file
             should be overwritten or not. Default to ``False``.
+        sink : :py:class:`fabricius.models.sink.Sink`, optional
+            Where to write the file. Default to the local disk.
+            (:py:class:`fabricius.sinks.LocalSink`)
+        timings : :py:class:`bool`
+            If the time spent in each phase of the commit should be included in the result.
+            Default to ``False``.
 
         Raises
         ------
@@ -290,43 +462,145 @@ class File:
         :py:class:`fabricius.types.FileCommitResult` :
             A typed dict with information about the created file.
         """
+        self._ensure_committable()
+
+        with span(self.name, "file"):
+            phases = new_timings() if timings else None
+            final_content = None if self.verbatim else self._generate(phases)
+            return self._persist(
+                final_content, overwrite=overwrite, sink=sink or LocalSink(), timings=phases
+            )
+
+    def _generate(self, timings: FileTimings | None) -> str:
+        """
+        Generate the file's content, adding the time spent reading & rendering to ``timings``.
+        """
+        if timings is None:
+            return self.generate()
+
+        start = time.perf_counter()
+        self.content  # Reads the file template, if not read yet.
+        read = time.perf_counter()
+        final_content = self.generate()
+        timings["read"] += read - start
+        timings["render"] += time.perf_counter() - read
+        return final_content
+
+    def _ensure_committable(self) -> None:
+        """
+        Raise the appropriate exception if the file cannot be committed.
+        """
         if not self.destination:
             raise MissingRequiredValueError(self, "destination")
-        if not self.content:
+        if not self.has_content:
             raise MissingRequiredValueError(self, "content")
         if self.state == "persisted":
             raise AlreadyCommittedError(self.name)
 
-        final_content = self.generate()
+    def _persist(
+        self,
+        final_content: str | None,
+        *,
+        overwrite: bool,
+        sink: Sink,
+        link_from: pathlib.Path | None = None,
+        link: LinkMode | None = None,
+        timings: FileTimings | None = None,
+    ) -> FileCommitResult:
+        """
+        Save an already generated content to the disk.
+
+        Parameters
+        ----------
+        final_content : :py:class:`str`, optional
+            The generated content of the file. ``None`` if the file is copied from its source.
+            (See :py:meth:`.copy_from`)
+        overwrite : :py:class:`bool`
+            If an existing file can be overwritten.
+        sink : :py:class:`fabricius.models.sink.Sink`
+            Where to write the file.
+        link_from : :py:class:`pathlib.Path`, optional
+            An already saved file with the exact same content. If given with ``link``, the file is
+            linked to it instead of being written.
+        link : :py:const:`fabricius.types.LinkMode`, optional
+            How to link the file to ``link_from``.
+        timings : :py:class:`fabricius.types.FileTimings`, optional
+            If given, the timings of the phases are added to it, and it is included in the
+            result.
+        """
+        assert self.destination and (final_content is not None or self.source is not None)
+        clock = time.perf_counter
 
         destination = self.compute_destination()
 
-        if destination.exists() and not overwrite:
+        if sink.exists(destination) and not overwrite:
             exception = FileExistsError(f"File '{self.name}' already exists.")
             exception.filename = self.name
             raise exception
 
-        before_file_commit.send(self)
+        signals = self._signals or self._signals_parent
+        bytes_written = 0
+
+        start = clock()
+        (signals.before_file_commit if signals else before_file_commit).send(self)
+        signals_time = clock() - start
+        mkdir_time = write_time = 0.0
 
         try:
             if self._will_fake:
                 self.state = "persisted"
             else:
                 with contextlib.suppress(NotADirectoryError):
-                    destination.write_text(final_content)
+                    start = clock()
+                    sink.prepare(destination)
+                    written = clock()
+                    if final_content is None:
+                        assert self.source is not None
+                        bytes_written = sink.copy(self.source, destination)
+                    elif not (link and link_from and sink.link(link_from, destination, link)):
+                        sink.write(destination, final_content)
+                        bytes_written = _size(final_content)
+                    mkdir_time, write_time = written - start, clock() - written
                     self.state = "persisted"
         except Exception as exception:
-            on_file_commit_fail.send(self)
+            (signals.on_file_commit_fail if signals else on_file_commit_fail).send(self)
 
         commit = FileCommitResult(
             name=self.name,
             state=self.state,
             data=self.data,
-            template_content=self.content,
-            content=final_content,
+            template_content="" if final_content is None else self.content,
+            content="" if final_content is None else final_content,
             destination=self.destination.joinpath(self.name),
             fake=self._will_fake,
+            dependencies=self.dependencies,
+            bytes_written=bytes_written,
+            timings=None,
         )
 
-        after_file_commit.send(self, commit)
+        start = clock()
+        (signals.after_file_commit if signals else after_file_commit).send(self, commit)
+        signals_time += clock() - start
+
+        if timings is not None:
+            timings["mkdir"] += mkdir_time
+            timings["write"] += write_time
+            timings["signals"] += signals_time
+            commit["timings"] = timings
+
+        if self._signals is not None and self.state == "persisted":
+            self._dispatchers = get_dispatchers(self._signals)
+            self._signals.clear()
         return commit
+
+
+def _resolve(path: "str | pathlib.Path | ArchivePath") -> "TemplateSource":
+    # Paths inside an archive are neither strings nor os.PathLike.
+    return pathlib.Path(path).resolve() if isinstance(path, (str, os.PathLike)) else path
+
+
+def _size(content: str) -> int:
+    """
+    The size of a content once encoded, without encoding it when possible.
+    """
+    return len(content) if content.isascii() else len(content.encode("utf-8"))
@@ -22,6 +22,15 @@ class Renderer(abc.ABC):
     A dictionary that contains data passed by the users to pass inside the template.
     """
 
+    dependencies: frozenset[str] = frozenset()
+    """
+    The name of the other templates that were used during the last render. (For example,
+    templates that were included)
+
+    Renderers that can load other templates should set this property when rendering, so that a
+    change of one of these templates can be tracked back to the files that used it.
+    """
+
     def __init__(self, data: Data) -> None:
         self.data = data
 
@@ -1,43 +1,350 @@
-import contextlib
+import logging
+import queue
+import threading
 import typing
+import weakref
 
 _F = typing.ParamSpec("_F")
 
+_NO_RESULTS: tuple[()] = ()
+
+_log = logging.getLogger(__name__)
+
+_dispatchers: "weakref.WeakSet[ThreadedDispatcher]" = weakref.WeakSet()
+
+_STOP = object()
+"""
+Queued by :py:meth:`ThreadedDispatcher.close` to stop the dispatcher's thread.
+"""
+
+
+class ThreadedDispatcher:
+    """
+    A dispatcher delivers signals to listeners on a dedicated thread, so that slow listeners
+    (For example, logging, uploads or a progress bar) do not slow down the sender.
+
+    Events are delivered in the order they were sent. Results of the listeners are not returned
+    to the sender, and exceptions raised by listeners are logged.
+
+    .. code-block:: py
+
+       dispatcher = ThreadedDispatcher(maxsize=256, on_full="drop")
+       after_file_commit.connect(upload_file, dispatcher=dispatcher)
+
+    The thread is started by the first event, and stopped by :py:meth:`close`. A closed
+    dispatcher can still be used, a new thread is then started.
+    """
+
+    maxsize: int
+    """
+    The maximum number of events waiting to be delivered.
+    """
+
+    on_full: typing.Literal["block", "drop", "inline"]
+    """
+    What to do when an event is sent while the queue is full.
+
+    - ``"block"``: Wait until there's room in the queue.
+    - ``"drop"``: Discard the event. (See :py:attr:`dropped`)
+    - ``"inline"``: Call the listener on the sender's thread. The event might be delivered
+      before events that are still waiting inside the queue.
+    """
+
+    dropped: int
+    """
+    The number of events that have been discarded because the queue was full.
+    """
+
+    _queue: "queue.Queue[tuple[typing.Callable[..., typing.Any], typing.Any, typing.Any]]"
+    _thread: threading.Thread | None
+    _stopping: list[threading.Thread]
+    """
+    The threads stopped by :py:meth:`close` that are still delivering their queued events.
+    """
+
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 1024,
+        on_full: typing.Literal["block", "drop", "inline"] = "block",
+    ) -> None:
+        """
+        Parameters
+        ----------
+        maxsize : :py:class:`int`
+            The maximum number of events waiting to be delivered. Default to ``1024``.
+        on_full : :py:class:`str`
+            What to do when the queue is full, see :py:attr:`on_full`. Default to ``"block"``.
+        """
+        self.maxsize = maxsize
+        self.on_full = on_full
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+        self._thread = None
+        self._stopping = []
+        self._lock = threading.Lock()
+        _dispatchers.add(self)
+
+    def submit(
+        self, listener: typing.Callable[..., typing.Any], args: typing.Any, kwargs: typing.Any
+    ) -> None:
+        """
+        Queue a call to a listener.
+        """
+        # Locked so that close() cannot stop the thread between the check and the put.
+        with self._lock:
+            if self._thread is None:
+                self._start()
+            if self.on_full == "block":
+                self._queue.put((listener, args, kwargs))
+                return
+            try:
+                self._queue.put_nowait((listener, args, kwargs))
+                return
+            except queue.Full:
+                if self.on_full == "drop":
+                    self.dropped += 1
+                    return
+        _call(listener, args, kwargs)
+
+    def flush(self) -> None:
+        """
+        Wait until all the queued events have been delivered.
+
+        Does nothing when called by a listener of this dispatcher, which would otherwise wait for
+        itself forever.
+        """
+        current = threading.current_thread()
+        with self._lock:
+            thread, events, stopping = self._thread, self._queue, list(self._stopping)
+        if thread is not None and thread is not current:
+            events.join()
+        # The events sent before close() are delivered by the stopping threads.
+        for stopped in stopping:
+            if stopped is not current:
+                stopped.join()
+
+    def close(self) -> None:
+        """
+        Deliver the queued events, then stop the dispatcher's thread.
+
+        When called by a listener of this dispatcher, the thread stops once the listener
+        returns, without waiting.
+        """
+        with self._lock:
+            thread, events = self._thread, self._queue
+            if thread is None:
+                return
+            self._thread = None
+            self._stopping.append(thread)
+            # Events sent from now on go to a new thread, with its own queue.
+            self._queue = queue.Queue(self.maxsize)
+
+        # Queued after the waiting events, so that they are delivered first.
+        events.put(_STOP)  # type: ignore
+        if threading.current_thread() is not thread:
+            thread.join()
+
+    def _start(self) -> None:
+        # Called with the lock held.
+        self._thread = threading.Thread(
+            target=self._run, args=(self._queue,), name="fabricius-signals", daemon=True
+        )
+        self._thread.start()
+
+    def _run(
+        self,
+        events: "queue.Queue[tuple[typing.Callable[..., typing.Any], typing.Any, typing.Any]]",
+    ) -> None:
+        while True:
+            event = events.get()
+            try:
+                if event is _STOP:
+                    with self._lock:
+                        self._stopping.remove(threading.current_thread())
+                    return
+                listener, args, kwargs = event
+                _call(listener, args, kwargs)
+            finally:
+                events.task_done()
+
+
+def _call(
+    listener: typing.Callable[..., typing.Any], args: typing.Any, kwargs: typing.Any
+) -> None:
+    try:
+        listener(*args, **kwargs)
+    except NotImplementedError:
+        pass
+    except Exception:
+        _log.exception("Listener %r raised an exception.", listener)
+
+
+def get_dispatchers(signals: "typing.Iterable[Signal[...]]") -> list[ThreadedDispatcher]:
+    """
+    The :py:class:`ThreadedDispatcher` of the listeners of the given signals, and of their
+    parents, each once.
+    """
+    found: dict[int, ThreadedDispatcher] = {}
+    for signal in signals:
+        current: Signal[...] | None = signal
+        while current is not None:
+            for dispatcher in tuple(current._dispatchers.values()):
+                found[id(dispatcher)] = dispatcher
+            current = current.parent
+    return list(found.values())
+
+
+def flush_dispatchers(signals: "typing.Iterable[Signal[...]] | None" = None) -> None:
+    """
+    Wait until the :py:class:`ThreadedDispatcher` of the given signals, and of their parents,
+    have delivered their queued events.
+
+    :py:meth:`Template.commit() <fabricius.models.template.Template.commit>` does the same
+    once its files have been committed, with the signals of the template and of its files, so
+    that unrelated commits do not wait for each other.
+
+    Parameters
+    ----------
+    signals : Iterable of :py:class:`Signal`, optional
+        The signals whose dispatchers are flushed. If not given, every dispatcher is.
+    """
+    dispatchers = list(_dispatchers) if signals is None else get_dispatchers(signals)
+    for dispatcher in dispatchers:
+        dispatcher.flush()
+
 
 class Signal(typing.Generic[_F]):
     """
     The Listener is the base class used to create listeners of events.
     """
 
-    listeners: list[typing.Callable[_F, typing.Any]]
+    listeners: list[typing.Callable[_F, typing.Any] | weakref.ref[typing.Callable[_F, typing.Any]]]
     """
     The list of listeners that are subscribed to this signal.
+    Listeners connected with ``weak=True`` are stored as weak references.
     """
 
-    def __init__(self, *, func_hint: typing.Callable[_F, typing.Any] | None = None) -> None:
+    parent: "Signal[_F] | None"
+    """
+    Another signal that is sent each time this signal is sent, after this signal's listeners.
+    Used by scoped signals, so that sending a scoped signal also sends the global one.
+    """
+
+    _dispatchers: dict[int, ThreadedDispatcher]
+    """
+    The dispatchers of the listeners that are not called on the sender's thread, by the ``id``
+    of the listener inside :py:attr:`.listeners`.
+    """
+
+    def __init__(
+        self,
+        *,
+        func_hint: typing.Callable[_F, typing.Any] | None = None,
+        parent: "Signal[_F] | None" = None,
+    ) -> None:
         self.listeners = []
+        self.parent = parent
+        self._dispatchers = {}
+
+    def _find(self, listener: typing.Callable[_F, typing.Any]) -> int | None:
+        for index, connected in enumerate(self.listeners):
+            if isinstance(connected, weakref.ref):
+                connected = connected()
+            if connected == listener:
+                return index
+        return None
 
-    def connect(self, listener: typing.Callable[_F, typing.Any]) -> None:
+    def connect(
+        self,
+        listener: typing.Callable[_F, typing.Any],
+        *,
+        weak: bool = False,
+        dispatcher: ThreadedDispatcher | None = None,
+    ) -> None:
         """
         Connect a listener to this signal.
+
+        Parameters
+        ----------
+        listener : Callable
+            The function to call when the signal is sent.
+        weak : :py:class:`bool`
+            If the signal should only hold a weak reference to the listener, in which case the
+            listener is automatically disconnected once it is garbage collected.
+            Default to ``False``.
+        dispatcher : :py:class:`ThreadedDispatcher`, optional
+            If given, the listener is called on the dispatcher's thread instead of the sender's
+            one. Its result is then not returned by :py:meth:`.send`.
         """
-        if listener not in self.listeners:
-            self.listeners.append(listener)
+        if self._find(listener) is not None:
+            return
+
+        entry: typing.Callable[_F, typing.Any] | weakref.ref[typing.Callable[_F, typing.Any]]
+        if not weak:
+            entry = listener
+        elif hasattr(listener, "__self__") and hasattr(listener, "__func__"):
+            entry = weakref.WeakMethod(listener, self._remove_reference)  # type: ignore
+        else:
+            entry = weakref.ref(listener, self._remove_reference)
+
+        self.listeners.append(entry)
+        if dispatcher is not None:
+            self._dispatchers[id(entry)] = dispatcher
+
+    def _remove_reference(self, reference: weakref.ref[typing.Any]) -> None:
+        if reference in self.listeners:
+            self.listeners.remove(reference)
+            self._dispatchers.pop(id(reference), None)
 
     def disconnect(self, listener: typing.Callable[_F, typing.Any]) -> None:
         """
         Disconnect a listener to this signal.
         """
-        if listener in self.listeners:
-            self.listeners.remove(listener)
+        index = self._find(listener)
+        if index is not None:
+            self._dispatchers.pop(id(self.listeners.pop(index)), None)
 
-    def send(self, *args: _F.args, **kwargs: _F.kwargs) -> list[typing.Any]:
+    def clear(self) -> None:
         """
-        Sends the signal to all subscribed listeners.
+        Disconnect all the listeners of this signal.
         """
-        results: list[typing.Any] = []
-        for listener in self.listeners:
-            with contextlib.suppress(NotImplementedError):
-                result = listener(*args, **kwargs)
-                results.append(result)
-        return results
+        self.listeners.clear()
+        self._dispatchers.clear()
+
+    def send(self, *args: _F.args, **kwargs: _F.kwargs) -> typing.Sequence[typing.Any]:
+        """
+        Sends the signal to all subscribed listeners, then to the parent signal, if any.
+
+        Returns
+        -------
+        Sequence :
+            The results of the listeners.
+        """
+        signal: Signal[_F] | None = self
+        results: list[typing.Any] | None = None
+
+        while signal is not None:
+            if signal.listeners:
+                if results is None:
+                    results = []
+                signal._dispatch(results, args, kwargs)
+            signal = signal.parent
+
+        return _NO_RESULTS if results is None else results
+
+    def _dispatch(self, results: list[typing.Any], args: typing.Any, kwargs: typing.Any) -> None:
+        # Copied, listeners might disconnect themselves.
+        for entry in tuple(self.listeners):
+            listener = entry() if isinstance(entry, weakref.ref) else entry
+            if listener is None:
+                continue
+            if self._dispatchers and (dispatcher := self._dispatchers.get(id(entry))):
+                dispatcher.submit(listener, args, kwargs)
+                continue
+            try:
+                results.append(listener(*args, **kwargs))
+            except NotImplementedError:
+                pass
@@ -0,0 +1,124 @@
+import abc
+import pathlib
+import typing
+
+from typing_extensions import Self
+
+from fabricius.types import LinkMode
+
+if typing.TYPE_CHECKING:
+    from fabricius.sources.archive import TemplateSource
+
+
+class Sink(abc.ABC):
+    """
+    The Sink is where the files are written to once they are committed. By default, files are
+    written to the local disk, but they could as well be kept in memory or streamed into an
+    archive.
+
+    You must subclass this class and override the :py:meth:`write` method, if possible, also add
+    a name.
+
+    Sinks can be used as context managers, so that they are closed once everything has been
+    written.
+    """
+
+    name: typing.ClassVar[str | None] = None
+    """
+    The name of the sink, not necessary, but suggested to add.
+    """
+
+    @abc.abstractmethod
+    def write(self, path: pathlib.Path, content: str) -> None:
+        """
+        Write the content of a file.
+
+        Parameters
+        ----------
+        path : :py:class:`pathlib.Path`
+            The destination of the file, including its name.
+        content : :py:class:`str`
+            The final content of the file.
+        """
+        raise NotImplementedError()
+
+    def copy(self, source: "TemplateSource", path: pathlib.Path) -> int:
+        """
+        Copy a file as is, without it being rendered.
+        (See :py:meth:`File.copy_from() <fabricius.models.file.File.copy_from>`)
+
+        The default implementation reads the file as text and passes it to :py:meth:`write`,
+        sinks that can store bytes should override this so that binary files can be copied.
+
+        Parameters
+        ----------
+        source : :py:const:`fabricius.sources.TemplateSource`
+            The file to copy, it can be inside an archive.
+        path : :py:class:`pathlib.Path`
+            The destination of the file, including its name.
+
+        Returns
+        -------
+        :py:class:`int` :
+            The number of bytes written.
+        """
+        content = source.read_text()
+        self.write(path, content)
+        return len(content.encode("utf-8"))
+
+    def prepare(self, path: pathlib.Path) -> None:
+        """
+        Prepare the sink to receive a file, for example, by creating its parent directories.
+        Called before :py:meth:`write` and :py:meth:`link`.
+
+        Parameters
+        ----------
+        path : :py:class:`pathlib.Path`
+            The destination of the file, including its name.
+        """
+
+    def exists(self, path: pathlib.Path) -> bool:
+        """
+        Indicate if a file already exists at the given path inside the sink.
+
+        Parameters
+        ----------
+        path : :py:class:`pathlib.Path`
+            The destination of the file, including its name.
+        """
+        return False
+
+    def link(self, source: pathlib.Path, path: pathlib.Path, mode: LinkMode) -> bool:
+        """
+        Make the file at ``path`` share the content of the already written file at ``source``.
+
+        The default implementation does nothing and returns ``False``, sinks that have a cheaper
+        way to store duplicated files than writing them again should override this.
+
+        Parameters
+        ----------
+        source : :py:class:`pathlib.Path`
+            An already written file with the same content.
+        path : :py:class:`pathlib.Path`
+            The destination of the file, including its name.
+        mode : :py:const:`fabricius.types.LinkMode`
+            The requested kind of link.
+
+        Returns
+        -------
+        :py:class:`bool` :
+            If the link was made. If ``False``, the content will be written with
+            :py:meth:`write` instead.
+        """
+        return False
+
+    def close(self) -> None:
+        """
+        Finish writing. Called when leaving the sink's context manager.
+        """
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: typing.Any) -> None:
+        self.close()
@@ -0,0 +1,88 @@
+import typing
+
+from fabricius.types import FileCommitResult, FileTimings, new_timings
+
+
+class TemplateStats:
+    """
+    The aggregated statistics of a template's commit.
+
+    Obtained through :py:attr:`Template.stats <fabricius.models.template.Template.stats>` after
+    a commit with ``timings=True``, or by listening to the
+    :py:data:`on_template_stats <fabricius.app.signals.on_template_stats>` signal, which is the
+    suggested way to forward them to a metrics system.
+    """
+
+    files: int
+    """
+    The number of committed files.
+    """
+
+    bytes_written: int
+    """
+    The number of bytes written.
+    """
+
+    phases: FileTimings
+    """
+    The total time, in seconds, spent in each phase of the files' commit.
+    """
+
+    hooks: float
+    """
+    The time, in seconds, spent sending the template's signals. This is where CookieCutter's
+    hooks are ran.
+    """
+
+    total: float
+    """
+    The time, in seconds, the whole commit took.
+    """
+
+    def __init__(self) -> None:
+        self.files = 0
+        self.bytes_written = 0
+        self.phases = new_timings()
+        self.hooks = 0.0
+        self.total = 0.0
+
+    def add(self, result: FileCommitResult) -> None:
+        """
+        Add the result of a file's commit to the statistics.
+
+        Parameters
+        ----------
+        result : :py:class:`fabricius.types.FileCommitResult`
+            The result of the commit.
+        """
+        self.files += 1
+        self.bytes_written += result["bytes_written"]
+        if timings := result["timings"]:
+            for phase, duration in timings.items():
+                self.phases[phase] += duration  # type: ignore
+
+    @property
+    def files_per_second(self) -> float:
+        """
+        The number of files committed per second.
+        """
+        return self.files / self.total if self.total else 0.0
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        """
+        The statistics as a flat dictionary, ready to be serialized or sent to a metrics system.
+        """
+        return {
+            "files": self.files,
+            "bytes_written": self.bytes_written,
+            **{f"{phase}_seconds": duration for phase, duration in self.phases.items()},
+            "hooks_seconds": self.hooks,
+            "total_seconds": self.total,
+            "files_per_second": self.files_per_second,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"<TemplateStats files={self.files} bytes_written={self.bytes_written} "
+            f"total={self.total:.3f}s>"
+        )
@@ -1,9 +1,15 @@
+import concurrent.futures
+import hashlib
+import json
+import os
 import pathlib
+import time
 import typing
 
 from typing_extensions import Self
 
-from fabricius.app.signals import after_template_commit, before_template_commit
+from fabricius.app import profiling
+from fabricius.app.signals import TemplateSignals
 from fabricius.exceptions import (
     AlreadyCommittedError,
     ConflictError,
@@ -11,12 +17,43 @@ from fabricius.exceptions import (
 )
 from fabricius.models.file import File, FileCommitResult
 from fabricius.models.renderer import Renderer
-from fabricius.types import Data, PathStrOrPath
+from fabricius.models.signal import ThreadedDispatcher, get_dispatchers
+from fabricius.models.sink import Sink
+from fabricius.models.stats import TemplateStats
+from fabricius.sinks.local import LocalSink
+from fabricius.types import Data, FileTimings, LinkMode, PathStrOrPath, new_timings
+from fabricius.utils import compile_patterns
 
 STATE = typing.Literal["pending", "failed", "persisted"]
 RendererType = typing.TypeVar("RendererType", bound=type[Renderer])
 
 
+def dependency_graph(results: typing.Iterable[FileCommitResult]) -> dict[str, set[pathlib.Path]]:
+    """
+    Build the dependency graph of committed files, that is, for each template that has been
+    used by a file (For example, a partial included with Jinja's ``{% include %}``), the
+    destinations of the files that used it.
+
+    When one of these templates changes, only the files it points to have to be generated again.
+
+    Parameters
+    ----------
+    results : Iterable of :py:class:`fabricius.types.FileCommitResult`
+        The results of the commit, as given by :py:meth:`Template.commit`.
+
+    Returns
+    -------
+    :py:class:`dict` :
+        A dictionary where keys are the name of the used templates and values are the
+        destinations of the files that used them.
+    """
+    graph: dict[str, set[pathlib.Path]] = {}
+    for result in results:
+        for dependency in result["dependencies"]:
+            graph.setdefault(dependency, set()).add(result["destination"])
+    return graph
+
+
 class Template(typing.Generic[RendererType]):
     """
     The :py:class:`Template` class represent "a collection of files that, in its whole, represents
@@ -58,8 +95,24 @@ class Template(typing.Generic[RendererType]):
     The renderer that will be used to generate the files.
     """
 
+    signals: TemplateSignals
+    """
+    The signals scoped to this template. Listeners connected to them are only called for this
+    template (And its files), and are disconnected once the template has been committed.
+    """
+
+    stats: TemplateStats | None
+    """
+    The statistics of the last commit made with ``timings=True``, if any.
+    """
+
     _will_fake: bool
 
+    _destinations: set[pathlib.Path]
+    """
+    The destinations of the added files, used to detect conflicts.
+    """
+
     def __init__(
         self,
         base_folder: PathStrOrPath,
@@ -79,10 +132,105 @@ class Template(typing.Generic[RendererType]):
         self.data = {}
         self.renderer = renderer
         self._will_fake = False
+        self._destinations = set()
+        self.signals = TemplateSignals()
+        self.stats = None
 
-    @property
-    def __files_destinations(self) -> list[pathlib.Path | None]:
-        return [file.destination for file in self.files]
+    @classmethod
+    def from_directory(
+        cls,
+        path: PathStrOrPath,
+        base_folder: PathStrOrPath,
+        renderer: RendererType,
+        *,
+        include: typing.Iterable[str] | None = None,
+        exclude: typing.Iterable[str] | None = None,
+        by_extension: bool = False,
+    ) -> "Template[RendererType]":
+        """
+        Create a template from all the files inside a directory, recursively.
+
+        Files are read lazily, only once they are committed.
+
+        Parameters
+        ----------
+        path : :py:const:`fabricius.types.PathStrOrPath`
+            The directory containing the file templates.
+        base_folder : :py:const:`fabricius.types.PathStrOrPath`
+            Indication of where the template should be generated. The files keep their location
+            relatively to ``path``.
+        renderer : Type of :py:class:`fabricius.models.renderer.Renderer`
+            The renderer to use with the template, and its files.
+        include : Iterable of :py:class:`str`, optional
+            Gitignore-style patterns of the files to include. If given, only the files matching
+            one of them (Or inside a directory matching one of them) are included.
+        exclude : Iterable of :py:class:`str`, optional
+            Gitignore-style patterns of the files and directories to exclude. Excluded directories
+            are not explored.
+        by_extension : :py:class:`bool`, optional
+            If the files whose extension has a registered renderer (Such as ``.j2``) are rendered
+            by it, without their extension, instead of ``renderer``. Only the renderers that are
+            used are imported. (See :py:meth:`File.use_renderer_for_extension()
+            <fabricius.models.file.File.use_renderer_for_extension>`)
+
+        Raises
+        ------
+        :py:exc:`NotADirectoryError` :
+            The given path is not a directory.
+        :py:exc:`fabricius.exceptions.ConflictError` :
+            Two files have the same destination. (For example, ``README.md`` and
+            ``README.md.j2`` with ``by_extension``)
+
+        Returns
+        -------
+        :py:class:`Template` :
+            The template, containing the files.
+        """
+        root = pathlib.Path(path).resolve()
+        if not root.is_dir():
+            raise NotADirectoryError(f"{root} is not a directory.")
+
+        template = cls(base_folder, renderer)
+        destination_root = template.base_folder.resolve()
+        include_matcher = compile_patterns(include or ())
+        exclude_matcher = compile_patterns(exclude or ())
+
+        def is_included(relative: str, included: bool) -> bool:
+            return included or include_matcher is None or bool(include_matcher.match(relative))
+
+        # (Relative path of the directory, with a trailing "/", if an ancestor is included)
+        pending: list[tuple[str, bool]] = [("", include_matcher is None)]
+        while pending:
+            relative_directory, included = pending.pop()
+            destination = destination_root.joinpath(relative_directory)
+
+            with os.scandir(root.joinpath(relative_directory)) as entries:
+                for entry in entries:
+                    relative = f"{relative_directory}{entry.name}"
+
+                    # Symbolic links to directories are not followed, they could loop forever.
+                    if entry.is_dir(follow_symlinks=False):
+                        relative = f"{relative}/"
+                        if exclude_matcher and exclude_matcher.match(relative):
+                            continue
+                        pending.append((relative, is_included(relative, included)))
+                        continue
+                    if not entry.is_file():
+                        continue
+
+                    if exclude_matcher and exclude_matcher.match(relative):
+                        continue
+                    if not is_included(relative, included):
+                        continue
+
+                    file = File(entry.name).with_renderer(renderer)
+                    if by_extension:
+                        file.use_renderer_for_extension()
+                    file.source = pathlib.Path(entry.path)
+                    file.destination = destination
+                    template.add_file(file)
+
+        return template
 
     def add_file(self, file: File) -> Self:
         if not file.can_commit:
@@ -91,11 +239,14 @@ class Template(typing.Generic[RendererType]):
                 raise AlreadyCommittedError(file.name)
             raise MissingRequiredValueError(self, reason)
 
-        if file.destination and file.compute_destination() in self.__files_destinations:
-            raise ConflictError(
-                file,
-                f"File {file.name} has a destination that already is present in Template's destinations.",
-            )
+        if file.destination:
+            destination = file.compute_destination()
+            if destination in self._destinations:
+                raise ConflictError(
+                    file,
+                    f"File {file.name} has a destination that already is present in Template's destinations.",
+                )
+            self._destinations.add(destination)
 
         self.files.append(file)
         return self
@@ -117,21 +268,227 @@ class Template(typing.Generic[RendererType]):
         self._will_fake = False
         return self
 
-    def commit(self, *, overwrite: bool = False) -> list[FileCommitResult]:
-        results: list[FileCommitResult] = []
+    def commit(
+        self,
+        *,
+        overwrite: bool = False,
+        deduplicate: bool = False,
+        link: LinkMode | None = None,
+        sink: Sink | None = None,
+        timings: bool = False,
+        profile: "PathStrOrPath | None" = None,
+        jobs: int | None = None,
+    ) -> list[FileCommitResult]:
+        """
+        Commit all the files of the template.
 
-        before_template_commit.send(self)
+        Parameters
+        ----------
+        overwrite : :py:class:`bool`
+            If the files that already exist should be overwritten. Default to ``False``.
+        deduplicate : :py:class:`bool`
+            If files with the same content, the same renderer and the same data should be rendered
+            only once. Default to ``False``.
+
+            .. warning ::
+               Only use this if your renderer always give the same output for the same input.
+               (For example, a template generating a random UUID would generate the same UUID for
+               all of its duplicates)
+        link : :py:const:`fabricius.types.LinkMode`, optional
+            If given, files whose generated content is identical to an already saved file are
+            linked to it instead of being written again. If the link cannot be made, the file is
+            written as usual.
+        sink : :py:class:`fabricius.models.sink.Sink`, optional
+            Where to write the files. Default to the local disk.
+            (:py:class:`fabricius.sinks.LocalSink`)
+        timings : :py:class:`bool`
+            If the time spent in each phase should be recorded. If so, each result contains its
+            timings, and the aggregated statistics are set to :py:attr:`.stats` and sent through
+            the :py:data:`on_template_stats <fabricius.app.signals.on_template_stats>` signal.
+            Default to ``False``.
+        profile : :py:const:`fabricius.types.PathStrOrPath`, optional
+            Where to write a profile of the commit. A Chrome trace if it ends with ``.json``,
+            :py:mod:`cProfile` statistics otherwise. Default to the ``FABRICIUS_PROFILE``
+            environment variable, if set. (See :py:func:`fabricius.app.profiling.profile`)
+        jobs : :py:class:`int`, optional
+            If greater than 1, the number of threads used to read & render the files
+            concurrently. Files are still written one by one, in order, and the signals are sent
+            from the calling thread. Ignored when deduplicating or linking files.
+
+        Returns
+        -------
+        :py:class:`list` of :py:class:`fabricius.types.FileCommitResult` :
+            The result of each file's commit.
+        """
+        with profiling.profile(profile):
+            return self._commit(
+                overwrite=overwrite,
+                deduplicate=deduplicate,
+                link=link,
+                sink=sink or LocalSink(),
+                timings=timings,
+                jobs=jobs,
+            )
+
+    def _commit(
+        self,
+        *,
+        overwrite: bool,
+        deduplicate: bool,
+        link: LinkMode | None,
+        sink: Sink,
+        timings: bool,
+        jobs: int | None,
+    ) -> list[FileCommitResult]:
+        clock = time.perf_counter
+        start = clock()
+
+        self.signals.before_template_commit.send(self)
+        hooks = clock() - start
+
+        try:
+            results = self._commit_files(
+                overwrite=overwrite,
+                deduplicate=deduplicate,
+                link=link,
+                sink=sink,
+                timings=timings,
+                jobs=jobs,
+            )
+        finally:
+            self._flush_dispatchers()
+
+        hooks_start = clock()
+        self.signals.after_template_commit.send(self, results)
+        self._flush_dispatchers()
+        hooks += clock() - hooks_start
+
+        if timings:
+            stats = TemplateStats()
+            for result in results:
+                stats.add(result)
+            stats.hooks = hooks
+            stats.total = clock() - start
+            self.stats = stats
+            self.signals.on_template_stats.send(self, stats)
+
+        for dispatcher in self._get_dispatchers():
+            dispatcher.close()
+        self.signals.clear()
+
+        return results
+
+    def _get_dispatchers(self) -> list[ThreadedDispatcher]:
+        # Only the dispatchers this template (Or its files) sends to, other commits may be
+        # running at the same time.
+        signals = list(self.signals)
+        found = {}
+        for file in self.files:
+            if file._signals is not None:
+                signals.extend(file._signals)
+            found.update((id(dispatcher), dispatcher) for dispatcher in file._dispatchers)
+        found.update((id(dispatcher), dispatcher) for dispatcher in get_dispatchers(signals))
+        return list(found.values())
+
+    def _flush_dispatchers(self) -> None:
+        for dispatcher in self._get_dispatchers():
+            dispatcher.flush()
+
+    def _commit_files(
+        self,
+        *,
+        overwrite: bool,
+        deduplicate: bool,
+        link: LinkMode | None,
+        sink: Sink,
+        timings: bool,
+        jobs: int | None,
+    ) -> list[FileCommitResult]:
+        results: list[FileCommitResult] = []
+        rendered: dict[bytes, FileCommitResult] = {}
+        written: dict[bytes, pathlib.Path] = {}
 
         for file in self.files:
             file.with_data(self.data, overwrite=False)
+            file._attach_signals(self.signals)
             if self._will_fake:
                 file.fake()
             else:
                 # Just in case they've been set to fake...
                 file.restore()
-            result = file.commit(overwrite=overwrite)
+
+        if jobs and jobs > 1 and not (deduplicate or link):
+            return self._commit_concurrently(
+                overwrite=overwrite, sink=sink, timings=timings, jobs=jobs
+            )
+
+        for file in self.files:
+            if not (deduplicate or link) or file.verbatim:
+                results.append(file.commit(overwrite=overwrite, sink=sink, timings=timings))
+                continue
+
+            file._ensure_committable()
+            phases = new_timings() if timings else None
+
+            key = _input_fingerprint(file) if deduplicate else None
+            if key is not None and key in rendered:
+                final_content = rendered[key]["content"]
+                file.dependencies = rendered[key]["dependencies"]
+            else:
+                final_content = file._generate(phases)
+
+            output_key = hashlib.sha256(final_content.encode("utf-8")).digest()
+            result = file._persist(
+                final_content,
+                overwrite=overwrite,
+                sink=sink,
+                link_from=written.get(output_key),
+                link=link,
+                timings=phases,
+            )
             results.append(result)
 
-        after_template_commit.send(self, results)
+            if result["state"] == "persisted" and not result["fake"]:
+                written.setdefault(output_key, result["destination"])
+            if key is not None:
+                rendered.setdefault(key, result)
 
         return results
+
+    def _commit_concurrently(
+        self, *, overwrite: bool, sink: Sink, timings: bool, jobs: int
+    ) -> list[FileCommitResult]:
+        def generate(file: File) -> tuple[FileTimings | None, str | None]:
+            file._ensure_committable()
+            phases = new_timings() if timings else None
+            return phases, None if file.verbatim else file._generate(phases)
+
+        results: list[FileCommitResult] = []
+        with concurrent.futures.ThreadPoolExecutor(jobs, thread_name_prefix="fabricius") as pool:
+            # Rendered concurrently, but saved in order by this thread.
+            for file, (phases, final_content) in zip(self.files, pool.map(generate, self.files)):
+                results.append(
+                    file._persist(final_content, overwrite=overwrite, sink=sink, timings=phases)
+                )
+        return results
+
+
+def _input_fingerprint(file: File) -> bytes | None:
+    """
+    Compute the fingerprint of everything that has an influence on a file's rendering, that is,
+    its renderer, its content and its data.
+
+    Returns ``None`` if the data cannot be fingerprinted, in which case the file must be rendered.
+    """
+    try:
+        data = json.dumps(file.data, sort_keys=True, default=repr)
+    except (TypeError, ValueError):
+        return None
+
+    fingerprint = hashlib.sha256()
+    fingerprint.update(f"{file.renderer.__module__}.{file.renderer.__qualname__}".encode())
+    fingerprint.update(b"\0")
+    fingerprint.update(typing.cast(str, file.content).encode("utf-8"))
+    fingerprint.update(b"\0")
+    fingerprint.update(data.encode("utf-8"))
+    return fingerprint.digest()
@@ -0,0 +1,336 @@
+import concurrent.futures
+import multiprocessing
+import pathlib
+import pickle
+import typing
+
+from fabricius.exceptions import FabriciusError, TemplateError
+from fabricius.models.stats import TemplateStats
+from fabricius.models.template import Template
+from fabricius.readers.cookiecutter.config import get_config
+from fabricius.readers.cookiecutter.hooks import (
+    HookMode,
+    HookTimeout,
+    check_hook_options,
+)
+from fabricius.readers.cookiecutter.setup import (
+    Context,
+    build_template,
+    get_defaults,
+    get_questions_only,
+    take_snapshot,
+)
+from fabricius.readers.cookiecutter.snapshot import (
+    Snapshot,
+    SnapshotCache,
+    get_snapshot,
+)
+from fabricius.renderers.jinja_renderer import JinjaRenderer
+from fabricius.sources.archive import ArchivePath, TemplateSource, open_template
+from fabricius.types import FileCommitResult, PathStrOrPath
+
+
+class ProjectResult(typing.TypedDict):
+    """
+    The result of the generation of one project by
+    :py:meth:`PreparedTemplate.generate_many`.
+    """
+
+    output_folder: pathlib.Path
+    """
+    The folder the project was generated into.
+    """
+
+    context: dict[str, typing.Any]
+    """
+    The answers the project was generated with.
+    """
+
+    files: list[FileCommitResult]
+    """
+    The files that were committed. Empty if the generation failed.
+    """
+
+    error: BaseException | None
+    """
+    The exception that stopped the generation, if it failed.
+    """
+
+    stats: TemplateStats | None
+    """
+    The statistics of the generation, if timings were requested and it succeeded.
+    """
+
+
+class _Options(typing.TypedDict):
+    config_file: "PathStrOrPath | None"
+    cache: SnapshotCache | None
+    hooks_mode: HookMode
+    hooks_timeout: float | None
+
+
+class PreparedTemplate:
+    """
+    A CookieCutter template that has been read, and whose file templates have been compiled, so
+    that it can generate many projects, with different answers, without doing it again.
+
+    Use :py:func:`prepare` to obtain one.
+    """
+
+    snapshot: Snapshot
+    """
+    The snapshot of the template. It is not checked for modifications.
+    """
+
+    defaults: dict[str, typing.Any]
+    """
+    The default answers, from ``cookiecutter.json`` and the user config. Answers that are not
+    given to :py:meth:`generate` fall back to these.
+    """
+
+    _options: _Options
+
+    def __init__(self, snapshot: Snapshot, options: _Options) -> None:
+        self.snapshot = snapshot
+        self._options = options
+        self.defaults = {
+            **get_defaults(get_questions_only(Context(snapshot.context))),
+            **get_config(options["config_file"])["default_context"],
+        }
+
+    def build(
+        self, context: dict[str, typing.Any], output_folder: PathStrOrPath
+    ) -> Template[type[JinjaRenderer]]:
+        """
+        Build the template of one project, ready to be committed, without asking anything.
+
+        Parameters
+        ----------
+        context : :py:const:`Data <fabricius.types.Data>`
+            The answers to the template's questions.
+        output_folder : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`
+            The folder to generate the project into.
+        """
+        return build_template(
+            self.snapshot,
+            pathlib.Path(output_folder),
+            {**self.defaults, **context},
+            remember=False,
+            hooks_mode=self._options["hooks_mode"],
+            hooks_timeout=self._options["hooks_timeout"],
+        )
+
+    def generate(
+        self,
+        context: dict[str, typing.Any],
+        output_folder: PathStrOrPath,
+        *,
+        overwrite: bool = False,
+        jobs: int | None = None,
+        timings: bool = False,
+    ) -> list[FileCommitResult]:
+        """
+        Generate one project. Its hooks are ran, as with :py:func:`run`, but nothing is asked.
+
+        Parameters
+        ----------
+        context : :py:const:`Data <fabricius.types.Data>`
+            The answers to the template's questions.
+        output_folder : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`
+            The folder to generate the project into.
+        overwrite : bool, optional
+            If existing files can be overwritten. By default False.
+        jobs : int, optional
+            The number of threads used to render the files, see
+            :py:meth:`Template.commit() <fabricius.models.template.Template.commit>`.
+        timings : bool, optional
+            If the timings of each file should be recorded. By default False.
+
+        Raises
+        ------
+        :py:exc:`FileExistsError`
+            If a file already exists and ``overwrite`` is False.
+        :py:exc:`fabricius.readers.cookiecutter.exceptions.FailedHookError`
+            If a hook failed.
+        """
+        return self.build(context, output_folder).commit(
+            overwrite=overwrite, jobs=jobs, timings=timings
+        )
+
+    def generate_many(
+        self,
+        contexts: typing.Iterable[dict[str, typing.Any]],
+        output_folders: typing.Iterable[PathStrOrPath],
+        *,
+        jobs: int | None = None,
+        executor: typing.Literal["thread", "process"] = "thread",
+        overwrite: bool = False,
+        timings: bool = False,
+    ) -> list[ProjectResult]:
+        """
+        Generate many projects, concurrently. A project that fails does not stop the others.
+
+        Parameters
+        ----------
+        contexts : Iterable of :py:const:`Data <fabricius.types.Data>`
+            The answers of each project.
+        output_folders : Iterable of :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`
+            The folder of each project, in the same order as ``contexts``.
+        jobs : int, optional
+            How many projects are generated at the same time. By default, as many as
+            :py:class:`concurrent.futures.ThreadPoolExecutor` or
+            :py:class:`concurrent.futures.ProcessPoolExecutor` would use.
+        executor : str, optional
+            If projects are generated by threads (``"thread"``, the default) or processes
+            (``"process"``). Processes prepare the template once each, and are only worth it
+            for templates that are long to render.
+        overwrite : bool, optional
+            If existing files can be overwritten. By default False.
+        timings : bool, optional
+            If the timings & statistics of each project should be recorded. By default False.
+
+        Returns
+        -------
+        list of :py:class:`ProjectResult` :
+            The result of each project, in the same order as ``contexts``.
+        """
+        projects = [
+            (dict(context), pathlib.Path(output).resolve())
+            for context, output in zip(contexts, output_folders, strict=True)
+        ]
+
+        pool: concurrent.futures.Executor
+        if executor == "process":
+            pool = concurrent.futures.ProcessPoolExecutor(
+                jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_worker,
+                initargs=(self.snapshot.base_folder, self._options),
+            )
+            task: typing.Callable[..., ProjectResult] = _generate_in_worker
+        else:
+            pool = concurrent.futures.ThreadPoolExecutor(jobs, thread_name_prefix="fabricius")
+            task = self._generate_project
+
+        with pool:
+            futures = [
+                pool.submit(task, context, output, overwrite, timings)
+                for context, output in projects
+            ]
+            results: list[ProjectResult] = []
+            for future, (context, output) in zip(futures, projects):
+                try:
+                    results.append(future.result())
+                except Exception as exception:  # The worker itself died.
+                    results.append(
+                        ProjectResult(
+                            output_folder=output,
+                            context=context,
+                            files=[],
+                            error=exception,
+                            stats=None,
+                        )
+                    )
+        return results
+
+    def _generate_project(
+        self,
+        context: dict[str, typing.Any],
+        output_folder: pathlib.Path,
+        overwrite: bool,
+        timings: bool,
+    ) -> ProjectResult:
+        result = ProjectResult(
+            output_folder=output_folder, context=context, files=[], error=None, stats=None
+        )
+        try:
+            template = self.build(context, output_folder)
+            result["files"] = template.commit(overwrite=overwrite, timings=timings)
+            result["stats"] = template.stats
+        except Exception as exception:
+            result["error"] = exception
+        return result
+
+
+def prepare(
+    template_folder: "PathStrOrPath | ArchivePath",
+    *,
+    config_file: "PathStrOrPath | None" = None,
+    cache: SnapshotCache | None = "memory",
+    hooks_mode: HookMode = "subprocess",
+    hooks_timeout: HookTimeout = "default",
+) -> PreparedTemplate:
+    """Read a CookieCutter template and compile its file templates, once, so that it can generate
+    many projects. (See :py:meth:`PreparedTemplate.generate_many`)
+
+    .. code-block:: py
+
+       prepared = prepare("./my-template")
+       results = prepared.generate_many(
+           [{"team": team} for team in teams],
+           [f"./services/{team}" for team in teams],
+           jobs=8,
+       )
+
+    Parameters
+    ----------
+    template_folder : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`
+        The folder where the template is located. (The folder where ``cookiecutter.json`` is
+        located) It can also be a zip or tar archive, see :py:func:`setup`.
+    config_file : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`, optional
+        The user config to use, see :py:func:`setup`.
+    cache : :py:const:`SnapshotCache <fabricius.readers.cookiecutter.snapshot.SnapshotCache>`, optional
+        Where to keep the snapshot of the template, see :py:func:`setup`.
+    hooks_mode : :py:const:`HookMode <fabricius.readers.cookiecutter.hooks.HookMode>`, optional
+        How to run Python hooks. By default, in a subprocess. Projects generated concurrently
+        should not use ``"in-process"``, which is not thread-safe.
+    hooks_timeout : float, optional
+        The time, in seconds, each hook is given to run, ``None`` to wait indefinitely. By
+        default (``"default"``) 10 seconds, or no timeout with the ``"in-process"`` mode, which
+        cannot be given one. (See :py:func:`check_hook_options
+        <fabricius.readers.cookiecutter.hooks.check_hook_options>`)
+
+    Raises
+    ------
+    :py:exc:`fabricius.exceptions.TemplateError`
+        If the template is not valid.
+    :py:exc:`ValueError`
+        If a timeout is given for the ``"in-process"`` hooks mode.
+    """
+    hooks_timeout = check_hook_options(hooks_mode, hooks_timeout)
+    base_folder = open_template(template_folder)
+    if not base_folder.is_dir():
+        raise TemplateError(base_folder.name, "cookiecutter.json does not exist")
+
+    snapshot = get_snapshot(base_folder, take_snapshot, cache=cache)
+    snapshot.warm()
+    return PreparedTemplate(
+        snapshot,
+        _Options(
+            config_file=config_file,
+            cache=cache,
+            hooks_mode=hooks_mode,
+            hooks_timeout=hooks_timeout,
+        ),
+    )
+
+
+_worker_template: PreparedTemplate | None = None
+
+
+def _initialize_worker(base_folder: TemplateSource, options: _Options) -> None:
+    global _worker_template
+    _worker_template = prepare(base_folder, **options)
+
+
+def _generate_in_worker(
+    context: dict[str, typing.Any], output_folder: pathlib.Path, overwrite: bool, timings: bool
+) -> ProjectResult:
+    assert _worker_template is not None
+    result = _worker_template._generate_project(context, output_folder, overwrite, timings)
+    if result["error"] is not None:
+        try:
+            pickle.dumps(result["error"])
+        except Exception:
+            result["error"] = FabriciusError(repr(result["error"]))
+    return result
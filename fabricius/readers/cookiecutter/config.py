@@ -1,9 +1,12 @@
+import os
+import threading
 import typing
-from copy import deepcopy
 from pathlib import Path
 
 import yaml
 
+from fabricius.types import PathStrOrPath
+
 
 class Config(typing.TypedDict):
     default_context: dict[typing.Any, typing.Any]
@@ -13,32 +16,100 @@ DEFAULT_CONFIG: Config = {
     "default_context": {},
 }
 
+CONFIG_ENVIRONMENT_VARIABLE = "COOKIECUTTER_CONFIG"
+"""
+The environment variable that, like with CookieCutter, overrides the path of the user config.
+"""
+
+_cache: dict[Path, tuple[tuple[int, int], Config]] = {}
+_cache_lock = threading.Lock()
+
+
+def get_config_path(path: "PathStrOrPath | None" = None) -> Path:
+    """
+    Obtain the path of the user config: ``path`` if given, otherwise the path inside the
+    ``COOKIECUTTER_CONFIG`` environment variable, otherwise ``~/.cookiecutterrc``.
+    """
+    if path is None:
+        path = os.environ.get(CONFIG_ENVIRONMENT_VARIABLE) or "~/.cookiecutterrc"
+    return Path(path).expanduser()
+
+
+def read_config_file(path: "PathStrOrPath | None" = None) -> Config:
+    """
+    Read and parse the user config.
+
+    The parsed config is cached until the file's modification time or size changes, so that the
+    file is only stat'ed, and not parsed, on subsequent calls.
+
+    Parameters
+    ----------
+    path : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`, optional
+        The path of the config. Default to :py:func:`get_config_path`'s result.
+    """
+    path = get_config_path(path)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return DEFAULT_CONFIG
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
 
-def read_config_file() -> Config:
     try:
-        config = Path("~/.cookiecutterrc").expanduser().read_text()
-        return yaml.safe_load(config)
+        config = yaml.safe_load(path.read_text()) or {}
     except FileNotFoundError:
         return DEFAULT_CONFIG
 
+    with _cache_lock:
+        _cache[path] = (key, config)
+    return config
+
+
+def clear_config_cache() -> None:
+    """
+    Forget all the configs read by :py:func:`read_config_file`.
+    """
+    with _cache_lock:
+        _cache.clear()
+
 
 def deep_merge(
     base: dict[typing.Any, typing.Any], update_with: dict[typing.Any, typing.Any]
 ) -> dict[typing.Any, typing.Any]:
-    data = deepcopy(base)
+    """
+    Merge two dictionaries, recursively, without modifying them.
+
+    Only the dictionaries that are modified by the merge are copied, the other values are shared
+    with ``base`` and ``update_with``.
+    """
+    data = dict(base)
 
     for key, value in update_with.items():
-        if isinstance(value, dict):
-            data[key] = deep_merge(base.get(key, {}), value)
+        current = data.get(key)
+        if isinstance(value, dict) and isinstance(current, dict) and current:
+            data[key] = deep_merge(current, value)
         else:
             data[key] = value
 
     return data
 
 
-def get_config() -> Config:
-    conf_data = read_config_file()
+def get_config(path: "PathStrOrPath | None" = None) -> Config:
+    """
+    Obtain the user config, merged with the default config.
+
+    The returned config shares its values with the cached config, they must not be modified.
+
+    Parameters
+    ----------
+    path : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`, optional
+        The path of the config. Default to :py:func:`get_config_path`'s result.
+    """
+    conf_data = read_config_file(path)
 
-    data: Config = deep_merge(DEFAULT_CONFIG, conf_data)  # wtf?
+    data = deep_merge(typing.cast(dict[typing.Any, typing.Any], DEFAULT_CONFIG), conf_data)
 
     return Config(default_context=data["default_context"])
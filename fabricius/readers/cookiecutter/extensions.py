@@ -4,12 +4,24 @@ import json
 import string
 import typing
 import uuid
+from collections.abc import Mapping
 from secrets import choice
 
 from jinja2 import Environment
 from jinja2.ext import Extension
 from slugify import slugify as pyslugify  # type: ignore
 
+from fabricius.types import Lazy
+
+
+def _jsonable(obj: object) -> object:
+    # Lazy values, and the mappings renderers wrap them in, are not known by json.
+    if isinstance(obj, Lazy):
+        return obj.resolve()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 
 class JsonifyExtension(Extension):
     """Jinja2 extension to convert a Python object to JSON."""
@@ -19,7 +31,7 @@ class JsonifyExtension(Extension):
         super().__init__(environment)
 
         def jsonify(obj: object) -> str:
-            return json.dumps(obj, sort_keys=True, indent=4)
+            return json.dumps(obj, sort_keys=True, indent=4, default=_jsonable)
 
         environment.filters["jsonify"] = jsonify  # type: ignore
 
@@ -1,25 +1,35 @@
+import builtins
 import errno
+import multiprocessing
+import multiprocessing.connection
+import multiprocessing.process
+import os
 import pathlib
+import stat
 import subprocess
 import sys
 import tempfile
+import threading
+import traceback
 import typing
 
+from fabricius.app.profiling import span
 from fabricius.models.file import FileCommitResult
 from fabricius.models.template import Template
 from fabricius.readers.cookiecutter.exceptions import FailedHookError
 from fabricius.renderers.jinja_renderer import JinjaRenderer
+from fabricius.sources.archive import TemplateSource
 from fabricius.types import Data
 
 HOOKS = ["pre_gen_project", "post_gen_project"]
 
 
 class AvailableHooks(typing.TypedDict):
-    pre_gen_project: typing.Optional[pathlib.Path]
-    post_gen_project: typing.Optional[pathlib.Path]
+    pre_gen_project: typing.Optional[TemplateSource]
+    post_gen_project: typing.Optional[TemplateSource]
 
 
-def get_hooks(base_folder: pathlib.Path) -> AvailableHooks | None:
+def get_hooks(base_folder: TemplateSource) -> AvailableHooks | None:
     hooks_folder = base_folder.joinpath("hooks")
     if not hooks_folder.exists():
         return None
@@ -35,45 +45,309 @@ def get_hooks(base_folder: pathlib.Path) -> AvailableHooks | None:
     return None if len(available_hooks) == 0 else available_hooks
 
 
-def run_hook(hook: pathlib.Path, data: Data):
-    # Renderer the file
+HookMode = typing.Literal["subprocess", "in-process", "worker"]
+"""
+How Python hooks are ran:
+
+- ``"subprocess"``: In a new interpreter, like CookieCutter does.
+- ``"in-process"``: Inside the current interpreter, on the calling thread, which avoids the
+  interpreter's startup. The hook shares the process' modules and state, and cannot time out.
+  It is not thread-safe: while it runs, the current directory and ``sys.argv`` of the whole
+  process are the hook's, other threads included. Only use it when nothing else runs
+  concurrently.
+- ``"worker"``: Inside a separate interpreter that is started once, then reused by all hooks.
+  (See :py:class:`HookWorker`)
+
+Hooks that are not Python scripts always run in a subprocess.
+"""
+
+DEFAULT_TIMEOUT = 10.0
+"""
+The default time, in seconds, a hook is given to run, unless it runs ``"in-process"``.
+"""
+
+HookTimeout = typing.Union[float, None, typing.Literal["default"]]
+"""
+The time, in seconds, a hook is given to run. ``None`` to wait indefinitely, or
+``"default"`` for :py:const:`DEFAULT_TIMEOUT`, or no timeout with the ``"in-process"`` mode.
+(See :py:func:`check_hook_options`)
+"""
+
+_in_process_lock = threading.Lock()
+
+
+def check_hook_options(mode: HookMode, timeout: HookTimeout = "default") -> float | None:
+    """
+    Check that hooks can run with the given mode and timeout, and obtain the timeout to use.
+
+    Returns
+    -------
+    :py:class:`float`, optional :
+        The timeout, ``"default"`` being resolved for the mode.
+
+    Raises
+    ------
+    :py:exc:`ValueError` :
+        A timeout is given for the ``"in-process"`` mode, which cannot stop a hook.
+    """
+    if mode == "in-process":
+        if timeout not in ("default", None):
+            raise ValueError(
+                "Hooks ran in-process cannot time out, use no timeout or the 'worker' mode."
+            )
+        return None
+    return DEFAULT_TIMEOUT if timeout == "default" else timeout
+
+
+def _execute_hook(source: str, filename: str, cwd: str) -> tuple[int, str | None]:
+    """
+    Execute a rendered Python hook as the ``__main__`` module, from ``cwd``.
+
+    Returns
+    -------
+    :py:class:`tuple` :
+        The exit status of the hook and, if it failed, the reason why.
+    """
+    previous_cwd, previous_argv = os.getcwd(), sys.argv
+    namespace = {"__name__": "__main__", "__file__": filename, "__builtins__": builtins}
+    try:
+        os.chdir(cwd)
+        sys.argv = [filename]
+        exec(compile(source, filename, "exec"), namespace)
+    except SystemExit as exception:
+        if exception.code is None:
+            return 0, None
+        if isinstance(exception.code, int):
+            return exception.code, None
+        return 1, str(exception.code)
+    except Exception as exception:
+        return 1, "".join(traceback.format_exception_only(exception)).strip()
+    finally:
+        os.chdir(previous_cwd)
+        sys.argv = previous_argv
+    return 0, None
+
+
+def _serve(connection: "multiprocessing.connection.Connection") -> None:
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        connection.send(_execute_hook(*request))
+
+
+class HookWorker:
+    """
+    A separate interpreter that runs Python hooks, one at a time.
+
+    The interpreter is started upon the first hook (Or with :py:meth:`start`, to have it ready
+    beforehand), then reused by the next hooks. If a hook times out, the interpreter is killed,
+    and a new one is started for the next hook.
+    """
+
+    _process: multiprocessing.process.BaseProcess | None
+    _connection: "multiprocessing.connection.Connection | None"
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        self._process = None
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Start the worker's interpreter, if not started yet.
+        """
+        if self._process is not None and self._process.is_alive():
+            return
+        context = multiprocessing.get_context("spawn")
+        connection, child_connection = context.Pipe()
+        process = context.Process(
+            target=_serve, args=(child_connection,), name="fabricius-hooks", daemon=True
+        )
+        process.start()
+        child_connection.close()
+        self._process, self._connection = process, connection
+
+    def run(
+        self, source: str, filename: str, cwd: str, timeout: float | None
+    ) -> tuple[int, str | None]:
+        """
+        Run a rendered Python hook inside the worker.
+
+        Raises
+        ------
+        :py:exc:`TimeoutError` :
+            The hook did not finish in time. The worker has been stopped.
+        """
+        with self._lock:
+            self.start()
+            assert self._connection is not None
+            try:
+                self._connection.send((source, filename, cwd))
+                if not self._connection.poll(timeout):
+                    raise TimeoutError()
+                return self._connection.recv()
+            except (TimeoutError, EOFError, OSError):
+                # The worker is either stuck or dead.
+                self.stop()
+                raise
+
+    def stop(self) -> None:
+        """
+        Stop the worker's interpreter.
+        """
+        if self._connection is not None:
+            self._connection.close()
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+        self._process = self._connection = None
+
+
+worker = HookWorker()
+"""
+The worker used by hooks ran in the ``"worker"`` mode.
+"""
+
+
+def run_hook(
+    hook: TemplateSource,
+    data: Data,
+    *,
+    renderer: type[JinjaRenderer] = JinjaRenderer,
+    mode: HookMode = "subprocess",
+    timeout: HookTimeout = "default",
+):
+    """
+    Render and run a hook.
+
+    Hooks are ran from the output folder, like with CookieCutter.
+
+    Parameters
+    ----------
+    hook : :py:const:`fabricius.sources.TemplateSource`
+        The hook to run, it can be inside an archive.
+    data : :py:const:`fabricius.types.Data`
+        The data to render the hook with.
+    renderer : Type of :py:class:`fabricius.renderers.jinja_renderer.JinjaRenderer`
+        The renderer to render the hook with.
+    mode : :py:const:`HookMode`
+        How to run Python hooks. Default to ``"subprocess"``.
+    timeout : :py:const:`HookTimeout`, optional
+        The time, in seconds, the hook is given to run. ``None`` to wait indefinitely. By
+        default, :py:const:`DEFAULT_TIMEOUT`, or no timeout with the ``"in-process"`` mode.
+
+    Raises
+    ------
+    :py:exc:`fabricius.readers.cookiecutter.exceptions.FailedHookError` :
+        The hook failed, or timed out.
+    :py:exc:`ValueError` :
+        A timeout is given for the ``"in-process"`` mode. (See :py:func:`check_hook_options`)
+    """
+    timeout = check_hook_options(mode, timeout)
+    with span(hook.name, "hook", mode=mode):
+        final_content = renderer(data).render(hook.read_text())
+        cwd = _hook_directory(data)
+        if hook.suffix == ".py" and mode == "in-process":
+            _check_status(hook, *_run_in_process(final_content, str(hook), cwd))
+        elif hook.suffix == ".py" and mode == "worker":
+            try:
+                status = worker.run(final_content, str(hook), cwd, timeout)
+            except TimeoutError as exception:
+                raise FailedHookError(hook.name, f"Timed out after {timeout}s") from exception
+            except (EOFError, OSError) as exception:
+                raise FailedHookError(hook.name, "The worker stopped unexpectedly") from exception
+            _check_status(hook, *status)
+        else:
+            _run_in_subprocess(hook, final_content, cwd, timeout)
+
+
+def _hook_directory(data: Data) -> str:
+    output = data.get("cookiecutter", {}).get("_output_dir")
+    if not output:
+        return os.getcwd()
+    os.makedirs(output, exist_ok=True)
+    return output
+
+
+def _check_status(hook: TemplateSource, status: int, reason: str | None) -> None:
+    if status != 0:
+        raise FailedHookError(hook.name, reason or f"Exit status: {status}", exit_code=status)
+
+
+def _run_in_process(source: str, filename: str, cwd: str) -> tuple[int, str | None]:
+    # The current directory & arguments are global to the process, one hook at a time. The
+    # hook runs on the calling thread, so that they are always restored once it is done.
+    with _in_process_lock:
+        return _execute_hook(source, filename, cwd)
+
+
+def _run_in_subprocess(
+    hook: TemplateSource, final_content: str, cwd: str, timeout: float | None
+) -> None:
     with tempfile.NamedTemporaryFile(
         delete=False, suffix=hook.suffix, mode="wb"
     ) as temporary_file:
-        final_content = JinjaRenderer(data).render(hook.read_text())
         temporary_file.write(final_content.encode("utf-8"))
 
     path = pathlib.Path(temporary_file.name).resolve()
-    cmd = [sys.executable, str(path)] if hook.suffix == ".py" else [str(path)]
-
     try:
-        proc_exit = subprocess.Popen(cmd, shell=sys.platform.startswith("win"), cwd=".").wait(10)
+        if hook.suffix != ".py":
+            path.chmod(path.stat().st_mode | stat.S_IXUSR)
+        cmd = [sys.executable, str(path)] if hook.suffix == ".py" else [str(path)]
+
+        process = subprocess.Popen(cmd, shell=sys.platform.startswith("win"), cwd=cwd)
+        try:
+            proc_exit = process.wait(timeout)
+        except subprocess.TimeoutExpired as exception:
+            process.kill()
+            process.wait()
+            raise FailedHookError(hook.name, f"Timed out after {timeout}s") from exception
         if proc_exit != 0:
-            raise FailedHookError(hook.name, f"Exit status: {proc_exit}")
+            raise FailedHookError(hook.name, f"Exit status: {proc_exit}", exit_code=proc_exit)
     except OSError as exception:
         if exception.errno == errno.ENOEXEC:
             raise FailedHookError(
                 hook.name, "Might be an empty file or missing a shebang"
             ) from exception
-        raise FailedHookError(f"Exception: {exception}") from exception
+        raise FailedHookError(hook.name, f"Exception: {exception}") from exception
+    finally:
+        path.unlink(missing_ok=True)
 
 
 @typing.overload
 def adapt(
-    hook: pathlib.Path, type: typing.Literal["pre"]
+    hook: TemplateSource,
+    type: typing.Literal["pre"],
+    *,
+    renderer: type[JinjaRenderer] = JinjaRenderer,
+    mode: HookMode = "subprocess",
+    timeout: HookTimeout = "default",
 ) -> typing.Callable[[Template[typing.Any]], typing.Any]:
     ...
 
 
 @typing.overload
 def adapt(
-    hook: pathlib.Path, type: typing.Literal["post"]
+    hook: TemplateSource,
+    type: typing.Literal["post"],
+    *,
+    renderer: type[JinjaRenderer] = JinjaRenderer,
+    mode: HookMode = "subprocess",
+    timeout: HookTimeout = "default",
 ) -> typing.Callable[[Template[typing.Any], list[FileCommitResult]], typing.Any]:
     ...
 
 
 def adapt(
-    hook: pathlib.Path, type: typing.Literal["pre", "post"]
+    hook: TemplateSource,
+    type: typing.Literal["pre", "post"],
+    *,
+    renderer: type[JinjaRenderer] = JinjaRenderer,
+    mode: HookMode = "subprocess",
+    timeout: HookTimeout = "default",
 ) -> (
     typing.Callable[[Template[typing.Any]], typing.Any]
     | typing.Callable[[Template[typing.Any], list[FileCommitResult]], typing.Any]
@@ -81,13 +355,13 @@ def adapt(
     if type == "pre":
 
         def pre_wrapper(template: Template[typing.Any]):
-            run_hook(hook, template.data)
+            run_hook(hook, template.data, renderer=renderer, mode=mode, timeout=timeout)
 
         return pre_wrapper
 
     if type == "post":
 
         def post_wrapper(template: Template[typing.Any], files_commit: list[FileCommitResult]):
-            run_hook(hook, template.data)
+            run_hook(hook, template.data, renderer=renderer, mode=mode, timeout=timeout)
 
         return post_wrapper
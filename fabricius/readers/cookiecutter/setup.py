@@ -1,26 +1,43 @@
 import json
+import logging
 import pathlib
 import sys
 import typing
-from fnmatch import fnmatch
 from functools import partial
 
-from rich import get_console
-from rich.prompt import Confirm, Prompt
-
-from fabricius.app.signals import after_template_commit, before_template_commit
-from fabricius.app.ui import TemplateProgressBar
+from fabricius.app import profiling
+from fabricius.app.headless import LogProgress
 from fabricius.exceptions import TemplateError
 from fabricius.models.file import File
-from fabricius.models.renderer import Renderer
 from fabricius.models.template import Template
 from fabricius.readers.cookiecutter.config import get_config
 from fabricius.readers.cookiecutter.exceptions import FailedHookError
-from fabricius.readers.cookiecutter.hooks import adapt, get_hooks
+from fabricius.readers.cookiecutter.hooks import (
+    HookMode,
+    HookTimeout,
+    adapt,
+    check_hook_options,
+    get_hooks,
+)
+from fabricius.readers.cookiecutter.snapshot import (
+    Listings,
+    Snapshot,
+    SnapshotCache,
+    get_snapshot,
+)
+from fabricius.readers.cookiecutter.walker import (
+    CopyMatcher,
+    PathRenderer,
+    walk_template,
+)
 from fabricius.renderers.jinja_renderer import JinjaRenderer
+from fabricius.sources.archive import ArchivePath, TemplateSource, open_template
 from fabricius.types import FileCommitResult, PathStrOrPath
 from fabricius.utils import fetch_me_a_beer, sentence_case
 
+if typing.TYPE_CHECKING:
+    from fabricius.app.ui import TemplateProgressBar
+
 EXTENSIONS = [
     "fabricius.readers.cookiecutter.extensions.JsonifyExtension",
     "fabricius.readers.cookiecutter.extensions.RandomStringExtension",
@@ -29,18 +46,15 @@ EXTENSIONS = [
     "jinja2_time.TimeExtension",
 ]
 
+_log = logging.getLogger(__name__)
+
 
 Context = typing.NewType("Context", dict[str, typing.Any])
 QuestionContext = typing.NewType("QuestionContext", dict[str, typing.Any])
 CookieContext = typing.NewType("CookieContext", dict[str, typing.Any])
 
 
-class CopyRender(Renderer):
-    def render(self, content: str) -> str:
-        return content
-
-
-def obtain_template_path(base_folder: pathlib.Path) -> pathlib.Path | None:
+def obtain_template_path(base_folder: TemplateSource) -> "TemplateSource | None":
     return next(
         (
             path
@@ -56,35 +70,115 @@ def wrap_in_cookie(data: Context) -> CookieContext:
 
 
 def obtain_files(
-    base_folder: pathlib.Path, output_folder: pathlib.Path, data: CookieContext
+    base_folder: TemplateSource,
+    output_folder: pathlib.Path,
+    data: CookieContext,
+    *,
+    scan_workers: int | None = None,
+    snapshot: Snapshot | None = None,
 ) -> list[File]:
+    """Obtain the files of a template folder, recursively, with their names rendered.
+
+    Files are read lazily, once committed, unless their content is already known by the
+    snapshot. Files matching ``_copy_without_render`` are copied as is, without ever being read.
+
+    Parameters
+    ----------
+    base_folder : :py:const:`fabricius.sources.TemplateSource`
+        The template's folder. (The ``{{ cookiecutter.xxx }}`` folder)
+    output_folder : :py:class:`pathlib.Path`
+        The folder where the files will be created.
+    data : CookieContext
+        The context to render the names with.
+    scan_workers : int, optional
+        If given, the number of threads used to list directories concurrently.
+    snapshot : :py:class:`fabricius.readers.cookiecutter.snapshot.Snapshot`, optional
+        The snapshot of the template. If given, its renderer, listings, compiled names and file
+        templates are used.
+    """
+    if snapshot is not None:
+        renderer = snapshot.renderer
+        path_renderer = PathRenderer(renderer.environment, data, compiled=snapshot.names)
+        contents, listings = snapshot.contents, snapshot.listings
+    else:
+        renderer = JinjaRenderer
+        path_renderer = PathRenderer(renderer.environment, data)
+        contents, listings = {}, None
+    copy_matcher = CopyMatcher.from_context(
+        data["cookiecutter"].get("_copy_without_render"), path_renderer
+    )
+    destinations: dict[tuple[str, ...], pathlib.Path] = {}
     files: list[File] = []
-    for file_path in base_folder.iterdir():
-        if file_path.is_file():
-            if "{{" in file_path.name and "}}" in file_path.name:
-                file_name = JinjaRenderer(data).render(file_path.name)
-            else:
-                file_name = file_path.name
-            file = File(file_name).from_file(file_path).to_directory(output_folder)
-            if should_copy_not_render(file, data):
-                file.with_renderer(CopyRender)
+
+    entries = walk_template(
+        base_folder,
+        path_renderer,
+        copy_matcher=copy_matcher,
+        workers=scan_workers,
+        listings=listings,
+    )
+    for entry in entries:
+        destination = destinations.get(entry.relative_destination)
+        if destination is None:
+            destination = output_folder.joinpath(*entry.relative_destination)
+            destinations[entry.relative_destination] = destination
+
+        file = File(entry.name)
+        if entry.copy:
+            file.copy_from(entry.source)
+        else:
+            content = contents.get(entry.source)
+            if content is None:
+                file.source = entry.source
             else:
-                file.use_jinja()
-            files.append(file)
+                file.content = content
+            file.with_renderer(renderer)
+        file.destination = destination
+        files.append(file)
+
     return files
 
 
-def should_copy_not_render(file: File, context: CookieContext) -> bool:
-    if not context["cookiecutter"].get("_copy_without_render"):
-        return False
-    to_ignore: list[str] = context["cookiecutter"]["_copy_without_render"]
-    for index, value in enumerate(to_ignore):
-        # Render the string
-        to_ignore[index] = JinjaRenderer(context).render(value)
-    return any(fnmatch(str(file.compute_destination()), value) for value in to_ignore)
+def take_snapshot(
+    base_folder: TemplateSource,
+    fingerprint: str,
+    listings: Listings,
+    cache: SnapshotCache | None = None,
+) -> Snapshot:
+    """Take a snapshot of a template's repository, from its ``cookiecutter.json``, hooks and
+    template folder.
+
+    Raises
+    ------
+    :py:exc:`fabricius.exceptions.TemplateError`
+        If ``cookiecutter.json`` or the template folder are missing.
+    """
+    # Ensure a cookiecutter.json file exists.
+    # Obtains the context's raw content & the template's hooks.
+    cookiecutter_config_path = base_folder.joinpath("cookiecutter.json")
+    if not cookiecutter_config_path.exists():
+        raise TemplateError(base_folder.name, "cookiecutter.json does not exist")
+    context = read_context_raw(cookiecutter_config_path)
+    hooks = get_hooks(base_folder)
+
+    # Obtain the location of the template, if any.
+    template_folder = obtain_template_path(base_folder)
+    if not template_folder:
+        raise TemplateError(base_folder.name, "No template found")
+
+    return Snapshot(
+        base_folder,
+        fingerprint,
+        context=context,
+        hooks=hooks,
+        template_folder=template_folder,
+        extensions=[*EXTENSIONS, *context.get("_extensions", ())],
+        listings=listings,
+        cache=cache,
+    )
 
 
-def read_context_raw(file: pathlib.Path) -> Context:
+def read_context_raw(file: TemplateSource) -> Context:
     if not file.exists():
         raise TemplateError(file.parent.name, f"{file.name} does not exist")
     content = file.read_text()
@@ -105,6 +199,12 @@ def get_questions_only(context: Context) -> QuestionContext:
 
 
 def get_answer(prompts: QuestionContext, *, no_prompt: bool = False) -> dict[str, typing.Any]:
+    if no_prompt:
+        return {question: "" for question in prompts}
+
+    # Rich is only imported once there's something to ask.
+    from rich.prompt import Prompt
+
     answers: dict[str, typing.Any] = {}
 
     for question, default_value in prompts.items():
@@ -113,18 +213,22 @@ def get_answer(prompts: QuestionContext, *, no_prompt: bool = False) -> dict[str
             prompt = partial(Prompt(sentence_case(question), choices=default_value))
         else:
             prompt = partial(Prompt(sentence_case(question)), default=default_value)
-        answer = "" if no_prompt else prompt()
-        answers[question] = answer
+        answers[question] = prompt()
 
     return answers
 
 
 def setup(
-    base_folder: PathStrOrPath,
+    base_folder: "PathStrOrPath | ArchivePath",
     output_folder: PathStrOrPath,
     *,
     extra_context: dict[str, typing.Any] | None = None,
     no_prompt: bool = False,
+    scan_workers: int | None = None,
+    config_file: "PathStrOrPath | None" = None,
+    cache: SnapshotCache | None = "memory",
+    hooks_mode: HookMode = "subprocess",
+    hooks_timeout: HookTimeout = "default",
 ) -> Template[type[JinjaRenderer]]:
     """Setup a template that will be able to be ran once created.
 
@@ -133,13 +237,34 @@ def setup(
     base_folder : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`
         The folder where the template is located. (Choose the folder where the ``cookiecutter.json``
         is located, not the template itself)
+        It can also be a zip or tar archive of that folder, which is read without being
+        extracted. (See :py:func:`fabricius.sources.open_template`)
     output_folder : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`
         The folder where the template/files will be created once rendered.
     extra_context : :py:const:`Data <fabricius.types.Data>`, optional
         Any extra context to pass to the template.
         It will override the user's prompt.
     no_prompt : bool, optional
-        If set to True, no questions will be asked to the user. By default False
+        If set to True, no questions will be asked to the user, and Rich is not imported. The
+        template's defaults are used instead, overridden by the user config's. By default False
+    scan_workers : int, optional
+        If given, the number of threads used to list the template's directories concurrently.
+        Useful on slow filesystems. By default, directories are listed one by one.
+    config_file : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`, optional
+        The user config to use. By default, the ``COOKIECUTTER_CONFIG`` environment variable, or
+        ``~/.cookiecutterrc``. The config is only parsed again once it has been modified.
+    cache : :py:const:`SnapshotCache <fabricius.readers.cookiecutter.snapshot.SnapshotCache>`, optional
+        Where to keep the snapshot of the template, so that calling this function again with an
+        unmodified template only applies the new answers. ``"memory"`` by default, ``"disk"`` to
+        share it with other processes, ``None`` to disable it.
+    hooks_mode : :py:const:`HookMode <fabricius.readers.cookiecutter.hooks.HookMode>`, optional
+        How to run Python hooks. By default, in a subprocess, like CookieCutter. ``"in-process"``
+        and ``"worker"`` avoid starting a new interpreter for each hook.
+    hooks_timeout : float, optional
+        The time, in seconds, each hook is given to run, ``None`` to wait indefinitely. By
+        default (``"default"``) 10 seconds, or no timeout with the ``"in-process"`` mode, which
+        cannot be given one. (See :py:func:`check_hook_options
+        <fabricius.readers.cookiecutter.hooks.check_hook_options>`)
 
     Returns
     -------
@@ -152,85 +277,225 @@ def setup(
     :py:exc:`fabricius.exceptions.TemplateError`
         Exception raised when there's an issue with the template that is most probably due to the
         template's misconception.
+    :py:exc:`ValueError`
+        If a timeout is given for the ``"in-process"`` hooks mode.
     """
+    hooks_timeout = check_hook_options(hooks_mode, hooks_timeout)
     if extra_context is None:
         extra_context = {}
 
     # Obtain the required information first
-    base_folder = pathlib.Path(base_folder).resolve()
+    base_folder = open_template(base_folder)
     output_folder = pathlib.Path(output_folder).resolve()
 
-    # Prepare contexts
-    cookiecutter_config_path = base_folder.joinpath("cookiecutter.json")
-    user_config = get_config()
-
-    # Ensure a cookiecutter.json file exists.
-    # Obtains the context's raw content & the template's hooks.
-    if not cookiecutter_config_path.exists():
+    # Obtain the template's snapshot, which holds everything that does not depend on answers.
+    if not base_folder.is_dir():
         raise TemplateError(base_folder.name, "cookiecutter.json does not exist")
-    context = read_context_raw(cookiecutter_config_path)
-    hooks = get_hooks(base_folder)
+    snapshot = get_snapshot(base_folder, take_snapshot, cache=cache)
+    user_config = get_config(config_file)
 
-    # Obtain the location of the template, if any.
-    template_folder = obtain_template_path(base_folder)
-    if not template_folder:
-        raise TemplateError(base_folder.name, "No template found")
+    # Begin to get user's prompts.
+    questions = get_questions_only(Context(snapshot.context))
+    if no_prompt:
+        # Like CookieCutter's --no-input: the template's defaults, overridden by the user's.
+        answers = {**get_defaults(questions), **user_config["default_context"]}
+    else:
+        answers = {**user_config["default_context"], **get_answer(questions)}
+
+    answers.update(extra_context)
+
+    return build_template(
+        snapshot,
+        output_folder,
+        answers,
+        scan_workers=scan_workers,
+        remember=cache is not None,
+        hooks_mode=hooks_mode,
+        hooks_timeout=hooks_timeout,
+    )
 
-    # Get the template object
-    template = Template(template_folder, JinjaRenderer)
-    for extension in EXTENSIONS:
-        template.renderer.environment.add_extension(extension)
-    if context.get("_extensions"):
-        for extension in context["_extensions"]:
-            template.renderer.environment.add_extension(extension)
 
-    # Add some additional context
-    final_context = wrap_in_cookie(context)
-    final_context["cookiecutter"] |= {
-        "_template": str(template_folder.resolve()),
-        "_repo_dir": str(base_folder.resolve()),
-        "_output_dir": str(output_folder.resolve()),
+def get_defaults(questions: QuestionContext) -> dict[str, typing.Any]:
+    """Obtain the default answer of each question, that is, its value, or its first choice if
+    it is a list of choices.
+    """
+    return {
+        question: (default_value[0] if default_value else "")
+        if isinstance(default_value, list)
+        else default_value
+        for question, default_value in questions.items()
     }
 
-    # Begin to get user's prompts.
-    questions = get_questions_only(context)
-    prompts = get_answer(questions, no_prompt=no_prompt)
 
-    prompts.update(extra_context)
+def build_template(
+    snapshot: Snapshot,
+    output_folder: pathlib.Path,
+    answers: dict[str, typing.Any],
+    *,
+    scan_workers: int | None = None,
+    remember: bool = True,
+    hooks_mode: HookMode = "subprocess",
+    hooks_timeout: HookTimeout = "default",
+) -> Template[type[JinjaRenderer]]:
+    """Build a template, ready to be committed, from a snapshot and the answers to its questions.
 
-    final_context["cookiecutter"].update(user_config["default_context"])
-    final_context["cookiecutter"].update(dict(prompts.items()))
+    Parameters
+    ----------
+    snapshot : :py:class:`fabricius.readers.cookiecutter.snapshot.Snapshot`
+        The snapshot of the template.
+    output_folder : :py:class:`pathlib.Path`
+        The folder where the template/files will be created once rendered.
+    answers : :py:const:`Data <fabricius.types.Data>`
+        The answers, they override the context of ``cookiecutter.json``.
+    scan_workers : int, optional
+        If given, the number of threads used to list directories not known by the snapshot.
+    remember : bool, optional
+        If the file templates should be kept inside the snapshot once read. By default True.
+    hooks_mode : :py:const:`HookMode <fabricius.readers.cookiecutter.hooks.HookMode>`, optional
+        How to run Python hooks.
+    hooks_timeout : float, optional
+        The time, in seconds, each hook is given to run, ``None`` to wait indefinitely. By
+        default (``"default"``) 10 seconds, or no timeout with the ``"in-process"`` mode, which
+        cannot be given one. (See :py:func:`check_hook_options
+        <fabricius.readers.cookiecutter.hooks.check_hook_options>`)
+    """
+    hooks_timeout = check_hook_options(hooks_mode, hooks_timeout)
+    template_folder = snapshot.template_folder
+    hooks = snapshot.hooks
+    output_folder = output_folder.resolve()
 
-    files = obtain_files(template_folder, output_folder, final_context)
+    # Get the template object
+    # Templates read from an archive have no folder on the disk, use the output folder instead.
+    template = Template(
+        template_folder if isinstance(template_folder, pathlib.Path) else output_folder,
+        snapshot.renderer,
+    )
+
+    # Add some additional context
+    # The snapshot's context is shared, only copy what is about to be modified.
+    final_context = wrap_in_cookie(Context(dict(snapshot.context)))
+    final_context["cookiecutter"] |= {
+        "_template": str(
+            template_folder.resolve()
+            if isinstance(template_folder, pathlib.Path)
+            else template_folder
+        ),
+        "_repo_dir": str(snapshot.base_folder),
+        "_output_dir": str(output_folder),
+    }
+    final_context["cookiecutter"].update(answers)
+
+    files = obtain_files(
+        template_folder,
+        output_folder,
+        final_context,
+        scan_workers=scan_workers,
+        snapshot=snapshot,
+    )
     template.add_files(files)
     template.push_data(final_context)
 
+    if remember:
+        remember_contents(template, snapshot)
+
     if hooks:
         if hook_path := hooks["pre_gen_project"]:
-            before_template_commit.connect(adapt(hook_path, "pre"))  # type: ignore
+            template.signals.before_template_commit.connect(
+                adapt(
+                    hook_path,
+                    "pre",
+                    renderer=snapshot.renderer,
+                    mode=hooks_mode,
+                    timeout=hooks_timeout,
+                )
+            )
         if hook_path := hooks["post_gen_project"]:
-            after_template_commit.connect(adapt(hook_path, "post"))  # type: ignore
+            template.signals.after_template_commit.connect(
+                adapt(
+                    hook_path,
+                    "post",
+                    renderer=snapshot.renderer,
+                    mode=hooks_mode,
+                    timeout=hooks_timeout,
+                )
+            )
 
     return template
 
 
-def run(template: Template[type[JinjaRenderer]]) -> list[FileCommitResult]:
+def remember_contents(template: Template[typing.Any], snapshot: Snapshot) -> None:
+    """Keep the file templates read while committing the template inside the snapshot, so that
+    they're not read again by the next :py:func:`setup` call.
+    """
+    sources = {
+        id(file): file.source
+        for file in template.files
+        if file.source is not None and not file.verbatim
+    }
+    if not sources:
+        return
+
+    def remember(file: File, result: FileCommitResult) -> None:
+        if source := sources.get(id(file)):
+            snapshot.remember(source, result["template_content"])
+
+    template.signals.after_file_commit.connect(remember)
+    template.signals.after_template_commit.connect(lambda *_: snapshot.flush())
+
+
+def run(
+    template: Template[type[JinjaRenderer]],
+    *,
+    profile: "PathStrOrPath | None" = None,
+    no_prompt: bool = False,
+    progress: bool = True,
+) -> list[FileCommitResult]:
     """Run the CookieCutter template generated using :py:func:`.setup`
 
+    With ``no_prompt=True`` and ``progress=False``, the run is headless: Rich is never imported,
+    nothing is asked and the progress is reported through :py:mod:`logging`. (See
+    :py:class:`fabricius.app.headless.LogProgress`)
+
     Parameters
     ----------
     template : Type of :py:class:`fabricius.models.template.Template`
         The template to render.
+    profile : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`, optional
+        Where to write a profile of the run, including hooks. A Chrome trace if it ends with
+        ``.json``, :py:mod:`cProfile` statistics otherwise. Default to the ``FABRICIUS_PROFILE``
+        environment variable, if set.
+    no_prompt : bool, optional
+        If set to True, the user is not asked to overwrite existing files, the
+        :py:exc:`FileExistsError` is raised instead. By default False
+    progress : bool, optional
+        If a progress bar is shown. If False, the progress is logged instead. By default True
     """
+    with profiling.profile(profile):
+        return _run(template, no_prompt=no_prompt, progress=progress)
+
 
+def _run(
+    template: Template[type[JinjaRenderer]], *, no_prompt: bool, progress: bool
+) -> list[FileCommitResult]:
     def attempt(force: bool) -> list[FileCommitResult]:
-        progress = TemplateProgressBar(len(template.files))
-        with progress.begin(fetch_me_a_beer()):
+        if progress:
+            from fabricius.app.ui import TemplateProgressBar
+
+            reporter: "TemplateProgressBar | LogProgress" = TemplateProgressBar(
+                len(template.files)
+            )
+        else:
+            reporter = LogProgress(len(template.files))
+        with reporter.begin(fetch_me_a_beer()):
             return template.commit(overwrite=force)
 
     try:
         return attempt(False)
     except FileExistsError as exception:
+        if no_prompt:
+            raise
+        from rich.prompt import Confirm
+
         answer = Confirm.ask(
             f"File [cyan]{exception.filename}[/] already exists, this probably means that this template has already been created. Overwrite?"
         )
@@ -239,7 +504,12 @@ def run(template: Template[type[JinjaRenderer]]) -> list[FileCommitResult]:
     except FailedHookError as exception:
         if exception.exit_code:
             sys.exit(exception.exit_code)
+        elif not progress:
+            _log.error("%s", exception)
+            sys.exit(1)
         else:
+            from rich import get_console
+
             get_console().print(exception)
             sys.exit(1)
     return []
@@ -0,0 +1,424 @@
+import hashlib
+import json
+import os
+import pathlib
+import threading
+import typing
+
+import platformdirs
+from jinja2 import BaseLoader, Environment, FileSystemBytecodeCache, FileSystemLoader
+from jinja2 import Template as JinjaTemplate
+from jinja2 import TemplateNotFound
+
+from fabricius.readers.cookiecutter.hooks import AvailableHooks
+from fabricius.renderers.jinja_renderer import DependencyLoader, JinjaRenderer
+from fabricius.sources.archive import ArchivePath, TemplateSource
+
+SnapshotCache = typing.Literal["memory", "disk"]
+"""
+Where snapshots are kept: ``"memory"`` keeps them for the lifetime of the process, ``"disk"``
+also stores them (And Jinja's bytecode) inside the user's cache directory, so that other
+processes can reuse them.
+"""
+
+Listings = dict[TemplateSource, list[tuple[str, bool]]]
+
+_FORMAT = 1
+_IGNORED = {".git", ".hg", ".svn", "__pycache__"}
+
+_snapshots: dict[TemplateSource, "Snapshot"] = {}
+_lock = threading.Lock()
+
+
+def get_cache_directory() -> pathlib.Path:
+    """
+    The directory where snapshots are stored when using the ``"disk"`` cache.
+    """
+    return pathlib.Path(platformdirs.user_cache_dir("fabricius")).joinpath("snapshots")
+
+
+def fingerprint_tree(base_folder: TemplateSource) -> tuple[str, Listings]:
+    """
+    Compute a fingerprint of a template's repository, from the paths, modification times and
+    sizes of all of its files & directories. No file is read.
+
+    Version control directories, and symlinks to directories, are ignored. Repositories inside
+    an archive are fingerprinted from the archive's modification time and size, and listed from
+    its index.
+
+    Returns
+    -------
+    :py:class:`tuple` :
+        The fingerprint, and the content of each directory, as ``(name, is_directory)`` pairs.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    listings: Listings = {}
+
+    if isinstance(base_folder, ArchivePath):
+        digest.update(f"{base_folder.fingerprint}\0{base_folder.at}".encode())
+        pending_members = [base_folder]
+        while pending_members:
+            member = pending_members.pop()
+            listing = [
+                (name, is_directory)
+                for name, is_directory in sorted(member.archive.directories[member.at])
+                if not (is_directory and name in _IGNORED)
+            ]
+            listings[member] = listing
+            pending_members.extend(member / name for name, is_directory in listing if is_directory)
+        return digest.hexdigest(), listings
+
+    pending = [base_folder]
+    while pending:
+        directory = pending.pop()
+        listing: list[tuple[str, bool]] = []
+        with os.scandir(directory) as entries:
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                # Symlinks to directories are not followed, nor listed, like the walker does.
+                # (See fabricius.readers.cookiecutter.walker.walk_template)
+                is_directory = entry.is_dir(follow_symlinks=False)
+                if is_directory and entry.name in _IGNORED:
+                    continue
+                if not is_directory and not entry.is_file():
+                    continue
+                stat = entry.stat()
+                digest.update(
+                    f"{entry.path}\0{is_directory}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode(
+                        "utf-8", "surrogateescape"
+                    )
+                )
+                listing.append((entry.name, is_directory))
+                if is_directory:
+                    pending.append(pathlib.Path(entry.path))
+        listings[directory] = listing
+
+    return digest.hexdigest(), listings
+
+
+class Snapshot:
+    """
+    Everything about a CookieCutter template that does not depend on the user's answers: its
+    parsed context, hooks, files, file templates and compiled templates.
+
+    A snapshot is valid as long as its :py:attr:`fingerprint` matches the template's repository.
+    (See :py:func:`fingerprint_tree`)
+    """
+
+    base_folder: TemplateSource
+    """
+    The template's repository. (Where ``cookiecutter.json`` is located)
+    """
+
+    fingerprint: str
+    """
+    The fingerprint of the template's repository when the snapshot was taken.
+    """
+
+    context: dict[str, typing.Any]
+    """
+    The parsed content of ``cookiecutter.json``. Must not be modified.
+    """
+
+    hooks: AvailableHooks | None
+    """
+    The hooks of the template.
+    """
+
+    template_folder: TemplateSource
+    """
+    The template itself. (The ``{{ cookiecutter.xxx }}`` folder)
+    """
+
+    extensions: list[str]
+    """
+    The Jinja extensions used by the template.
+    """
+
+    listings: Listings
+    """
+    The content of each directory of the repository, as ``(name, is_directory)`` pairs.
+    """
+
+    contents: dict[TemplateSource, str]
+    """
+    The content of the file templates, by their path, filled as they are read.
+    """
+
+    names: dict[str, JinjaTemplate]
+    """
+    The compiled file & directory names.
+    """
+
+    environment: Environment
+    """
+    The Jinja environment of the template, it caches the templates it compiles.
+    """
+
+    renderer: type[JinjaRenderer]
+    """
+    A renderer bound to :py:attr:`environment`, that keeps all the templates it compiles.
+    """
+
+    cache: SnapshotCache | None
+    """
+    Where the snapshot is kept, if anywhere.
+    """
+
+    _modified: bool
+    """
+    If file templates were remembered since the snapshot was last saved.
+    """
+
+    def __init__(
+        self,
+        base_folder: TemplateSource,
+        fingerprint: str,
+        *,
+        context: dict[str, typing.Any],
+        hooks: AvailableHooks | None,
+        template_folder: TemplateSource,
+        extensions: list[str],
+        listings: Listings,
+        contents: dict[TemplateSource, str] | None = None,
+        cache: SnapshotCache | None = None,
+    ) -> None:
+        self.base_folder = base_folder
+        self.fingerprint = fingerprint
+        self.context = context
+        self.hooks = hooks
+        self.template_folder = template_folder
+        self.extensions = extensions
+        self.listings = listings
+        self.contents = contents if contents is not None else {}
+        self.names = {}
+        self.cache = cache
+        self._modified = False
+
+        loader: BaseLoader
+        if isinstance(template_folder, ArchivePath):
+            loader = ArchiveLoader([template_folder, base_folder.joinpath("templates")])
+        else:
+            loader = FileSystemLoader([template_folder, base_folder.joinpath("templates")])
+        self.environment = Environment(
+            loader=DependencyLoader(loader),
+            extensions=extensions,
+            bytecode_cache=(
+                FileSystemBytecodeCache(str(_ensure_directory(get_cache_directory() / "bytecode")))
+                if cache == "disk"
+                else None
+            ),
+        )
+        self.renderer = type(  # type: ignore
+            "CookieCutterRenderer",
+            (JinjaRenderer,),
+            {"environment": self.environment, "compiled": {}},
+        )
+
+    def remember(self, source: TemplateSource, content: str) -> None:
+        """
+        Keep the content of a file template, so that it is not read again.
+        """
+        if source not in self.contents:
+            self.contents[source] = content
+            self._modified = True
+
+    def warm(self) -> None:
+        """
+        Read and compile all the file templates ahead of time, so that rendering the template
+        does not read nor compile anything.
+
+        Files that are not text, or not valid templates, are skipped. (They are most probably
+        copied without being rendered)
+        """
+        compiled = self.renderer.compiled
+        assert compiled is not None
+        pending = [self.template_folder]
+        while pending:
+            directory = pending.pop()
+            for name, is_directory in self.listings.get(directory, ()):
+                path = directory / name
+                if is_directory:
+                    pending.append(path)
+                    continue
+                try:
+                    content = self.contents.get(path)
+                    if content is None:
+                        content = path.read_text()
+                        self.remember(path, content)
+                    if content not in compiled:
+                        compiled[content] = self.environment.from_string(content)
+                except Exception:
+                    continue
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Save the snapshot if file templates were remembered since it was last saved.
+        """
+        if self._modified:
+            self.save()
+
+    def save(self) -> None:
+        """
+        Store the snapshot inside the cache directory, if it uses the ``"disk"`` cache.
+
+        Snapshots of archives are only kept in memory, as reading the archive's index is all
+        it takes to list it again.
+        """
+        self._modified = False
+        if self.cache != "disk" or not isinstance(self.base_folder, pathlib.Path):
+            return
+        path = _snapshot_path(self.base_folder)
+        _ensure_directory(path.parent)
+        data = {
+            "format": _FORMAT,
+            "fingerprint": self.fingerprint,
+            "context": self.context,
+            "hooks": (
+                {name: str(hook) if hook else None for name, hook in self.hooks.items()}
+                if self.hooks is not None
+                else None
+            ),
+            "template_folder": str(self.template_folder),
+            "extensions": self.extensions,
+            "contents": {str(path): content for path, content in self.contents.items()},
+        }
+        temporary = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        temporary.write_text(json.dumps(data))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(
+        cls, base_folder: pathlib.Path, fingerprint: str, listings: Listings
+    ) -> "Snapshot | None":
+        """
+        Load a snapshot stored inside the cache directory, if there's one matching the
+        fingerprint.
+        """
+        try:
+            data = json.loads(_snapshot_path(base_folder).read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get("format") != _FORMAT or data.get("fingerprint") != fingerprint:
+            return None
+
+        hooks = data["hooks"]
+        return cls(
+            base_folder,
+            fingerprint,
+            context=data["context"],
+            hooks=(
+                typing.cast(
+                    AvailableHooks,
+                    {name: pathlib.Path(hook) if hook else None for name, hook in hooks.items()},
+                )
+                if hooks is not None
+                else None
+            ),
+            template_folder=pathlib.Path(data["template_folder"]),
+            extensions=data["extensions"],
+            listings=listings,
+            contents={pathlib.Path(path): content for path, content in data["contents"].items()},
+            cache="disk",
+        )
+
+
+class ArchiveLoader(BaseLoader):
+    """
+    A Jinja loader that reads the templates from directories inside an archive. (Like
+    :py:class:`jinja2.FileSystemLoader`, but for :py:class:`fabricius.sources.ArchivePath`)
+    """
+
+    searchpath: list[ArchivePath]
+    """
+    The directories the templates are looked for in, in order.
+    """
+
+    def __init__(self, searchpath: list[ArchivePath]) -> None:
+        self.searchpath = searchpath
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> tuple[str, str | None, typing.Callable[[], bool] | None]:
+        for directory in self.searchpath:
+            path = directory.joinpath(*template.split("/"))
+            if path.is_file():
+                # Archives are not modified while they're opened.
+                return path.read_text(), str(path), lambda: True
+        raise TemplateNotFound(template)
+
+    def list_templates(self) -> list[str]:
+        found: set[str] = set()
+        for directory in self.searchpath:
+            pending = [(directory, "")]
+            while pending:
+                folder, prefix = pending.pop()
+                for child in folder.iterdir():
+                    if child.is_dir():
+                        pending.append((child, f"{prefix}{child.name}/"))
+                    else:
+                        found.add(f"{prefix}{child.name}")
+        return sorted(found)
+
+
+def _snapshot_path(base_folder: pathlib.Path) -> pathlib.Path:
+    name = hashlib.sha256(str(base_folder).encode("utf-8", "surrogateescape")).hexdigest()
+    return get_cache_directory().joinpath(f"{name[:32]}.json")
+
+
+def _ensure_directory(path: pathlib.Path) -> pathlib.Path:
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def get_snapshot(
+    base_folder: TemplateSource,
+    take: typing.Callable[[TemplateSource, str, Listings, SnapshotCache | None], Snapshot],
+    *,
+    cache: SnapshotCache | None = "memory",
+) -> Snapshot:
+    """
+    Obtain the snapshot of a template's repository, taking a new one only if the repository was
+    modified since the last one was taken.
+
+    Parameters
+    ----------
+    base_folder : :py:const:`fabricius.sources.TemplateSource`
+        The template's repository.
+    take : Callable
+        Takes a new snapshot, given the repository, its fingerprint and listings, and the cache
+        to use.
+    cache : :py:const:`SnapshotCache`, optional
+        Where to look for, and keep, the snapshot. If ``None``, a new snapshot is always taken.
+    """
+    fingerprint, listings = fingerprint_tree(base_folder)
+    if cache is None:
+        return take(base_folder, fingerprint, listings, None)
+
+    snapshot = _snapshots.get(base_folder)
+    if snapshot is not None and snapshot.fingerprint == fingerprint:
+        if cache == "disk" and snapshot.cache != "disk":
+            snapshot.cache = "disk"
+            snapshot.save()
+        return snapshot
+
+    snapshot = (
+        Snapshot.load(base_folder, fingerprint, listings)
+        if cache == "disk" and isinstance(base_folder, pathlib.Path)
+        else None
+    )
+    if snapshot is None:
+        snapshot = take(base_folder, fingerprint, listings, cache)
+        snapshot.save()
+
+    with _lock:
+        _snapshots[base_folder] = snapshot
+    return snapshot
+
+
+def clear_snapshots() -> None:
+    """
+    Forget all the snapshots kept in memory.
+    """
+    with _lock:
+        _snapshots.clear()
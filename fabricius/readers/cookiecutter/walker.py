@@ -0,0 +1,250 @@
+import concurrent.futures
+import fnmatch
+import os
+import pathlib
+import re
+import typing
+
+from jinja2 import Environment
+from jinja2 import Template as JinjaTemplate
+from jinja2 import meta
+
+from fabricius.renderers.utils import contains_lazy, resolve_data
+from fabricius.types import Data
+
+
+class Entry(typing.NamedTuple):
+    """
+    A file found inside of a template.
+    """
+
+    source: pathlib.Path
+    """
+    The path of the file template.
+    """
+
+    relative_source: str
+    """
+    The path of the file template, relative to the template's folder, using ``/`` as separator.
+    """
+
+    name: str
+    """
+    The rendered name of the file.
+    """
+
+    relative_destination: tuple[str, ...]
+    """
+    The rendered names of the directories the file is in, relative to the output folder.
+    """
+
+    copy: bool
+    """
+    If the file must be copied as is, without being rendered.
+    (Matched by ``_copy_without_render``)
+    """
+
+
+class PathRenderer:
+    """
+    Renders the names of the files & directories of a template.
+
+    Each distinct name is only compiled once, and names that are not templated are returned
+    as is.
+    """
+
+    environment: Environment
+    """
+    The environment used to compile the names.
+    """
+
+    data: Data
+    """
+    The data to render the names with.
+    """
+
+    _compiled: dict[str, JinjaTemplate]
+    _variables: dict[str, frozenset[str]] | None
+    """
+    The variables each name uses, only if :py:attr:`data` holds lazy values.
+    """
+
+    def __init__(
+        self,
+        environment: Environment,
+        data: Data,
+        *,
+        compiled: dict[str, JinjaTemplate] | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        environment : :py:class:`jinja2.Environment`
+            The environment used to compile the names.
+        data : :py:const:`fabricius.types.Data`
+            The data to render the names with.
+        compiled : :py:class:`dict`, optional
+            Already compiled names, compiled with the same environment. Newly compiled names are
+            added to it, so that it can be shared between renderers.
+        """
+        self.environment = environment
+        self.data = data
+        self._compiled = compiled if compiled is not None else {}
+        self._variables = {} if contains_lazy(data) else None
+
+    def render(self, name: str) -> str:
+        """
+        Render a single file or directory name.
+        """
+        if "{{" not in name and "{%" not in name:
+            return name
+        compiled = self._compiled.get(name)
+        if compiled is None:
+            compiled = self._compiled[name] = self.environment.from_string(name)
+        if self._variables is None:
+            return compiled.render(self.data)
+
+        variables = self._variables.get(name)
+        if variables is None:
+            variables = self._variables[name] = frozenset(
+                meta.find_undeclared_variables(self.environment.parse(name))
+            )
+        return compiled.render(resolve_data(self.data, variables))
+
+
+class CopyMatcher:
+    """
+    Matches the paths of the files that must be copied without being rendered, as defined by the
+    ``_copy_without_render`` key of ``cookiecutter.json``.
+
+    All the patterns are compiled into a single regular expression. Like CookieCutter, paths are
+    relative to the template's repository (So they start with the ``{{ cookiecutter.xxx }}``
+    folder) and matched with :py:func:`fnmatch.fnmatch`'s rules. Both the raw and rendered
+    versions of the patterns and paths are matched.
+    """
+
+    pattern: re.Pattern[str]
+    """
+    The compiled patterns.
+    """
+
+    def __init__(self, patterns: typing.Iterable[str]) -> None:
+        """
+        Parameters
+        ----------
+        patterns : Iterable of :py:class:`str`
+            The patterns, as given inside ``_copy_without_render``.
+        """
+        translated = dict.fromkeys(fnmatch.translate(pattern) for pattern in patterns)
+        self.pattern = re.compile("|".join(translated) or "(?!)")
+
+    @classmethod
+    def from_context(
+        cls, patterns: typing.Iterable[str] | None, renderer: "PathRenderer"
+    ) -> "CopyMatcher | None":
+        """
+        Create a matcher from the ``_copy_without_render`` patterns, rendering them once.
+
+        Returns ``None`` if there are no patterns.
+        """
+        if not patterns:
+            return None
+        patterns = list(patterns)
+        return cls([*patterns, *(renderer.render(pattern) for pattern in patterns)])
+
+    def match(self, *paths: str) -> bool:
+        """
+        Indicate if one of the given paths must be copied without being rendered.
+        """
+        match = self.pattern.match
+        return any(match(path) for path in paths)
+
+
+def _list_directory(path: pathlib.Path) -> list[tuple[str, bool]]:
+    listing: list[tuple[str, bool]] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            # Like CookieCutter's os.walk, symlinks to directories are not followed, so that a
+            # symlink loop cannot make the walk endless. They would only be empty directories.
+            if entry.is_dir(follow_symlinks=False):
+                listing.append((entry.name, True))
+            elif entry.is_file():
+                listing.append((entry.name, False))
+    return listing
+
+
+def walk_template(
+    folder: pathlib.Path,
+    renderer: PathRenderer,
+    *,
+    copy_matcher: CopyMatcher | None = None,
+    workers: int | None = None,
+    listings: typing.Mapping[pathlib.Path, list[tuple[str, bool]]] | None = None,
+) -> typing.Iterator[Entry]:
+    """
+    Walk through all the files of a template folder, recursively, and render their names.
+
+    Like CookieCutter, files & directories whose name renders to an empty string are skipped,
+    with all of their content. Symlinks to directories are not followed, nor generated.
+
+    Parameters
+    ----------
+    folder : :py:class:`pathlib.Path`
+        The template's folder.
+    renderer : :py:class:`PathRenderer`
+        The renderer of the names.
+    copy_matcher : :py:class:`CopyMatcher`, optional
+        The matcher of the files to copy without rendering them. When a directory matches, all
+        of its content is copied.
+    workers : :py:class:`int`, optional
+        If given, the number of threads used to list directories concurrently, which is useful
+        on slow (For example, network) filesystems.
+    listings : Mapping, optional
+        The already known content of the directories, as ``(name, is_directory)`` pairs. If
+        given, directories are not listed again.
+    """
+    # (Source directory, relative source, relative destination, copy)
+    Level = list[tuple[pathlib.Path, str, tuple[str, ...], bool]]
+    level: Level = [(folder, "", (), False)]
+    executor = (
+        concurrent.futures.ThreadPoolExecutor(workers) if workers and listings is None else None
+    )
+    root, rendered_root = folder.name, renderer.render(folder.name)
+
+    def must_copy(relative: str, destination: tuple[str, ...], name: str) -> bool:
+        if copy_matcher is None:
+            return False
+        return copy_matcher.match(
+            f"{root}/{relative}", "/".join((rendered_root, *destination, name))
+        )
+
+    try:
+        while level:
+            directories = [directory for directory, *_ in level]
+            if listings is not None:
+                level_listings: typing.Iterable[list[tuple[str, bool]]] = map(
+                    listings.__getitem__, directories
+                )
+            elif executor:
+                level_listings = executor.map(_list_directory, directories)
+            else:
+                level_listings = map(_list_directory, directories)
+
+            next_level: Level = []
+            for (directory, relative, destination, copy), listing in zip(level, level_listings):
+                for name, is_directory in sorted(listing):
+                    rendered = renderer.render(name)
+                    if not rendered.strip():
+                        continue
+                    path = f"{relative}{name}"
+                    copied = copy or must_copy(path, destination, rendered)
+                    if is_directory:
+                        next_level.append(
+                            (directory / name, f"{path}/", (*destination, rendered), copied)
+                        )
+                    else:
+                        yield Entry(directory / name, path, rendered, destination, copied)
+            level = next_level
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,103 @@
+import pathlib
+import threading
+import typing
+
+from fabricius.app.watch import DEFAULT_DEBOUNCE
+from fabricius.app.watch import watch as watch_template
+from fabricius.exceptions import TemplateError
+from fabricius.models.template import Template
+from fabricius.readers.cookiecutter.config import get_config
+from fabricius.readers.cookiecutter.hooks import (
+    HookMode,
+    HookTimeout,
+    check_hook_options,
+)
+from fabricius.readers.cookiecutter.setup import (
+    Context,
+    build_template,
+    get_defaults,
+    get_questions_only,
+    take_snapshot,
+)
+from fabricius.readers.cookiecutter.snapshot import get_snapshot
+from fabricius.renderers.jinja_renderer import JinjaRenderer
+from fabricius.sources.archive import open_template
+from fabricius.types import FileCommitResult, PathStrOrPath
+
+
+def watch(
+    base_folder: PathStrOrPath,
+    output_folder: PathStrOrPath,
+    *,
+    extra_context: dict[str, typing.Any] | None = None,
+    config_file: "PathStrOrPath | None" = None,
+    debounce: float = DEFAULT_DEBOUNCE,
+    polling: bool = False,
+    hooks_mode: HookMode = "subprocess",
+    hooks_timeout: HookTimeout = "default",
+    stop: threading.Event | None = None,
+    callback: typing.Callable[[list[FileCommitResult], float], typing.Any] | None = None,
+) -> None:
+    """Generate a project from a CookieCutter template, then watch the template and regenerate
+    the files affected by each change, until ``stop`` is set (Or the process is interrupted).
+
+    Nothing is asked: the answers are the defaults of ``cookiecutter.json``, the user config's,
+    then ``extra_context``. Hooks are only ran by the first generation. Only the files whose
+    template, partials (Inside ``templates/``) or context changed are rendered again, see
+    :py:class:`fabricius.app.watch.IncrementalCommit`.
+
+    Parameters
+    ----------
+    base_folder : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`
+        The folder where the ``cookiecutter.json`` is located. Archives cannot be watched.
+    output_folder : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`
+        The folder where the files are generated.
+    extra_context : :py:const:`Data <fabricius.types.Data>`, optional
+        Answers that override the defaults.
+    config_file : :py:const:`PathStrOrPath <fabricius.types.PathStrOrPath>`, optional
+        The user config to use.
+    debounce : float, optional
+        The time, in seconds, without changes after which the files are regenerated.
+    polling : bool, optional
+        If the template is listed periodically instead of using inotify.
+    hooks_mode : :py:const:`HookMode <fabricius.readers.cookiecutter.hooks.HookMode>`, optional
+        How to run Python hooks.
+    hooks_timeout : float, optional
+        The time, in seconds, each hook is given to run, ``None`` to wait indefinitely. By
+        default (``"default"``) 10 seconds, or no timeout with the ``"in-process"`` mode, which
+        cannot be given one. (See :py:func:`check_hook_options
+        <fabricius.readers.cookiecutter.hooks.check_hook_options>`)
+    stop : :py:class:`threading.Event`, optional
+        Once set, watching stops.
+    callback : Callable, optional
+        Called after each generation with the results of the committed files, and the time it
+        took, in seconds.
+
+    Raises
+    ------
+    :py:exc:`fabricius.exceptions.TemplateError`
+        If the template is an archive.
+    :py:exc:`ValueError`
+        If a timeout is given for the ``"in-process"`` hooks mode.
+    """
+    hooks_timeout = check_hook_options(hooks_mode, hooks_timeout)
+    base = open_template(base_folder)
+    if not isinstance(base, pathlib.Path):
+        raise TemplateError(base.name, "Archives cannot be watched")
+    output = pathlib.Path(output_folder).resolve()
+    answers = {**get_config(config_file)["default_context"], **(extra_context or {})}
+
+    def build() -> Template[type[JinjaRenderer]]:
+        # The snapshot is taken again once the template is modified, so that new questions and
+        # new defaults of cookiecutter.json are used.
+        snapshot = get_snapshot(base, take_snapshot, cache="memory")
+        return build_template(
+            snapshot,
+            output,
+            {**get_defaults(get_questions_only(Context(snapshot.context))), **answers},
+            remember=False,
+            hooks_mode=hooks_mode,
+            hooks_timeout=hooks_timeout,
+        )
+
+    watch_template(build, [base], debounce=debounce, polling=polling, stop=stop, callback=callback)
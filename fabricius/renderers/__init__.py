@@ -1,4 +1,38 @@
-from .jinja_renderer import JinjaRenderer as JinjaRenderer
-from .mustache import ChevronRenderer as ChevronRenderer
-from .python_format import PythonFormatRenderer as PythonFormatRenderer
-from .python_string_template import StringTemplateRenderer as StringTemplateRenderer
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from .jinja_renderer import JinjaRenderer as JinjaRenderer
+    from .mustache import ChevronRenderer as ChevronRenderer
+    from .python_format import PythonFormatRenderer as PythonFormatRenderer
+    from .python_string_template import StringTemplateRenderer as StringTemplateRenderer
+    from .registry import get_renderer as get_renderer
+    from .registry import get_renderer_for as get_renderer_for
+    from .registry import register_renderer as register_renderer
+
+_RENDERERS = {
+    "ChevronRenderer": ".mustache",
+    "JinjaRenderer": ".jinja_renderer",
+    "PythonFormatRenderer": ".python_format",
+    "StringTemplateRenderer": ".python_string_template",
+    "get_renderer": ".registry",
+    "get_renderer_for": ".registry",
+    "register_renderer": ".registry",
+}
+
+__all__ = list(_RENDERERS)
+
+
+def __getattr__(name: str) -> typing.Any:
+    # Renderers are imported once used, so that their template engines (Jinja, Chevron) are not
+    # imported unless needed. (See the "registry" module for renderers selected by name)
+    if name not in _RENDERERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    renderer = getattr(importlib.import_module(_RENDERERS[name], __name__), name)
+    globals()[name] = renderer
+    return renderer
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -1,12 +1,212 @@
-from jinja2 import BaseLoader, Environment
+import contextvars
+import functools
+import typing
+import weakref
+
+from jinja2 import BaseLoader, Environment, Template, TemplateNotFound, meta
 
 from fabricius.models.renderer import Renderer
 
+from .utils import contains_lazy, resolve_data
+
+_loaded_templates: contextvars.ContextVar[set[str] | None] = contextvars.ContextVar(
+    "_loaded_templates", default=None
+)
+
+_References = frozenset[str | None]
+_Analysis = tuple[_References, frozenset[str]]
+"""
+The templates a template references, and the variables it uses from its context.
+"""
+_CachedAnalyses = dict[str, tuple[_Analysis, typing.Callable[[], bool] | None]]
+
+_partials_analyses: "weakref.WeakKeyDictionary[Environment, _CachedAnalyses]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _record(name: str) -> None:
+    loaded = _loaded_templates.get()
+    if loaded is not None:
+        loaded.add(name)
+
+
+def _analyze(environment: Environment, source: str) -> _Analysis:
+    ast = environment.parse(source)
+    return (
+        frozenset(meta.find_referenced_templates(ast)),
+        frozenset(meta.find_undeclared_variables(ast)),
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _content_analysis(environment: Environment, content: str) -> _Analysis:
+    return _analyze(environment, content)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(environment: Environment, extensions: tuple[str, ...], content: str) -> Template:
+    # The extensions are part of the key as they change how templates are compiled.
+    return environment.from_string(content)
+
+
+def _partial_analysis(environment: Environment, name: str) -> _Analysis:
+    cache = _partials_analyses.setdefault(environment, {})
+    if name in cache:
+        analysis, uptodate = cache[name]
+        if uptodate is not None and uptodate():
+            return analysis
+
+    assert environment.loader is not None
+    source, _, uptodate = environment.loader.get_source(environment, name)
+    analysis = _analyze(environment, source)
+    cache[name] = (analysis, uptodate)
+    return analysis
+
+
+def clear_caches() -> None:
+    """
+    Forget all the templates compiled and analyzed by :py:class:`JinjaRenderer`, so that they
+    are compiled again.
+    """
+    _compile.cache_clear()
+    _content_analysis.cache_clear()
+    _partials_analyses.clear()
+
+
+class DependencyLoader(BaseLoader):
+    """
+    A loader that wraps another Jinja loader and records every template it is asked for while a
+    :py:class:`JinjaRenderer` is rendering.
+
+    Jinja caches the templates it loads, but still asks the loader if a cached template is up to
+    date (Unless ``auto_reload`` is disabled), this loader records those checks too, so that
+    templates are tracked whether they were cached or not.
+    """
+
+    loader: BaseLoader
+    """
+    The wrapped loader, the one that actually gets the templates.
+    """
+
+    def __init__(self, loader: BaseLoader) -> None:
+        self.loader = loader
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> tuple[str, str | None, typing.Callable[[], bool] | None]:
+        _record(template)
+        source, filename, uptodate = self.loader.get_source(environment, template)
+        if uptodate is None:
+            return source, filename, uptodate
+
+        def tracked_uptodate() -> bool:
+            _record(template)
+            return uptodate()
+
+        return source, filename, tracked_uptodate
+
+    def list_templates(self) -> list[str]:
+        return self.loader.list_templates()
+
 
 class JinjaRenderer(Renderer):
     name = "Jinja Template"
 
-    environment: Environment = Environment(loader=BaseLoader())
+    environment: Environment = Environment(loader=DependencyLoader(BaseLoader()))
+    """
+    The environment used to render the templates.
+
+    To allow ``{% include %}``, ``{% extends %}`` or ``{% import %}``, set a loader on the
+    environment. It will be wrapped inside a :py:class:`DependencyLoader` upon rendering, so that
+    the templates used by a file are recorded inside :py:attr:`.dependencies`.
+    """
+
+    compiled: typing.ClassVar[dict[str, Template] | None] = None
+    """
+    The templates compiled by this renderer, by their content. If ``None``, compiled templates
+    are kept inside a cache shared by all renderers, that only holds the most recent ones.
+
+    Subclasses with their own :py:attr:`.environment` can set it to an empty dictionary to keep
+    all of their templates compiled.
+    """
 
     def render(self, content: str) -> str:
-        return self.environment.from_string(content).render(**self.data)
+        environment = self.environment
+        if environment.loader is not None and not isinstance(environment.loader, DependencyLoader):
+            environment.loader = DependencyLoader(environment.loader)
+
+        loaded: set[str] = set()
+        token = _loaded_templates.set(loaded)
+        try:
+            compiled = self.compiled
+            if compiled is None:
+                template = _compile(environment, tuple(environment.extensions), content)
+            elif (template := compiled.get(content)) is None:
+                template = compiled[content] = environment.from_string(content)
+            data = self.data
+            if contains_lazy(data):
+                data = resolve_data(data, self._find_variables(content))
+            result = template.render(**data)
+        finally:
+            _loaded_templates.reset(token)
+
+        self.dependencies = frozenset(loaded | self._find_static_dependencies(content))
+        return result
+
+    def _find_static_dependencies(self, content: str) -> set[str]:
+        """
+        Collect the templates referenced by name inside ``content`` and, recursively, inside the
+        templates it references.
+
+        This catches the templates that were not loaded during the render (For example, an
+        ``{% include %}`` inside of a branch that was not taken) so that they can still invalidate
+        the file.
+        """
+        environment = self.environment
+        found: set[str] = set()
+        pending = list(_content_analysis(environment, content)[0])
+
+        while pending:
+            name = pending.pop()
+            if name is None or name in found:
+                continue
+            found.add(name)
+            if environment.loader is None:
+                continue
+            try:
+                pending.extend(_partial_analysis(environment, name)[0])
+            except TemplateNotFound:
+                continue
+
+        return found
+
+    def _find_variables(self, content: str) -> set[str] | None:
+        """
+        Collect the variables ``content`` uses from its context, and the ones the templates it
+        references use, so that only their lazy values are resolved.
+
+        Returns ``None`` if a template is referenced by a name only known while rendering (For
+        example, ``{% include name %}``), in which case all the variables may be used.
+        """
+        environment = self.environment
+        references, variables = _content_analysis(environment, content)
+        found = set(variables)
+        seen: set[str] = set()
+        pending = list(references)
+
+        while pending:
+            name = pending.pop()
+            if name is None:
+                return None
+            if name in seen or environment.loader is None:
+                continue
+            seen.add(name)
+            try:
+                references, variables = _partial_analysis(environment, name)
+            except TemplateNotFound:
+                continue
+            found |= variables
+            pending.extend(references)
+
+        return found
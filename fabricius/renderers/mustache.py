@@ -2,9 +2,11 @@ import chevron
 
 from fabricius.models.renderer import Renderer
 
+from .utils import lazy_mapping
+
 
 class ChevronRenderer(Renderer):
     name = "Chevron (Moustache)"
 
     def render(self, content: str) -> str:
-        return chevron.render(content, self.data)
+        return chevron.render(content, lazy_mapping(self.data))
@@ -1,10 +1,10 @@
 from fabricius.models.renderer import Renderer
 
-from .utils import DictAllowMiss
+from .utils import lazy_mapping
 
 
 class PythonFormatRenderer(Renderer):
     name = "Python str.format"
 
     def render(self, content: str) -> str:
-        return content.format_map(DictAllowMiss(self.data))
+        return content.format_map(lazy_mapping(self.data, allow_miss=True))
@@ -3,7 +3,7 @@ import string
 from fabricius.models.renderer import Renderer
 from fabricius.types import Data
 
-from .utils import DictAllowMiss
+from .utils import lazy_mapping
 
 
 class StringTemplateRenderer(Renderer):
@@ -22,6 +22,8 @@ class StringTemplateRenderer(Renderer):
 
     def render(self, content: str) -> str:
         if self.safe:
-            return string.Template(content).safe_substitute(DictAllowMiss(self.data))
+            return string.Template(content).safe_substitute(
+                lazy_mapping(self.data, allow_miss=True)
+            )
         else:
-            return string.Template(content).substitute(self.data)
+            return string.Template(content).substitute(lazy_mapping(self.data))
@@ -0,0 +1,230 @@
+import importlib
+import threading
+import typing
+
+from fabricius.exceptions import RendererNotFoundError
+from fabricius.models.renderer import Renderer
+
+ENTRY_POINT_GROUP = "fabricius.renderers"
+"""
+The entry point group renderers are discovered from. The entry point's name is the renderer's
+name, its value the renderer's class.
+
+.. code-block:: toml
+
+   [project.entry-points."fabricius.renderers"]
+   handlebars = "my_package.renderer:HandlebarsRenderer"
+"""
+
+EXTENSIONS_ENTRY_POINT_GROUP = "fabricius.renderers.extensions"
+"""
+The entry point group file extensions are discovered from. The entry point's name is the
+extension, its value the name of the renderer that renders these files. That way, a renderer is
+only imported once a file needs it.
+
+.. code-block:: toml
+
+   [project.entry-points."fabricius.renderers.extensions"]
+   ".hbs" = "handlebars"
+"""
+
+_BUILTINS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "format": ("fabricius.renderers.python_format:PythonFormatRenderer", ()),
+    "string-template": ("fabricius.renderers.python_string_template:StringTemplateRenderer", ()),
+    "mustache": ("fabricius.renderers.mustache:ChevronRenderer", (".mustache",)),
+    "jinja": ("fabricius.renderers.jinja_renderer:JinjaRenderer", (".j2", ".jinja", ".jinja2")),
+}
+
+
+class RendererRegistry:
+    """
+    The renderers available by name, and the file extensions they render.
+
+    Renderers are registered as references (``"module:Class"``) and only imported once they are
+    first requested, so that a template only imports the template engines it uses. Renderers of
+    installed plugins are discovered from the :py:const:`ENTRY_POINT_GROUP` and
+    :py:const:`EXTENSIONS_ENTRY_POINT_GROUP` entry points, the first time a renderer or an
+    extension is not known.
+    """
+
+    _renderers: dict[str, "str | type[Renderer]"]
+    """
+    The renderers, by name, either imported, or as a reference to import.
+    """
+
+    _extensions: dict[str, str]
+    """
+    The name of the renderer of each extension. (Including its leading dot)
+    """
+
+    _discovered: bool
+    _lock: threading.Lock
+
+    def __init__(self, *, builtins: bool = True) -> None:
+        """
+        Parameters
+        ----------
+        builtins : :py:class:`bool`
+            If the renderers shipped with Fabricius are registered. Default to ``True``.
+        """
+        self._renderers = {}
+        self._extensions = {}
+        self._discovered = False
+        self._lock = threading.Lock()
+        if builtins:
+            for name, (reference, extensions) in _BUILTINS.items():
+                self.register(name, reference, extensions=extensions)
+
+    def register(
+        self,
+        name: str,
+        renderer: "str | type[Renderer]",
+        *,
+        extensions: typing.Iterable[str] = (),
+    ) -> None:
+        """
+        Register a renderer, replacing any renderer with the same name.
+
+        Parameters
+        ----------
+        name : :py:class:`str`
+            The name of the renderer.
+        renderer : :py:class:`str` or Type of :py:class:`fabricius.models.renderer.Renderer`
+            The renderer, or a reference to it, as ``"module:Class"``, imported once requested.
+        extensions : Iterable of :py:class:`str`
+            The file extensions the renderer renders, such as ``".j2"``.
+        """
+        with self._lock:
+            self._renderers[name] = renderer
+            for extension in extensions:
+                self._extensions[_normalize_extension(extension)] = name
+
+    def get(self, name: str) -> type[Renderer]:
+        """
+        Obtain a renderer by its name, importing it if needed.
+
+        Raises
+        ------
+        :py:exc:`fabricius.exceptions.RendererNotFoundError` :
+            No renderer is registered with this name, even after discovering plugins.
+        """
+        if name not in self._renderers:
+            self.discover()
+        try:
+            renderer = self._renderers[name]
+        except KeyError:
+            raise RendererNotFoundError(name) from None
+
+        if isinstance(renderer, str):
+            module, _, attribute = renderer.partition(":")
+            loaded: typing.Any = importlib.import_module(module)
+            for part in attribute.split("."):
+                loaded = getattr(loaded, part)
+            with self._lock:
+                self._renderers[name] = renderer = loaded
+        return renderer
+
+    def match(self, filename: str) -> tuple[str, str] | None:
+        """
+        Find the renderer of a file, from its extension, without importing it.
+
+        Compound extensions are tried first, so that ``".html.j2"`` can be registered apart from
+        ``".j2"``.
+
+        Returns
+        -------
+        :py:class:`tuple` or ``None`` :
+            The extension that matched, and the name of its renderer, or ``None`` if no renderer
+            renders this extension.
+        """
+        extension = self._extension_of(filename)
+        if extension is None and not self._discovered:
+            self.discover()
+            extension = self._extension_of(filename)
+        return None if extension is None else (extension, self._extensions[extension])
+
+    def get_for(self, filename: str) -> type[Renderer] | None:
+        """
+        Obtain the renderer of a file, from its extension, importing it if needed.
+
+        Returns
+        -------
+        Type of :py:class:`fabricius.models.renderer.Renderer` or ``None`` :
+            The renderer, or ``None`` if no renderer renders this extension.
+        """
+        match = self.match(filename)
+        return None if match is None else self.get(match[1])
+
+    def _extension_of(self, filename: str) -> str | None:
+        filename = filename.lower()
+        start = filename.find(".", 1)
+        while start != -1:
+            if filename[start:] in self._extensions:
+                return filename[start:]
+            start = filename.find(".", start + 1)
+        return None
+
+    @property
+    def names(self) -> list[str]:
+        """
+        The name of all the renderers, including the ones of plugins.
+        """
+        self.discover()
+        return sorted(self._renderers)
+
+    def discover(self) -> None:
+        """
+        Register the renderers & extensions of installed plugins, once. Renderers registered
+        with :py:meth:`register` take precedence over plugins.
+        """
+        if self._discovered:
+            return
+        # Scanning the installed distributions is slow, only do it once it's needed.
+        from importlib.metadata import entry_points
+
+        renderers = entry_points(group=ENTRY_POINT_GROUP)
+        extensions = entry_points(group=EXTENSIONS_ENTRY_POINT_GROUP)
+        with self._lock:
+            for entry_point in renderers:
+                self._renderers.setdefault(entry_point.name, entry_point.value)
+            for entry_point in extensions:
+                self._extensions.setdefault(
+                    _normalize_extension(entry_point.name), entry_point.value
+                )
+            self._discovered = True
+
+
+def _normalize_extension(extension: str) -> str:
+    extension = extension.lower()
+    return extension if extension.startswith(".") else f".{extension}"
+
+
+registry = RendererRegistry()
+"""
+The registry used by :py:meth:`File.with_renderer() <fabricius.models.file.File.with_renderer>`
+and :py:meth:`File.use_renderer_for_extension()
+<fabricius.models.file.File.use_renderer_for_extension>`.
+"""
+
+
+def get_renderer(name: str) -> type[Renderer]:
+    """
+    Obtain a renderer by its name, see :py:meth:`RendererRegistry.get`.
+    """
+    return registry.get(name)
+
+
+def get_renderer_for(filename: str) -> type[Renderer] | None:
+    """
+    Obtain the renderer of a file from its extension, see :py:meth:`RendererRegistry.get_for`.
+    """
+    return registry.get_for(filename)
+
+
+def register_renderer(
+    name: str, renderer: "str | type[Renderer]", *, extensions: typing.Iterable[str] = ()
+) -> None:
+    """
+    Register a renderer, see :py:meth:`RendererRegistry.register`.
+    """
+    registry.register(name, renderer, extensions=extensions)
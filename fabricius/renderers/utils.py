@@ -1,4 +1,7 @@
 import typing
+from collections.abc import Iterable, Iterator, Mapping
+
+from fabricius.types import Data, Lazy
 
 
 class DictAllowMiss(typing.Dict[str, typing.Any]):
@@ -11,3 +14,126 @@ class DictAllowMiss(typing.Dict[str, typing.Any]):
 
     def __missing__(self, _: str) -> typing.Literal[""]:
         return ""
+
+
+_NO_DEFAULT: typing.Any = object()
+
+
+_SCALARS = frozenset({str, int, float, bool, type(None)})
+"""
+The types of values that cannot hold a lazy value.
+"""
+
+
+def contains_lazy(data: Mapping[str, typing.Any]) -> bool:
+    """
+    Tell if data holds a :py:class:`fabricius.types.Lazy` value, itself or inside of its
+    nested mappings, lists and tuples.
+
+    :meta private:
+    """
+    if not Lazy.created:
+        return False
+    # Types are collected at C speed, data without any lazy value is the common case.
+    types = set(map(type, data.values()))
+    if Lazy in types:
+        return True
+    return not types <= _SCALARS and any(
+        _holds_lazy(value) for value in data.values() if type(value) not in _SCALARS
+    )
+
+
+def _holds_lazy(value: typing.Any) -> bool:
+    if isinstance(value, (Lazy, LazyMapping)):
+        return True
+    if isinstance(value, Mapping):
+        return contains_lazy(value)
+    if isinstance(value, (list, tuple)):
+        return any(_holds_lazy(item) for item in value)
+    return False
+
+
+def _resolve(value: typing.Any) -> typing.Any:
+    if isinstance(value, Lazy):
+        value = value.resolve()
+    if isinstance(value, LazyMapping):
+        return value
+    if isinstance(value, Mapping) and contains_lazy(value):
+        return LazyMapping(value)
+    if isinstance(value, (list, tuple)) and _holds_lazy(value):
+        # Resolved along with the sequence, which is used as a whole.
+        items = [_resolve(item) for item in value]
+        if isinstance(value, list):
+            return items
+        return value._make(items) if hasattr(value, "_make") else tuple(items)
+    return value
+
+
+class LazyMapping(Mapping[str, typing.Any]):
+    """
+    A read-only view of data that resolves its :py:class:`fabricius.types.Lazy` values, and the
+    ones of its nested mappings, once they are accessed. The lazy values inside of a list or a
+    tuple are resolved once the list or the tuple is accessed.
+
+    :meta private:
+    """
+
+    __slots__ = ("_data", "_default", "_nested")
+
+    def __init__(self, data: Mapping[str, typing.Any], *, default: typing.Any = _NO_DEFAULT):
+        self._data = data
+        self._default = default
+        self._nested: dict[str, typing.Any] = {}
+
+    def __getitem__(self, key: str) -> typing.Any:
+        if key in self._nested:
+            return self._nested[key]
+        try:
+            value = self._data[key]
+        except KeyError:
+            if self._default is _NO_DEFAULT:
+                raise
+            return self._default
+        value = self._nested[key] = _resolve(value)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"LazyMapping({self._data!r})"
+
+
+def resolve_data(data: Data, names: Iterable[str] | None = None) -> Data:
+    """
+    Copy data, resolving the :py:class:`fabricius.types.Lazy` values of the given variables
+    (All of them if ``names`` is ``None``). Nested mappings that hold lazy values are wrapped
+    inside a :py:class:`LazyMapping`, so that their values are resolved once accessed. Lists
+    and tuples are copied, with their lazy values resolved.
+
+    :meta private:
+    """
+    resolved = dict(data)
+    for name in data if names is None else names:
+        if name in data:
+            resolved[name] = _resolve(data[name])
+    return resolved
+
+
+def lazy_mapping(data: Data, *, allow_miss: bool = False) -> Mapping[str, typing.Any]:
+    """
+    Wrap data inside a :py:class:`LazyMapping` if it holds lazy values, otherwise, return it
+    as is. If ``allow_miss`` is True, missing keys are empty strings, like
+    :py:class:`DictAllowMiss`.
+
+    :meta private:
+    """
+    if contains_lazy(data):
+        return LazyMapping(data, default="" if allow_miss else _NO_DEFAULT)
+    return DictAllowMiss(data) if allow_miss else data
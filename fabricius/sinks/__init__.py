@@ -0,0 +1,31 @@
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from .local import LocalSink as LocalSink
+    from .memory import MemorySink as MemorySink
+    from .tar import TarSink as TarSink
+    from .zip import ZipSink as ZipSink
+
+_SINKS = {
+    "LocalSink": ".local",
+    "MemorySink": ".memory",
+    "TarSink": ".tar",
+    "ZipSink": ".zip",
+}
+
+__all__ = list(_SINKS)
+
+
+def __getattr__(name: str) -> typing.Any:
+    # Archive sinks are imported once used, as "tarfile" and "zipfile" are slow to import.
+    if name not in _SINKS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    sink = getattr(importlib.import_module(_SINKS[name], __name__), name)
+    globals()[name] = sink
+    return sink
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,74 @@
+import os
+import pathlib
+import shutil
+import sys
+import typing
+
+from fabricius.models.sink import Sink
+from fabricius.types import LinkMode
+
+if typing.TYPE_CHECKING:
+    from fabricius.sources.archive import TemplateSource
+
+if sys.platform.startswith("linux"):
+    import fcntl
+
+    _FICLONE: int | None = getattr(fcntl, "FICLONE", 0x40049409)
+else:
+    _FICLONE = None
+
+
+class LocalSink(Sink):
+    name = "Local disk"
+
+    _directories: set[pathlib.Path]
+    """
+    The directories that are known to exist, so that they're only created once.
+    """
+
+    def __init__(self) -> None:
+        self._directories = set()
+
+    def prepare(self, path: pathlib.Path) -> None:
+        self._make_parent(path)
+
+    def write(self, path: pathlib.Path, content: str) -> None:
+        self._make_parent(path)
+        path.write_text(content)
+
+    def copy(self, source: "TemplateSource", path: pathlib.Path) -> int:
+        self._make_parent(path)
+        if not isinstance(source, pathlib.Path):
+            return path.write_bytes(source.read_bytes())
+        shutil.copyfile(source, path)
+        return os.stat(path).st_size
+
+    def exists(self, path: pathlib.Path) -> bool:
+        return path.exists()
+
+    def link(self, source: pathlib.Path, path: pathlib.Path, mode: LinkMode) -> bool:
+        if source == path:
+            return False
+
+        try:
+            if mode == "hardlink":
+                self._make_parent(path)
+                path.unlink(missing_ok=True)
+                os.link(source, path)
+                return True
+
+            if mode == "reflink" and _FICLONE is not None:
+                self._make_parent(path)
+                with source.open("rb") as src, path.open("wb") as dst:
+                    fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+                return True
+        except OSError:
+            return False
+
+        return False
+
+    def _make_parent(self, path: pathlib.Path) -> None:
+        parent = path.parent
+        if parent not in self._directories:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._directories.add(parent)
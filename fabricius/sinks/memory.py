@@ -0,0 +1,30 @@
+import pathlib
+import typing
+
+from fabricius.models.sink import Sink
+
+if typing.TYPE_CHECKING:
+    from fabricius.sources.archive import TemplateSource
+
+
+class MemorySink(Sink):
+    name = "Memory"
+
+    files: dict[pathlib.Path, str | bytes]
+    """
+    The files that have been written, by their destination. Files that were copied as is are
+    kept as :py:class:`bytes`.
+    """
+
+    def __init__(self) -> None:
+        self.files = {}
+
+    def write(self, path: pathlib.Path, content: str) -> None:
+        self.files[path] = content
+
+    def copy(self, source: "TemplateSource", path: pathlib.Path) -> int:
+        data = self.files[path] = source.read_bytes()
+        return len(data)
+
+    def exists(self, path: pathlib.Path) -> bool:
+        return path in self.files
@@ -0,0 +1,99 @@
+import io
+import pathlib
+import tarfile
+import time
+import typing
+
+from fabricius.models.sink import Sink
+from fabricius.types import LinkMode, PathStrOrPath
+
+from .utils import archive_name
+
+if typing.TYPE_CHECKING:
+    from fabricius.sources.archive import TemplateSource
+
+
+class TarSink(Sink):
+    name = "Tar archive"
+
+    archive: tarfile.TarFile
+    """
+    The archive the files are written into.
+    """
+
+    root: pathlib.Path | None
+    """
+    The path the files are stored relatively to inside the archive.
+    """
+
+    _names: set[str]
+
+    def __init__(
+        self,
+        file: "PathStrOrPath | typing.IO[bytes]",
+        *,
+        root: "PathStrOrPath | None" = None,
+        compression: typing.Literal["gz", "bz2", "xz"] | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        file : :py:const:`fabricius.types.PathStrOrPath` or a binary file object
+            Where to write the archive. The archive is written as a stream, the file object does
+            not need to be seekable (For example, a response's body).
+        root : :py:const:`fabricius.types.PathStrOrPath`, optional
+            The path the files are stored relatively to inside the archive. Typically, the folder
+            the files would have been generated into on the disk.
+        compression : :py:class:`str`, optional
+            The compression to use (``"gz"``, ``"bz2"`` or ``"xz"``), if any.
+        """
+        mode = f"w|{compression or ''}"
+        if isinstance(file, str) or hasattr(file, "__fspath__"):
+            self.archive = tarfile.open(name=file, mode=mode)  # type: ignore
+        else:
+            self.archive = tarfile.open(fileobj=file, mode=mode)  # type: ignore
+        self.root = pathlib.Path(root).resolve() if root is not None else None
+        self._names = set()
+
+    def write(self, path: pathlib.Path, content: str) -> None:
+        data = content.encode("utf-8")
+        info = self._info(path)
+        info.size = len(data)
+        self.archive.addfile(info, io.BytesIO(data))
+
+    def copy(self, source: "TemplateSource", path: pathlib.Path) -> int:
+        info = self._info(path)
+        if not isinstance(source, pathlib.Path):
+            data = source.read_bytes()
+            info.size = len(data)
+            self.archive.addfile(info, io.BytesIO(data))
+            return info.size
+        info.size = source.stat().st_size
+        with source.open("rb") as file:
+            self.archive.addfile(info, file)
+        return info.size
+
+    def exists(self, path: pathlib.Path) -> bool:
+        return archive_name(path, self.root) in self._names
+
+    def link(self, source: pathlib.Path, path: pathlib.Path, mode: LinkMode) -> bool:
+        source_name = archive_name(source, self.root)
+        if mode != "hardlink" or source_name not in self._names:
+            return False
+
+        info = self._info(path)
+        info.type = tarfile.LNKTYPE
+        info.linkname = source_name
+        self.archive.addfile(info)
+        return True
+
+    def close(self) -> None:
+        self.archive.close()
+
+    def _info(self, path: pathlib.Path) -> tarfile.TarInfo:
+        name = archive_name(path, self.root)
+        self._names.add(name)
+        info = tarfile.TarInfo(name)
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        return info
@@ -0,0 +1,16 @@
+import pathlib
+
+
+def archive_name(path: pathlib.Path, root: pathlib.Path | None) -> str:
+    """
+    Get the name of a file inside an archive. It is relative to ``root`` if given and possible,
+    else it is the path without its anchor.
+
+    :meta private:
+    """
+    if root is not None:
+        try:
+            return path.relative_to(root).as_posix()
+        except ValueError:
+            pass
+    return pathlib.PurePosixPath(*path.parts[1:] if path.anchor else path.parts).as_posix()
@@ -0,0 +1,71 @@
+import pathlib
+import typing
+import zipfile
+
+from fabricius.models.sink import Sink
+from fabricius.types import PathStrOrPath
+
+from .utils import archive_name
+
+if typing.TYPE_CHECKING:
+    from fabricius.sources.archive import TemplateSource
+
+
+class ZipSink(Sink):
+    name = "Zip archive"
+
+    archive: zipfile.ZipFile
+    """
+    The archive the files are written into.
+    """
+
+    root: pathlib.Path | None
+    """
+    The path the files are stored relatively to inside the archive.
+    """
+
+    _names: set[str]
+
+    def __init__(
+        self,
+        file: "PathStrOrPath | typing.IO[bytes]",
+        *,
+        root: "PathStrOrPath | None" = None,
+        compression: int = zipfile.ZIP_DEFLATED,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        file : :py:const:`fabricius.types.PathStrOrPath` or a binary file object
+            Where to write the archive. The file object does not need to be seekable, so the
+            archive can be streamed (For example, into a response's body).
+        root : :py:const:`fabricius.types.PathStrOrPath`, optional
+            The path the files are stored relatively to inside the archive. Typically, the folder
+            the files would have been generated into on the disk.
+        compression : :py:class:`int`
+            The compression method, one of :py:mod:`zipfile`'s constants. Default to
+            :py:data:`zipfile.ZIP_DEFLATED`.
+        """
+        self.archive = zipfile.ZipFile(file, mode="w", compression=compression)
+        self.root = pathlib.Path(root).resolve() if root is not None else None
+        self._names = set()
+
+    def write(self, path: pathlib.Path, content: str) -> None:
+        name = archive_name(path, self.root)
+        self.archive.writestr(name, content.encode("utf-8"))
+        self._names.add(name)
+
+    def copy(self, source: "TemplateSource", path: pathlib.Path) -> int:
+        name = archive_name(path, self.root)
+        if isinstance(source, pathlib.Path):
+            self.archive.write(source, name)
+        else:
+            self.archive.writestr(name, source.read_bytes())
+        self._names.add(name)
+        return self.archive.getinfo(name).file_size
+
+    def exists(self, path: pathlib.Path) -> bool:
+        return archive_name(path, self.root) in self._names
+
+    def close(self) -> None:
+        self.archive.close()
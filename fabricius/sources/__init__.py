@@ -0,0 +1,6 @@
+from .archive import ARCHIVE_SUFFIXES as ARCHIVE_SUFFIXES
+from .archive import Archive as Archive
+from .archive import ArchivePath as ArchivePath
+from .archive import TemplateSource as TemplateSource
+from .archive import is_archive as is_archive
+from .archive import open_template as open_template
@@ -0,0 +1,287 @@
+import hashlib
+import io
+import os
+import pathlib
+import posixpath
+import sys
+import tarfile
+import threading
+import typing
+import zipfile
+
+from fabricius.types import PathStrOrPath
+
+if sys.version_info >= (3, 11):
+    from importlib.resources.abc import Traversable
+else:
+    from importlib.abc import Traversable
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+"""
+The suffixes of the files recognized as archives.
+"""
+
+
+class Archive:
+    """
+    The index of the members of a zip or tar archive, read once upon opening.
+
+    Members are read straight from the archive, nothing is extracted to the disk. The members of
+    tar archives are all read upon opening, as compressed tar archives cannot be read out of
+    order efficiently.
+    """
+
+    path: pathlib.Path
+    """
+    The path of the archive.
+    """
+
+    fingerprint: str
+    """
+    A fingerprint of the archive, from its path, modification time and size.
+    """
+
+    directories: dict[str, list[tuple[str, bool]]]
+    """
+    The content of each directory, by its path inside the archive (``""`` for the root), as
+    ``(name, is_directory)`` pairs.
+    """
+
+    _zip: zipfile.ZipFile | None
+    _members: dict[str, bytes]
+    _lock: threading.Lock
+
+    def __init__(self, path: PathStrOrPath) -> None:
+        """
+        Parameters
+        ----------
+        path : :py:const:`fabricius.types.PathStrOrPath`
+            The path of the archive.
+
+        Raises
+        ------
+        :py:exc:`ValueError` :
+            The file is neither a zip nor a tar archive.
+        """
+        self.path = pathlib.Path(path).resolve()
+        stat = self.path.stat()
+        self.fingerprint = hashlib.blake2b(
+            f"{self.path}\0{stat.st_mtime_ns}\0{stat.st_size}".encode("utf-8", "surrogateescape"),
+            digest_size=20,
+        ).hexdigest()
+        self._zip = None
+        self._members = {}
+        self._lock = threading.Lock()
+
+        names: list[tuple[str, bool]]
+        if zipfile.is_zipfile(self.path):
+            self._zip = zipfile.ZipFile(self.path)
+            names = [(info.filename, info.is_dir()) for info in self._zip.infolist()]
+        elif tarfile.is_tarfile(self.path):
+            names = []
+            with tarfile.open(self.path, "r:*") as archive:
+                for member in archive:
+                    if member.isdir():
+                        names.append((member.name, True))
+                    elif member.isfile():
+                        extracted = archive.extractfile(member)
+                        assert extracted is not None
+                        names.append((member.name, False))
+                        self._members[_normalize(member.name)] = extracted.read()
+        else:
+            raise ValueError(f"{self.path} is neither a zip nor a tar archive.")
+
+        self.directories = {"": []}
+        known: set[str] = {""}
+        for name, is_directory in names:
+            name = _normalize(name)
+            if not name:
+                continue
+            parts = name.split("/")
+            # Parents are not always listed as members of the archive.
+            for index in range(len(parts)):
+                member = "/".join(parts[: index + 1])
+                is_parent = index < len(parts) - 1
+                if member in known:
+                    continue
+                known.add(member)
+                member_is_directory = is_parent or is_directory
+                parent = "/".join(parts[:index])
+                self.directories[parent].append((parts[index], member_is_directory))
+                if member_is_directory:
+                    self.directories[member] = []
+
+    def read(self, name: str) -> bytes:
+        """
+        Read a file of the archive.
+
+        Raises
+        ------
+        :py:exc:`FileNotFoundError` :
+            The file is not inside the archive.
+        """
+        if self._zip is None:
+            try:
+                return self._members[name]
+            except KeyError:
+                raise FileNotFoundError(f"{name} is not inside {self.path}") from None
+        with self._lock:
+            try:
+                return self._zip.read(name)
+            except KeyError:
+                raise FileNotFoundError(f"{name} is not inside {self.path}") from None
+
+    def root(self) -> "ArchivePath":
+        """
+        The root directory of the archive.
+        """
+        return ArchivePath(self, "")
+
+
+def _normalize(name: str) -> str:
+    name = posixpath.normpath(name.replace("\\", "/")).lstrip("/")
+    return "" if name == "." else name
+
+
+class ArchivePath(Traversable):
+    """
+    A file or directory inside an archive, with the same interface as :py:class:`pathlib.Path`
+    for reading. (It implements :py:class:`importlib.resources.abc.Traversable`)
+    """
+
+    archive: Archive
+    """
+    The archive this path is in.
+    """
+
+    at: str
+    """
+    The path inside the archive, ``""`` for the root.
+    """
+
+    def __init__(self, archive: Archive, at: str) -> None:
+        self.archive = archive
+        self.at = at
+
+    @property
+    def name(self) -> str:
+        return posixpath.basename(self.at) if self.at else self.archive.path.name
+
+    @property
+    def suffix(self) -> str:
+        return pathlib.PurePosixPath(self.name).suffix
+
+    @property
+    def stem(self) -> str:
+        return pathlib.PurePosixPath(self.name).stem
+
+    @property
+    def parent(self) -> "ArchivePath":
+        return ArchivePath(self.archive, posixpath.dirname(self.at))
+
+    def iterdir(self) -> typing.Iterator["ArchivePath"]:
+        for name, _ in self.archive.directories.get(self.at, ()):
+            yield self.joinpath(name)
+
+    def is_dir(self) -> bool:
+        return self.at in self.archive.directories
+
+    def is_file(self) -> bool:
+        parent = self.archive.directories.get(posixpath.dirname(self.at), ())
+        return bool(self.at) and (self.name, False) in parent
+
+    def exists(self) -> bool:
+        return self.is_dir() or self.is_file()
+
+    def joinpath(self, *descendants: str) -> "ArchivePath":
+        return ArchivePath(self.archive, _normalize(posixpath.join(self.at, *descendants)))
+
+    def __truediv__(self, child: str) -> "ArchivePath":
+        return self.joinpath(child)
+
+    def read_bytes(self) -> bytes:
+        return self.archive.read(self.at)
+
+    def read_text(self, encoding: str | None = None, errors: str | None = None) -> str:
+        return self.read_bytes().decode(encoding or "utf-8", errors or "strict")
+
+    def open(
+        self, mode: str = "r", *args: typing.Any, **kwargs: typing.Any
+    ) -> typing.IO[typing.Any]:
+        if mode not in ("r", "rb"):
+            raise ValueError(f"Archives can only be opened for reading, not with mode {mode!r}.")
+        stream = io.BytesIO(self.read_bytes())
+        return stream if mode == "rb" else io.TextIOWrapper(stream, *args, **kwargs)
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        A fingerprint of the archive, see :py:attr:`Archive.fingerprint`.
+        """
+        return self.archive.fingerprint
+
+    def __eq__(self, other: object) -> bool:
+        # Paths of the same archive are equal even if it was opened twice, so that they can be
+        # used as keys of caches.
+        return (
+            isinstance(other, ArchivePath)
+            and other.archive.path == self.archive.path
+            and other.at == self.at
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.archive.path, self.at))
+
+    def __str__(self) -> str:
+        return (
+            posixpath.join(str(self.archive.path), self.at) if self.at else str(self.archive.path)
+        )
+
+    def __repr__(self) -> str:
+        return f"<ArchivePath {self}>"
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        # The archive is opened again, for example, in another process.
+        return (_reopen, (self.archive.path, self.at))
+
+
+TemplateSource: typing.TypeAlias = "pathlib.Path | ArchivePath"
+"""
+Where a template is read from: a directory, or a directory inside an archive.
+"""
+
+
+def _reopen(path: pathlib.Path, at: str) -> ArchivePath:
+    return ArchivePath(Archive(path), at)
+
+
+def is_archive(path: PathStrOrPath) -> bool:
+    """
+    Indicate if a path is an archive, from its suffix.
+    """
+    return os.fspath(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def open_template(path: "PathStrOrPath | ArchivePath") -> TemplateSource:
+    """
+    Open a template's source: a directory, or an archive.
+
+    Archives are opened with :py:class:`Archive`, without being extracted. If an archive only
+    contains a single directory, that directory is used as the template's source, as it's common
+    for archives to wrap their content inside a folder.
+
+    Parameters
+    ----------
+    path : :py:const:`fabricius.types.PathStrOrPath` or :py:class:`ArchivePath`
+        The path of the directory or archive. Paths inside an archive are returned as is.
+    """
+    if isinstance(path, ArchivePath):
+        return path
+    if not is_archive(path):
+        return pathlib.Path(path).resolve()
+
+    root = Archive(path).root()
+    children = list(root.iterdir())
+    if len(children) == 1 and children[0].is_dir():
+        return children[0]
+    return root
@@ -1,4 +1,5 @@
 import pathlib
+import threading
 import typing
 
 if typing.TYPE_CHECKING:
@@ -10,6 +11,72 @@ Data is an alias that represents a dictionary of which every keys are string and
 of any types.
 """
 
+_T = typing.TypeVar("_T")
+
+
+class Lazy(typing.Generic[_T]):
+    """
+    A value of :py:const:`Data` that is only computed once a template uses it, then kept for
+    the following ones. Useful for values that are long to obtain, such as git metadata, that
+    most files do not use.
+
+    Renderers resolve the lazy values of the variables a template uses, and, inside of nested
+    mappings, the values they access. Lazy values inside of a list or a tuple are all resolved
+    once the list or the tuple is used. Jinja templates are analyzed beforehand (Including
+    the templates they include) so that only the lazy values they reference are resolved.
+
+    .. code-block:: py
+
+       def get_commit() -> str:
+           return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+
+       template.push_data({"commit": Lazy(get_commit)})
+    """
+
+    provider: typing.Callable[[], _T]
+    """
+    Computes the value, it is called at most once.
+    """
+
+    _value: _T
+    _resolved: bool
+    _lock: threading.Lock
+
+    created: typing.ClassVar[bool] = False
+    """
+    If a lazy value was ever created. Until then, renderers do not look for lazy values.
+
+    :meta private:
+    """
+
+    def __init__(self, provider: typing.Callable[[], _T]) -> None:
+        Lazy.created = True
+        self.provider = provider
+        self._resolved = False
+        self._lock = threading.Lock()
+
+    @property
+    def resolved(self) -> bool:
+        """
+        If the value was already computed.
+        """
+        return self._resolved
+
+    def resolve(self) -> _T:
+        """
+        Obtain the value, computing it on the first call.
+        """
+        if not self._resolved:
+            with self._lock:
+                if not self._resolved:
+                    self._value = self.provider()
+                    self._resolved = True
+        return self._value
+
+    def __repr__(self) -> str:
+        return f"Lazy({self.provider!r})"
+
+
 PathStrOrPath: typing.TypeAlias = "str | os.PathLike[str] | pathlib.Path"
 """
 PathStrOrPath represents a path as a :py:class:`str` or a :py:class:`pathlib.Path` object.
@@ -18,6 +85,53 @@ Used to help users either have an easy way to give their path.
 
 FILE_STATE = typing.Literal["pending", "persisted"]
 
+LinkMode: typing.TypeAlias = typing.Literal["hardlink", "reflink"]
+"""
+LinkMode represents how a file is materialized when its content is identical to an already saved
+file. ``"hardlink"`` makes both files share the same data on the disk (Editing one edits the
+other), ``"reflink"`` makes a copy-on-write clone, when supported by the filesystem.
+"""
+
+
+class FileTimings(typing.TypedDict):
+    """
+    The time, in seconds, spent in each phase of a file's commit.
+    """
+
+    read: float
+    """
+    Reading the file template.
+    """
+
+    render: float
+    """
+    Rendering the content.
+    """
+
+    mkdir: float
+    """
+    Creating the directories of the file.
+    """
+
+    write: float
+    """
+    Writing (Or linking) the file.
+    """
+
+    signals: float
+    """
+    Sending the file's signals.
+    """
+
+
+def new_timings() -> FileTimings:
+    """
+    Create empty timings.
+
+    :meta private:
+    """
+    return FileTimings(read=0.0, render=0.0, mkdir=0.0, write=0.0, signals=0.0)
+
 
 class FileCommitResult(typing.TypedDict):
     """
@@ -60,3 +174,19 @@ class FileCommitResult(typing.TypedDict):
     If the file was faked.
     If faked, the file has not been saved to the disk.
     """
+
+    dependencies: frozenset[str]
+    """
+    The name of the other templates that were used to render the file.
+    (For example, templates included with Jinja's ``{% include %}``)
+    """
+
+    bytes_written: int
+    """
+    The number of bytes written. ``0`` if the file was faked or linked to another one.
+    """
+
+    timings: FileTimings | None
+    """
+    The time spent in each phase of the commit, if requested.
+    """
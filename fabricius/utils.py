@@ -1,8 +1,11 @@
 import random
+import re
 import typing
 
 import inflection
-from rich.color import Color
+
+if typing.TYPE_CHECKING:
+    from rich.color import Color
 
 FABRICIUS_IS_AWESOME = [
     "Generating your project, hang tight!",
@@ -17,7 +20,7 @@ def fetch_me_a_beer() -> str:
 
 
 def calculate_text_color(
-    color: str | Color, *, threshold: int = 150
+    color: "str | Color", *, threshold: int = 150
 ) -> typing.Literal["black", "bright_white"]:
     """
     Calculate if the text should be in black or white depending on a color.
@@ -43,6 +46,9 @@ def calculate_text_color(
     str :
         Return either "black" or "bright_white"
     """
+    # Rich is only imported when needed, so that it is not required by headless runs.
+    from rich.color import Color
+
     if isinstance(color, str):
         color = Color.parse(color)
     r, g, b = tuple(color.get_truecolor())
@@ -202,3 +208,100 @@ def sentence_case(text: str) -> str:
     if has_ending_id:
         result += " ID"
     return result
+
+
+def _translate_pattern(pattern: str) -> str:
+    """
+    Translate a gitignore-style glob into a regular expression.
+
+    :meta private:
+    """
+    result: list[str] = []
+    index, length = 0, len(pattern)
+
+    while index < length:
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            result.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            result.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "[" and (end := pattern.find("]", index + 2)) != -1:
+            klass = pattern[index + 1 : end]
+            if klass.startswith("!"):
+                klass = f"^{klass[1:]}"
+            result.append(f"[{klass.replace(chr(92), chr(92) * 2)}]")
+            index = end
+        else:
+            result.append(re.escape(char))
+        index += 1
+
+    return "".join(result)
+
+
+def compile_patterns(patterns: typing.Iterable[str]) -> re.Pattern[str] | None:
+    """
+    Compile gitignore-style patterns into a single regular expression, so that a path is matched
+    against all of them at once.
+
+    The compiled expression is matched against paths relative to the folder the patterns apply
+    to, using ``/`` as separator. Paths of directories must end with ``/``.
+
+    Like in a ``.gitignore`` file:
+
+    - Blank lines and lines starting with ``#`` are ignored.
+    - ``*`` matches anything but ``/``, ``?`` matches any character but ``/``, and ``**`` matches
+      any number of directories.
+    - A pattern containing a ``/`` (other than a trailing one) is relative to the folder,
+      otherwise it matches at any level.
+    - A pattern ending with ``/`` only matches directories.
+
+    Negative patterns (``!pattern``) are not supported.
+
+    Parameters
+    ----------
+    patterns : Iterable of :py:class:`str`
+        The patterns to compile.
+
+    Returns
+    -------
+    :py:class:`re.Pattern` or ``None`` :
+        The compiled expression, or ``None`` if there was no pattern.
+
+    Example
+    -------
+    .. code-block:: python
+
+       >>> matcher = compile_patterns(["*.pyc", "/build/"])
+       >>> bool(matcher.match("src/module.pyc"))
+       True
+       >>> bool(matcher.match("build/"))
+       True
+       >>> bool(matcher.match("src/build/"))
+       False
+    """
+    expressions: list[str] = []
+
+    for pattern in patterns:
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith("#"):
+            continue
+        directory_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+
+        prefix = "" if anchored else "(?:.*/)?"
+        suffix = "/" if directory_only else "/?"
+        expressions.append(f"{prefix}{_translate_pattern(pattern)}{suffix}")
+
+    if not expressions:
+        return None
+    return re.compile(f"(?:{'|'.join(expressions)})\\Z")
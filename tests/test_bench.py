@@ -0,0 +1,63 @@
+import pathlib
+
+from click.testing import CliRunner
+
+from fabricius.bench.__main__ import main
+from fabricius.bench.micro import compare, get_cases, run
+from fabricius.bench.scale import Shape, measure, synthesize
+
+
+def test_bench_run_and_compare():
+    """
+    Test that benchmark cases run, and that regressions are detected against a baseline.
+    """
+    cases = [case for case in get_cases() if case.name.endswith(("tiny/small/repeated", "fake"))]
+    results = run(cases, rounds=1, min_time=0)
+
+    assert "render/jinja/tiny/small/repeated" in results["results"]
+    assert "commit/tiny/fake" in results["results"]
+    assert compare(results, results) == []
+
+    baseline = {**results, "results": {**results["results"]}}
+    baseline["results"]["commit/tiny/fake"] = {
+        **results["results"]["commit/tiny/fake"],
+        "median": results["results"]["commit/tiny/fake"]["median"] / 2,
+    }
+    regressions = compare(results, baseline, threshold=0.5)  # type: ignore
+    assert [regression.name for regression in regressions] == ["commit/tiny/fake"]
+    assert regressions[0].ratio == 2
+
+
+def test_bench_scale(tmp_path: pathlib.Path):
+    """
+    Test the synthesis of a repository of a given shape, and the report of its generation.
+    """
+    shape = Shape(files=40, depth=2, fan_out=2, file_size=200, templated_names=0.5, copied=0.25)
+    repository = synthesize(tmp_path.joinpath("template"), shape)
+    names = [path.name for path in repository.rglob("*file*")]
+    assert len(names) == 40
+    assert sum(name.startswith("{{") for name in names) == 20
+    assert sum(name.endswith(".bin") for name in names) == 10
+    assert len({path.parent for path in repository.rglob("*file*")}) == 7
+
+    report = measure(shape, workdir=str(tmp_path), trace_memory=True)
+    assert set(report["phases"]) == {"setup", "run"}
+    assert report["files_per_second"] > 0
+    assert report["peak_traced"]
+
+
+def test_bench_cli_baseline(tmp_path: pathlib.Path):
+    """
+    Test that a missing baseline is reported before running the cases, and can be saved.
+    """
+    baseline = tmp_path.joinpath("baseline.json")
+    options = ["-k", "commit/tiny/fake", "--rounds", "1", "--min-time", "0"]
+
+    result = CliRunner().invoke(main, [*options, "--baseline", str(baseline)])
+    assert result.exit_code == 2
+    assert "--save-baseline" in result.output
+    assert "commit/tiny/fake" not in result.output
+
+    result = CliRunner().invoke(main, [*options, "--baseline", str(baseline), "--save-baseline"])
+    assert result.exit_code == 0, result.output
+    assert baseline.is_file()
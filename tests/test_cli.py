@@ -0,0 +1,196 @@
+import json
+import pathlib
+
+import pytest
+from click.testing import CliRunner
+
+from fabricius.app.cli import main
+
+
+def make_template(path: pathlib.Path) -> pathlib.Path:
+    project = path.joinpath("template", "{{cookiecutter.name}}")
+    project.mkdir(parents=True)
+    project.parent.joinpath("cookiecutter.json").write_text(
+        json.dumps({"name": "demo", "greeting": ["Hello", "Hi"]})
+    )
+    project.joinpath("README.md").write_text("{{ cookiecutter.greeting }} {{ cookiecutter.name }}")
+    return project.parent
+
+
+def test_cli_generate(tmp_path: pathlib.Path):
+    """
+    Test the generation of a project, without input, with a JSON output.
+    """
+    template = make_template(tmp_path)
+    output = tmp_path.joinpath("output")
+
+    result = CliRunner().invoke(
+        main,
+        ["generate", str(template), "name=cli", "--no-input", "-o", str(output), "--json"],
+    )
+
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.output)
+    assert data["error"] is None
+    assert data["files"][0]["name"] == "README.md"
+    assert data["stats"]["files"] == 1
+    assert output.joinpath("README.md").read_text() == "Hello cli"
+
+    result = CliRunner().invoke(main, ["generate", str(template), "--no-input", "-o", str(output)])
+    assert result.exit_code == 1
+    assert "already exists" in result.output
+
+
+def test_cli_batch(tmp_path: pathlib.Path):
+    """
+    Test the generation of many projects from a JSON Lines file.
+    """
+    template = make_template(tmp_path)
+    batch = tmp_path.joinpath("batch.jsonl")
+    batch.write_text('{"name": "first"}\n\n{"name": "second", "_output_dir": "custom"}\n')
+    output = tmp_path.joinpath("output")
+
+    result = CliRunner().invoke(
+        main,
+        ["generate", str(template), "--batch", str(batch), "-o", str(output), "-j", "2", "--json"],
+    )
+
+    assert result.exit_code == 0, result.output
+    projects = json.loads(result.output)["projects"]
+    assert [pathlib.Path(project["output_folder"]).name for project in projects] == [
+        "1",
+        "custom",
+    ]
+    assert output.joinpath("1", "README.md").read_text() == "Hello first"
+    assert output.joinpath("custom", "README.md").read_text() == "Hello second"
+
+
+def test_cli_errors(tmp_path: pathlib.Path):
+    """
+    Test that invalid templates and batch files are reported without a traceback.
+    """
+    template = make_template(tmp_path)
+    output = tmp_path.joinpath("output")
+    batch = tmp_path.joinpath("batch.jsonl")
+    batch.write_text('{"name": "first"}\n{"name": \n')
+
+    result = CliRunner().invoke(
+        main, ["generate", str(template), "--batch", str(batch), "-o", str(output)]
+    )
+    assert result.exit_code == 2
+    assert "Line 2 is not valid JSON" in result.output
+    assert not output.exists()
+
+    empty = tmp_path.joinpath("empty")
+    empty.mkdir()
+    for options in (["--no-input"], ["--batch", str(batch)]):
+        batch.write_text('{"name": "first"}\n')
+        result = CliRunner().invoke(main, ["generate", str(empty), "-o", str(output), *options])
+        assert result.exit_code == 1
+        assert "cookiecutter.json does not exist" in result.output
+        assert result.exc_info is not None and result.exc_info[0] is SystemExit
+
+
+def test_cli_watch_options(tmp_path: pathlib.Path):
+    """
+    Test that --watch refuses the options it cannot honor.
+    """
+    template = make_template(tmp_path)
+    output = tmp_path.joinpath("output")
+
+    for option in (["-f"], ["-j", "2"]):
+        result = CliRunner().invoke(
+            main, ["generate", str(template), "--watch", "-o", str(output), *option]
+        )
+        assert result.exit_code == 2, result.output
+        assert "--watch" in result.output
+    assert not output.exists()
+
+
+def test_cli_daemon(tmp_path: pathlib.Path):
+    """
+    Test the generation of projects by a daemon, which keeps its template prepared.
+    """
+    import tempfile
+    import threading
+
+    from fabricius.app.daemon import Daemon, request
+
+    template = make_template(tmp_path)
+    # Unix sockets paths are short, tmp_path may be too long.
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = pathlib.Path(directory, "fabricius.sock")
+        daemon = Daemon()
+        thread = threading.Thread(target=daemon.serve, args=(socket_path,))
+        thread.start()
+        try:
+            for _ in range(50):
+                if socket_path.exists():
+                    break
+                threading.Event().wait(0.05)
+            assert [event["event"] for event in request(socket_path, {"command": "ping"})] == [
+                "pong"
+            ]
+
+            for name in ("first", "second"):
+                result = CliRunner().invoke(
+                    main,
+                    [
+                        "generate",
+                        str(template),
+                        f"name={name}",
+                        "-o",
+                        str(tmp_path.joinpath(name)),
+                        "--daemon",
+                        "--socket",
+                        str(socket_path),
+                        "--json",
+                    ],
+                )
+                assert result.exit_code == 0, result.output
+                output = json.loads(result.output)
+                assert output["error"] is None
+                assert [file["name"] for file in output["files"]] == ["README.md"]
+                assert tmp_path.joinpath(name, "README.md").read_text() == f"Hello {name}"
+            assert len(daemon._templates) == 1
+
+            result = CliRunner().invoke(
+                main,
+                [
+                    "generate",
+                    str(template),
+                    "-o",
+                    str(tmp_path.joinpath("first")),
+                    "--daemon",
+                    "--socket",
+                    str(socket_path),
+                ],
+            )
+            assert result.exit_code == 1
+            assert "already exists" in result.output
+
+            result = CliRunner().invoke(main, ["daemon", "--socket", str(socket_path), "--stop"])
+            assert result.exit_code == 0, result.output
+        finally:
+            thread.join(5)
+        assert not thread.is_alive()
+        assert not socket_path.exists()
+
+
+def test_cli_daemon_socket_folder(tmp_path: pathlib.Path):
+    """
+    Test that the daemon creates the folder of its socket, and refuses a folder others can write
+    to.
+    """
+    from fabricius.app.daemon import Daemon, _secure_directory
+
+    private = tmp_path.joinpath("private")
+    _secure_directory(str(private))
+    assert private.stat().st_mode & 0o777 == 0o700
+
+    shared = tmp_path.joinpath("shared")
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError):
+        Daemon().serve(shared.joinpath("fabricius.sock"))
+    assert not shared.joinpath("fabricius.sock").exists()
@@ -0,0 +1,413 @@
+import json
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+from fabricius.readers.cookiecutter.batch import prepare
+from fabricius.readers.cookiecutter.config import get_config
+from fabricius.readers.cookiecutter.exceptions import FailedHookError
+from fabricius.readers.cookiecutter.hooks import (
+    DEFAULT_TIMEOUT,
+    HookMode,
+    check_hook_options,
+    run_hook,
+)
+from fabricius.readers.cookiecutter.setup import run, setup
+from fabricius.readers.cookiecutter.snapshot import clear_snapshots
+
+
+@pytest.fixture
+def cookiecutter_template(tmp_path: pathlib.Path) -> pathlib.Path:
+    base = tmp_path.joinpath("template")
+    files = {
+        "cookiecutter.json": json.dumps(
+            {"project_slug": "project", "module": "module", "docker": False}
+        ),
+        "{{cookiecutter.project_slug}}/README.md": "# {{ cookiecutter.project_slug }}",
+        "{{cookiecutter.project_slug}}/src/{{cookiecutter.module}}/__init__.py": "",
+        "{{cookiecutter.project_slug}}/src/{{cookiecutter.module}}/main.py": (
+            "print('{{ cookiecutter.module }}')"
+        ),
+        "{{cookiecutter.project_slug}}/{% if cookiecutter.docker %}docker{% endif %}/Dockerfile": (
+            "FROM python"
+        ),
+    }
+    for path, content in files.items():
+        base.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+        base.joinpath(path).write_text(content)
+    return base
+
+
+def test_cookiecutter_nested(cookiecutter_template: pathlib.Path, tmp_path: pathlib.Path):
+    """
+    Test the generation of nested & templated directories.
+    """
+    output = tmp_path.joinpath("output")
+    template = setup(
+        cookiecutter_template,
+        output,
+        no_prompt=True,
+        extra_context={"project_slug": "fabricius", "module": "core", "docker": False},
+        scan_workers=2,
+    )
+    run(template)
+
+    generated = sorted(
+        path.relative_to(output).as_posix() for path in output.rglob("*") if path.is_file()
+    )
+    assert generated == ["README.md", "src/core/__init__.py", "src/core/main.py"]
+    assert output.joinpath("src", "core", "main.py").read_text() == "print('core')"
+
+
+def test_cookiecutter_walk_symlink_loop(
+    cookiecutter_template: pathlib.Path, tmp_path: pathlib.Path
+):
+    """
+    Test that symlinks to directories are not followed, so that a loop ends.
+    """
+    from jinja2 import Environment
+
+    from fabricius.readers.cookiecutter.walker import PathRenderer, walk_template
+
+    project = cookiecutter_template.joinpath("{{cookiecutter.project_slug}}")
+    project.joinpath("src", "loop").symlink_to(project, target_is_directory=True)
+    project.joinpath("link.md").symlink_to(project.joinpath("README.md"))
+
+    renderer = PathRenderer(
+        Environment(), {"cookiecutter": {"project_slug": "project", "module": "core"}}
+    )
+    entries = walk_template(project, renderer)
+    assert sorted(entry.relative_source for entry in entries) == [
+        "README.md",
+        "link.md",
+        "src/{{cookiecutter.module}}/__init__.py",
+        "src/{{cookiecutter.module}}/main.py",
+    ]
+
+    output = tmp_path.joinpath("output")
+    run(setup(cookiecutter_template, output, no_prompt=True, cache=None))
+    assert output.joinpath("link.md").read_text() == "# project"
+    assert not output.joinpath("src", "loop").exists()
+
+
+def test_cookiecutter_copy_without_render(
+    cookiecutter_template: pathlib.Path, tmp_path: pathlib.Path
+):
+    """
+    Test that files matching "_copy_without_render" are copied as is, even binary ones.
+    """
+    config = cookiecutter_template.joinpath("cookiecutter.json")
+    context = json.loads(config.read_text())
+    context["_copy_without_render"] = ["*.png", "{{cookiecutter.project_slug}}/raw"]
+    config.write_text(json.dumps(context))
+
+    project = cookiecutter_template.joinpath("{{cookiecutter.project_slug}}")
+    project.joinpath("logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\xff\xfe")
+    project.joinpath("raw").mkdir()
+    project.joinpath("raw", "notes.txt").write_text("{{ cookiecutter.module }}")
+
+    output = tmp_path.joinpath("output")
+    template = setup(
+        cookiecutter_template, output, no_prompt=True, extra_context={"project_slug": "fabricius"}
+    )
+    run(template)
+
+    assert output.joinpath("logo.png").read_bytes() == b"\x89PNG\r\n\x1a\n\xff\xfe"
+    assert output.joinpath("raw", "notes.txt").read_text() == "{{ cookiecutter.module }}"
+    assert output.joinpath("README.md").read_text() == "# fabricius"
+
+
+def test_cookiecutter_user_config(cookiecutter_template: pathlib.Path, tmp_path: pathlib.Path):
+    """
+    Test that the user config is cached until it is modified.
+    """
+    config = tmp_path.joinpath("cookiecutterrc")
+    config.write_text("default_context:\n  project_slug: cached\n")
+
+    first = get_config(config)
+    assert first["default_context"] == {"project_slug": "cached"}
+    assert get_config(config)["default_context"] is first["default_context"]
+
+    config.write_text("default_context:\n  license: MIT\n")
+    assert get_config(config)["default_context"] == {"license": "MIT"}
+
+    template = setup(cookiecutter_template, tmp_path, no_prompt=True, config_file=config)
+    assert template.data["cookiecutter"]["license"] == "MIT"
+
+
+def test_cookiecutter_snapshot(
+    cookiecutter_template: pathlib.Path, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Test that the template's snapshot is reused until the template is modified.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path.joinpath("cache")))
+    clear_snapshots()
+
+    first = setup(cookiecutter_template, tmp_path.joinpath("first"), no_prompt=True, cache="disk")
+    run(first)
+    second = setup(
+        cookiecutter_template,
+        tmp_path.joinpath("second"),
+        no_prompt=True,
+        extra_context={"project_slug": "second"},
+        cache="disk",
+    )
+    assert second.renderer is first.renderer
+    readme = next(file for file in second.files if file.name == "README.md")
+    assert readme.source is None and readme.content == "# {{ cookiecutter.project_slug }}"
+
+    # Another process would load the snapshot from the disk.
+    clear_snapshots()
+    third = setup(cookiecutter_template, tmp_path.joinpath("third"), no_prompt=True, cache="disk")
+    assert third.renderer is not first.renderer
+    assert not any(file.source for file in third.files)
+
+    cookiecutter_template.joinpath("{{cookiecutter.project_slug}}", "README.md").write_text(
+        "# Modified"
+    )
+    fourth = setup(cookiecutter_template, tmp_path.joinpath("fourth"), no_prompt=True)
+    assert fourth.renderer is not third.renderer
+    run(fourth)
+    assert tmp_path.joinpath("fourth", "README.md").read_text() == "# Modified"
+
+
+@pytest.mark.parametrize("mode", ["subprocess", "in-process", "worker"])
+def test_cookiecutter_hooks(
+    cookiecutter_template: pathlib.Path, tmp_path: pathlib.Path, mode: HookMode
+):
+    """
+    Test that Python hooks run from the output folder, in every mode.
+    """
+    hooks = cookiecutter_template.joinpath("hooks")
+    hooks.mkdir()
+    hooks.joinpath("post_gen_project.py").write_text(
+        "import pathlib, sys\n"
+        "pathlib.Path('hooked.txt').write_text('{{ cookiecutter.project_slug }}')\n"
+        "sys.exit(0)\n"
+    )
+    temporary_files = set(pathlib.Path(tempfile.gettempdir()).iterdir())
+
+    output = tmp_path.joinpath("output")
+    template = setup(cookiecutter_template, output, no_prompt=True, hooks_mode=mode, cache=None)
+    template.push_data({"cookiecutter": {**template.data["cookiecutter"], "project_slug": "hi"}})
+    run(template)
+
+    assert output.joinpath("hooked.txt").read_text() == "hi"
+    assert set(pathlib.Path(tempfile.gettempdir()).iterdir()) <= temporary_files
+
+
+@pytest.mark.parametrize("mode", ["subprocess", "in-process", "worker"])
+def test_cookiecutter_hooks_failure(tmp_path: pathlib.Path, mode: HookMode):
+    """
+    Test that failing and slow hooks raise FailedHookError, with their exit status, and that
+    in-process hooks cannot be given a timeout.
+    """
+    hook = tmp_path.joinpath("pre_gen_project.py")
+    hook.write_text("import sys\nsys.exit(3)\n")
+    with pytest.raises(FailedHookError) as exception:
+        run_hook(hook, {}, mode=mode)
+    assert exception.value.exit_code == 3
+
+    hook.write_text("import time\ntime.sleep(5)\n")
+    if mode == "in-process":
+        with pytest.raises(ValueError):
+            run_hook(hook, {}, mode=mode, timeout=0.5)
+        return
+    with pytest.raises(FailedHookError, match="Timed out"):
+        run_hook(hook, {}, mode=mode, timeout=0.5)
+
+
+def test_cookiecutter_hooks_timeout():
+    """
+    Test that the default timeout of hooks depends on how they run.
+    """
+    assert check_hook_options("subprocess") == DEFAULT_TIMEOUT
+    assert check_hook_options("worker", None) is None
+    assert check_hook_options("worker", 2.5) == 2.5
+    assert check_hook_options("in-process") is None
+    assert check_hook_options("in-process", None) is None
+    with pytest.raises(ValueError):
+        check_hook_options("in-process", 2.5)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_cookiecutter_generate_many(
+    cookiecutter_template: pathlib.Path, tmp_path: pathlib.Path, executor: str
+):
+    """
+    Test the generation of many projects from a prepared template, where one of them fails.
+    """
+    prepared = prepare(cookiecutter_template)
+    teams = ["alpha", "beta", "gamma"]
+    tmp_path.joinpath("beta").mkdir()
+    tmp_path.joinpath("beta", "README.md").write_text("Already there")
+
+    results = prepared.generate_many(
+        [{"project_slug": team} for team in teams],
+        [tmp_path.joinpath(team) for team in teams],
+        jobs=2,
+        executor=executor,  # type: ignore
+    )
+
+    assert [result["output_folder"].name for result in results] == teams
+    assert isinstance(results[1]["error"], FileExistsError)
+    for team, result in zip(teams, results):
+        if team == "beta":
+            continue
+        assert result["error"] is None
+        assert len(result["files"]) == 3
+        assert tmp_path.joinpath(team, "README.md").read_text() == f"# {team}"
+        assert tmp_path.joinpath(team, "src", "module", "main.py").read_text() == (
+            "print('module')"
+        )
+
+
+@pytest.mark.parametrize("format", ["zip", "gztar"])
+def test_cookiecutter_archive(
+    cookiecutter_template: pathlib.Path, tmp_path: pathlib.Path, format: str
+):
+    """
+    Test the generation of a project from a template inside an archive.
+    """
+    context = json.loads(cookiecutter_template.joinpath("cookiecutter.json").read_text())
+    cookiecutter_template.joinpath("cookiecutter.json").write_text(
+        json.dumps({**context, "_copy_without_render": ["*.png"]})
+    )
+    project = cookiecutter_template.joinpath("{{cookiecutter.project_slug}}")
+    project.joinpath("logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\xff{{")
+    project.joinpath("LICENSE").write_text("{% include 'license.txt' %}")
+    cookiecutter_template.joinpath("templates").mkdir()
+    cookiecutter_template.joinpath("templates", "license.txt").write_text("MIT")
+    cookiecutter_template.joinpath("hooks").mkdir()
+    cookiecutter_template.joinpath("hooks", "post_gen_project.py").write_text(
+        "open('hooked.txt', 'w').write('{{ cookiecutter.module }}')"
+    )
+    archive = shutil.make_archive(
+        str(tmp_path.joinpath("template")), format, tmp_path, cookiecutter_template.name
+    )
+
+    output = tmp_path.joinpath("output")
+    template = setup(
+        archive,
+        output,
+        extra_context={"project_slug": "fabricius", "module": "core"},
+        no_prompt=True,
+        hooks_mode="in-process",
+    )
+    template.commit()
+
+    assert output.joinpath("README.md").read_text() == "# fabricius"
+    assert output.joinpath("src", "core", "main.py").read_text() == "print('core')"
+    assert output.joinpath("logo.png").read_bytes() == b"\x89PNG\r\n\x1a\n\xff{{"
+    assert output.joinpath("LICENSE").read_text() == "MIT"
+    assert output.joinpath("hooked.txt").read_text() == "core"
+
+
+def test_cookiecutter_headless(cookiecutter_template: pathlib.Path, tmp_path: pathlib.Path):
+    """
+    Test that a run without prompt nor progress bar never imports Rich.
+    """
+    output = tmp_path.joinpath("output")
+    code = (
+        "import sys\n"
+        "from fabricius.readers.cookiecutter.setup import run, setup\n"
+        f"template = setup({str(cookiecutter_template)!r}, {str(output)!r}, no_prompt=True,"
+        " extra_context={'project_slug': 'headless'})\n"
+        "run(template, no_prompt=True, progress=False)\n"
+        "assert not [module for module in sys.modules if module.startswith('rich')]\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+    assert output.joinpath("README.md").read_text() == "# headless"
+
+
+def test_cookiecutter_watch(cookiecutter_template: pathlib.Path, tmp_path: pathlib.Path):
+    """
+    Test that watching a template only regenerates the files affected by a change.
+    """
+    import queue
+    import threading
+
+    from fabricius.readers.cookiecutter.watch import watch
+
+    cookiecutter_template.joinpath("templates").mkdir()
+    cookiecutter_template.joinpath("templates", "header.txt").write_text("# Header")
+    main = cookiecutter_template.joinpath(
+        "{{cookiecutter.project_slug}}", "src", "{{cookiecutter.module}}", "main.py"
+    )
+    main.write_text("{% include 'header.txt' %}\nprint('{{ cookiecutter.module }}')")
+    output = tmp_path.joinpath("output")
+
+    updates: "queue.Queue[list[str]]" = queue.Queue()
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch,
+        args=(cookiecutter_template, output),
+        kwargs={
+            "polling": True,
+            "debounce": 0.05,
+            "stop": stop,
+            "callback": lambda results, _: updates.put(
+                sorted(result["destination"].name for result in results)
+            ),
+        },
+    )
+    thread.start()
+    try:
+        assert updates.get(timeout=10) == ["README.md", "__init__.py", "main.py"]
+        assert output.joinpath("src", "module", "main.py").read_text() == (
+            "# Header\nprint('module')"
+        )
+
+        cookiecutter_template.joinpath("templates", "header.txt").write_text("# Changed")
+        assert updates.get(timeout=10) == ["main.py"]
+        assert output.joinpath("src", "module", "main.py").read_text() == (
+            "# Changed\nprint('module')"
+        )
+
+        cookiecutter_template.joinpath("{{cookiecutter.project_slug}}", "README.md").write_text(
+            "# {{ cookiecutter.project_slug }}!"
+        )
+        assert updates.get(timeout=10) == ["README.md"]
+        assert output.joinpath("README.md").read_text() == "# project!"
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_cookiecutter_lazy_context(cookiecutter_template: pathlib.Path, tmp_path: pathlib.Path):
+    """
+    Test that lazy answers are only resolved if the template uses them.
+    """
+    from fabricius.types import Lazy
+
+    cookiecutter_template.joinpath("{{cookiecutter.project_slug}}", "context.json").write_text(
+        "{{ cookiecutter | jsonify }}"
+    )
+    unused = Lazy(lambda: "unused")
+    output = tmp_path.joinpath("output")
+    template = prepare(cookiecutter_template).build(
+        {
+            "project_slug": "project",
+            "module": Lazy(lambda: "lazy"),
+            "docker": False,
+            "extra": unused,
+        },
+        output,
+    )
+    template.files = [file for file in template.files if file.name != "context.json"]
+    template.commit()
+
+    assert output.joinpath("src", "lazy", "main.py").read_text() == "print('lazy')"
+    assert not unused.resolved
+
+    template = prepare(cookiecutter_template).build(
+        {"module": Lazy(lambda: "lazy")}, tmp_path.joinpath("json")
+    )
+    template.commit()
+    assert json.loads(tmp_path.joinpath("json", "context.json").read_text())["module"] == "lazy"
@@ -49,6 +49,14 @@ class TestFile(unittest.TestCase):
         file.from_content("Hello! I am {name} with some content")
         self.assertEqual("Hello! I am {name} with some content", file.content)
 
+        file.from_file(self.TEMPLATE_PATH.joinpath("python_template.txt"), lazy=True)
+        self.assertTrue(file.has_content)
+        self.assertEqual(file_content, file.content)
+
+        file.from_file(self.TEMPLATE_PATH.joinpath("idonotexist.txt"), lazy=True)
+        with self.assertRaises(FileNotFoundError):
+            file.content
+
     def test_file_destination(self):
         """
         Test File's proper destination.
@@ -1,4 +1,7 @@
+import json
 import re
+import subprocess
+import sys
 
 from fabricius import __version__ as fabricius_version
 from fabricius.utils import calculate_text_color
@@ -17,3 +20,32 @@ def test_version_is_semantic():
 def test_color_calculation():
     assert calculate_text_color("black") == "bright_white"
     assert calculate_text_color("bright_white") == "black"
+
+
+IMPORT_BUDGET = 0.5
+"""
+The time, in seconds, importing Fabricius and generating a file with str.format may take.
+"""
+
+
+def test_import_time():
+    """
+    Test that importing Fabricius does not import unused template engines, nor the package's
+    metadata, and stays within its budget.
+    """
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "from fabricius.models.file import File\n"
+        "File('test').from_content('{name}').with_data({'name': 'Fabricius'}).generate()\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout
+    result = json.loads(output)
+
+    for module in ("jinja2", "chevron", "importlib.metadata", "tarfile", "zipfile"):
+        assert module not in result["modules"], f"{module} was imported"
+    assert result["elapsed"] < IMPORT_BUDGET
@@ -0,0 +1,42 @@
+import json
+import pstats
+
+from fabricius.app.profiling import PROFILE_ENVIRONMENT_VARIABLE
+from fabricius.models.file import File
+from fabricius.models.template import Template
+from fabricius.renderers import PythonFormatRenderer
+
+
+def make_template(path) -> Template[type[PythonFormatRenderer]]:
+    template = Template(path, PythonFormatRenderer)
+    template.add_files(
+        File(f"{index}.txt").from_content("{index}").to_directory(path) for index in range(3)
+    )
+    template.push_data({"index": 1})
+    return template
+
+
+def test_profile_trace(tmp_path):
+    """
+    Test the capture of a Chrome trace.
+    """
+    output = tmp_path.joinpath("trace.json")
+    make_template(tmp_path.joinpath("project")).commit(profile=output)
+
+    events = json.loads(output.read_text())["traceEvents"]
+    categories = [event["cat"] for event in events]
+    assert categories.count("file") == 3
+    assert categories.count("render") == 3
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+
+
+def test_profile_cprofile(tmp_path, monkeypatch):
+    """
+    Test the capture of a cProfile profile, through the environment variable.
+    """
+    output = tmp_path.joinpath("commit.prof")
+    monkeypatch.setenv(PROFILE_ENVIRONMENT_VARIABLE, str(output))
+    make_template(tmp_path.joinpath("project")).commit()
+
+    stats = pstats.Stats(str(output))
+    assert any(function == "commit" for _, _, function in stats.stats)  # type: ignore
@@ -1,11 +1,24 @@
+import collections
+import importlib.metadata
+import sys
+
 import pytest
+from jinja2 import DictLoader, Environment
 
+from fabricius.exceptions import RendererNotFoundError
 from fabricius.models.renderer import Renderer
 from fabricius.renderers import (
     ChevronRenderer,
+    JinjaRenderer,
     PythonFormatRenderer,
     StringTemplateRenderer,
 )
+from fabricius.renderers.registry import (
+    ENTRY_POINT_GROUP,
+    EXTENSIONS_ENTRY_POINT_GROUP,
+    RendererRegistry,
+)
+from fabricius.types import Lazy
 
 
 @pytest.fixture
@@ -68,3 +81,139 @@ def test_chevron_renderer():
         result
         == "Hello Chevron\nYou have just won 10000 dollars!\nWell, 6000.0 dollars, after taxes."
     )
+
+
+def test_jinja_renderer_dependencies():
+    """
+    Test Jinja renderer's dependency tracking.
+    """
+
+    class PartialsRenderer(JinjaRenderer):
+        environment = Environment(
+            loader=DictLoader(
+                {
+                    "base.jinja": "Base: {% block body %}{% endblock %}",
+                    "header.jinja": "Header of {{ name }}",
+                    "footer.jinja": "{% include 'signature.jinja' %}",
+                    "signature.jinja": "Signed",
+                }
+            )
+        )
+
+    content = (
+        "{% extends 'base.jinja' %}{% block body %}{% include 'header.jinja' %}"
+        "{% if never %}{% include 'footer.jinja' %}{% endif %}{% endblock %}"
+    )
+    expected = {"base.jinja", "header.jinja", "footer.jinja", "signature.jinja"}
+
+    renderer = PartialsRenderer({"name": "Jinja"})
+    assert renderer.render(content) == "Base: Header of Jinja"
+    assert renderer.dependencies == expected
+
+    # Templates are now cached by Jinja, they must still be tracked.
+    renderer = PartialsRenderer({"name": "Jinja"})
+    renderer.render(content)
+    assert renderer.dependencies == expected
+
+    renderer = PartialsRenderer({"partial": "signature.jinja"})
+    assert renderer.render("{% include partial %}") == "Signed"
+    assert renderer.dependencies == {"signature.jinja"}
+
+    renderer = PartialsRenderer({})
+    renderer.render("No dependencies")
+    assert renderer.dependencies == set()
+
+
+def test_renderer_registry(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test the renderer registry, and that plugins are only imported once requested.
+    """
+    tmp_path.joinpath("shout_plugin.py").write_text(
+        "from fabricius.models.renderer import Renderer\n"
+        "class ShoutRenderer(Renderer):\n"
+        "    def render(self, content):\n"
+        "        return content.upper()\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    entry_points = {
+        ENTRY_POINT_GROUP: [
+            importlib.metadata.EntryPoint("shout", "shout_plugin:ShoutRenderer", ENTRY_POINT_GROUP)
+        ],
+        EXTENSIONS_ENTRY_POINT_GROUP: [
+            importlib.metadata.EntryPoint(".shout", "shout", EXTENSIONS_ENTRY_POINT_GROUP)
+        ],
+    }
+    monkeypatch.setattr(importlib.metadata, "entry_points", lambda group: entry_points[group])
+
+    registry = RendererRegistry()
+    assert registry.get("jinja") is JinjaRenderer
+    assert registry.get_for("README.md.j2") is JinjaRenderer
+    assert "shout_plugin" not in sys.modules
+
+    assert registry.match("hello.txt.shout") == (".shout", "shout")
+    assert "shout_plugin" not in sys.modules
+    assert registry.get_for("hello.txt.shout")({}).render("hello") == "HELLO"
+    assert registry.get_for("hello.txt") is None
+    assert "shout" in registry.names
+
+    with pytest.raises(RendererNotFoundError):
+        registry.get("handlebars")
+
+
+def test_lazy_data():
+    """
+    Test that lazy values are only resolved when a template uses them, and only once.
+    """
+    calls: list[str] = []
+
+    def provider(name: str) -> Lazy[str]:
+        def provide() -> str:
+            calls.append(name)
+            return name.upper()
+
+        return Lazy(provide)
+
+    data = {
+        "used": provider("used"),
+        "unused": provider("unused"),
+        "partial": provider("partial"),
+        "nested": {"used": provider("nested used"), "unused": provider("nested unused")},
+    }
+
+    class PartialRenderer(JinjaRenderer):
+        environment = Environment(loader=DictLoader({"partial.txt": "{{ partial }}"}))
+
+    renderer = PartialRenderer(data)
+    assert renderer.render("{{ used }} {{ nested.used }} {% include 'partial.txt' %}") == (
+        "USED NESTED USED PARTIAL"
+    )
+    assert renderer.render("{{ used }}") == "USED"
+    assert sorted(calls) == ["nested used", "partial", "used"]
+    assert not data["unused"].resolved
+    calls.clear()
+
+    assert PythonFormatRenderer(data).render("{used} {nested[unused]} {missing}") == (
+        "USED NESTED UNUSED "
+    )
+    assert StringTemplateRenderer(data).render("$unused") == "UNUSED"
+    assert ChevronRenderer(data).render("{{nested.used}}") == "NESTED USED"
+    assert calls == ["nested unused", "unused"]
+
+
+def test_lazy_data_containers():
+    """
+    Test that lazy values are resolved inside of any mapping, list or tuple.
+    """
+    point = collections.namedtuple("point", "x y")
+    data = {
+        "ordered": collections.OrderedDict(x=Lazy(lambda: "ordered")),
+        "items": [Lazy(lambda: "first"), {"nested": Lazy(lambda: "nested")}],
+        "pair": (Lazy(lambda: "left"), "right"),
+        "point": point(Lazy(lambda: 1), 2),
+    }
+
+    template = "{{ ordered.x }} {{ items[0] }} {{ items[1].nested }} {{ pair[0] }} {{ point.x }}"
+    assert JinjaRenderer(data).render(template) == "ordered first nested left 1"
+    assert PythonFormatRenderer(data).render("{ordered[x]} {items[0]} {pair[0]}") == (
+        "ordered first left"
+    )
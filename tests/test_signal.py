@@ -0,0 +1,235 @@
+import gc
+import pathlib
+import threading
+import typing
+
+from fabricius.app.signals import after_file_commit, after_template_commit
+from fabricius.models.file import File
+from fabricius.models.signal import Signal, ThreadedDispatcher
+from fabricius.models.template import Template
+from fabricius.renderers import PythonFormatRenderer
+
+
+def test_signal_send():
+    """
+    Test Signal's sending.
+    """
+    signal = Signal()
+    assert len(signal.send()) == 0
+
+    def listener(value: int) -> int:
+        return value * 2
+
+    def not_implemented(value: int) -> int:
+        raise NotImplementedError()
+
+    signal.connect(listener)
+    signal.connect(listener)
+    signal.connect(not_implemented)
+    assert signal.send(2) == [4]
+
+    signal.disconnect(listener)
+    assert len(signal.send(2)) == 0
+
+
+def test_signal_weak_listener():
+    """
+    Test Signal's weak listeners.
+    """
+
+    class Listener:
+        def on_send(self) -> str:
+            return "method"
+
+    def function() -> str:
+        return "function"
+
+    signal = Signal()
+    listener = Listener()
+    signal.connect(listener.on_send, weak=True)
+    signal.connect(function, weak=True)
+    assert signal.send() == ["method", "function"]
+
+    signal.disconnect(function)
+    del listener
+    gc.collect()
+    assert len(signal.send()) == 0
+    assert signal.listeners == []
+
+
+def test_signal_parent():
+    """
+    Test Signal's parent is sent after the signal.
+    """
+    parent = Signal()
+    signal = Signal(parent=parent)
+    parent.connect(lambda: "parent")
+    signal.connect(lambda: "child")
+
+    assert signal.send() == ["child", "parent"]
+    assert parent.send() == ["parent"]
+
+
+def test_scoped_signals(tmp_path):
+    """
+    Test the signals scoped to templates and files.
+    """
+    received: list[str] = []
+
+    def on_global(file: File, result: object) -> None:
+        received.append(f"global:{file.name}")
+
+    template = Template(tmp_path, PythonFormatRenderer)
+    first = File("first.txt").from_content("First").to_directory(tmp_path)
+    second = File("second.txt").from_content("Second").to_directory(tmp_path)
+    template.add_files([first, second])
+
+    first.signals.after_file_commit.connect(lambda file, _: received.append(f"file:{file.name}"))
+    template.signals.after_file_commit.connect(
+        lambda file, _: received.append(f"template:{file.name}")
+    )
+    template.signals.after_template_commit.connect(lambda *_: received.append("template"))
+    after_file_commit.connect(on_global)
+    try:
+        template.commit()
+    finally:
+        after_file_commit.disconnect(on_global)
+
+    assert received == [
+        "file:first.txt",
+        "template:first.txt",
+        "global:first.txt",
+        "template:second.txt",
+        "global:second.txt",
+        "template",
+    ]
+
+    # Scoped listeners are disconnected once committed.
+    assert first.signals.after_file_commit.listeners == []
+    assert template.signals.after_file_commit.listeners == []
+    assert template.signals.after_template_commit.listeners == []
+    assert after_template_commit.listeners == []
+
+
+def test_threaded_dispatcher(tmp_path):
+    """
+    Test the delivery of signals on another thread.
+    """
+    received: list[tuple[str, str]] = []
+    dispatcher = ThreadedDispatcher(maxsize=2)
+
+    template = Template(tmp_path, PythonFormatRenderer)
+    template.add_files(
+        File(f"{index}.txt").from_content("Content").to_directory(tmp_path) for index in range(20)
+    )
+    template.signals.after_file_commit.connect(
+        lambda file, _: received.append((file.name, threading.current_thread().name)),
+        dispatcher=dispatcher,
+    )
+
+    results = template.commit()
+
+    # Everything was delivered once the commit is done, in order.
+    assert [name for name, _ in received] == [result["name"] for result in results]
+    assert {thread for _, thread in received} == {"fabricius-signals"}
+
+
+def test_threaded_dispatcher_full():
+    """
+    Test the behavior of a dispatcher whose queue is full.
+    """
+    release = threading.Event()
+    received: list[int] = []
+
+    def listener(value: int) -> None:
+        release.wait()
+        received.append(value)
+
+    signal = Signal()
+    dispatcher = ThreadedDispatcher(maxsize=1, on_full="drop")
+    signal.connect(listener, dispatcher=dispatcher)
+
+    for value in range(5):
+        signal.send(value)
+    release.set()
+    dispatcher.flush()
+
+    # One is being delivered, one waits in the queue.
+    assert dispatcher.dropped >= 3
+    assert received == sorted(received)
+
+
+def test_threaded_dispatcher_scoped_flush(tmp_path: pathlib.Path):
+    """
+    Test that a commit only waits for the dispatchers of its own signals, and that a listener
+    of a dispatcher can commit a template without waiting for itself.
+    """
+    release = threading.Event()
+    unrelated = ThreadedDispatcher()
+    blocked = Signal()
+    blocked.connect(lambda: release.wait(), dispatcher=unrelated)
+    blocked.send()
+
+    committed = threading.Event()
+
+    def commit_nested(*_: typing.Any) -> None:
+        nested = Template(tmp_path, PythonFormatRenderer)
+        nested.add_file(File("nested.txt").from_content("Nested").to_directory(tmp_path))
+        nested.signals.after_file_commit.connect(lambda *_: None, dispatcher=dispatcher)
+        nested.commit()
+        committed.set()
+
+    dispatcher = ThreadedDispatcher()
+    template = Template(tmp_path, PythonFormatRenderer)
+    template.add_file(File("first.txt").from_content("First").to_directory(tmp_path))
+    template.signals.after_template_commit.connect(commit_nested, dispatcher=dispatcher)
+
+    # Would block forever on the unrelated dispatcher, or on the nested commit.
+    template.commit()
+    assert committed.wait(5)
+    assert tmp_path.joinpath("nested.txt").read_text() == "Nested"
+    release.set()
+
+
+def test_threaded_dispatcher_file_signals(tmp_path: pathlib.Path):
+    """
+    Test that a commit waits for the dispatchers of its files' own signals, then stops the
+    dispatchers' threads.
+    """
+    delivered: list[str] = []
+    threads: list[threading.Thread] = []
+
+    def slow(file: File, *_: typing.Any) -> None:
+        threading.Event().wait(0.2)
+        delivered.append(file.name)
+        threads.append(threading.current_thread())
+
+    dispatcher = ThreadedDispatcher()
+    file = File("scoped.txt").from_content("Scoped").to_directory(tmp_path)
+    file.signals.after_file_commit.connect(slow, dispatcher=dispatcher)
+    template = Template(tmp_path, PythonFormatRenderer)
+    template.add_file(file)
+
+    template.commit()
+    assert delivered == ["scoped.txt"]
+    assert not threads[0].is_alive()
+
+
+def test_threaded_dispatcher_close():
+    """
+    Test that closing a dispatcher delivers its queued events, and that it can still be used.
+    """
+    delivered: list[int] = []
+    dispatcher = ThreadedDispatcher()
+    signal = Signal()
+    signal.connect(delivered.append, dispatcher=dispatcher)
+
+    signal.send(1)
+    signal.send(2)
+    dispatcher.close()
+    assert delivered == [1, 2]
+
+    signal.send(3)
+    dispatcher.flush()
+    assert delivered == [1, 2, 3]
+    dispatcher.close()
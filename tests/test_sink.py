@@ -0,0 +1,90 @@
+import io
+import pathlib
+import tarfile
+import zipfile
+
+import pytest
+
+from fabricius.models.file import File
+from fabricius.models.template import Template
+from fabricius.renderers import PythonFormatRenderer
+from fabricius.sinks import MemorySink, TarSink, ZipSink
+
+ROOT = pathlib.Path("/", "fabricius", "project").resolve()
+
+
+class Unseekable(io.RawIOBase):
+    """
+    A stream that can only be written to, like a response's body.
+    """
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self.data.extend(data)
+        return len(data)
+
+
+@pytest.fixture
+def template() -> Template[type[PythonFormatRenderer]]:
+    template = Template(ROOT, PythonFormatRenderer)
+    template.add_files(
+        [
+            File("README.md").from_content("# {name}").to_directory(ROOT),
+            File("__init__.py").from_content("").to_directory(ROOT.joinpath("src")),
+            File("__main__.py").from_content("").to_directory(ROOT.joinpath("src")),
+        ]
+    )
+    template.push_data({"name": "Sinks"})
+    return template
+
+
+def test_memory_sink(template: Template[type[PythonFormatRenderer]]):
+    """
+    Test the memory sink.
+    """
+    sink = MemorySink()
+    template.commit(sink=sink)
+
+    assert sink.files == {
+        ROOT.joinpath("README.md"): "# Sinks",
+        ROOT.joinpath("src", "__init__.py"): "",
+        ROOT.joinpath("src", "__main__.py"): "",
+    }
+    assert not ROOT.exists()
+
+    with pytest.raises(FileExistsError):
+        File("README.md").from_content("Again").to_directory(ROOT).commit(sink=sink)
+
+
+def test_zip_sink(template: Template[type[PythonFormatRenderer]]):
+    """
+    Test the zip sink, streamed into an unseekable body.
+    """
+    body = Unseekable()
+    with ZipSink(body, root=ROOT) as sink:
+        template.commit(sink=sink)
+
+    with zipfile.ZipFile(io.BytesIO(body.data)) as archive:
+        assert sorted(archive.namelist()) == ["README.md", "src/__init__.py", "src/__main__.py"]
+        assert archive.read("README.md") == b"# Sinks"
+
+
+def test_tar_sink(template: Template[type[PythonFormatRenderer]]):
+    """
+    Test the tar sink, with compression and hard links.
+    """
+    body = Unseekable()
+    with TarSink(body, root=ROOT, compression="gz") as sink:
+        template.commit(sink=sink, link="hardlink")
+
+    with tarfile.open(fileobj=io.BytesIO(body.data), mode="r:gz") as archive:
+        members = {member.name: member for member in archive.getmembers()}
+        assert sorted(members) == ["README.md", "src/__init__.py", "src/__main__.py"]
+        assert members["src/__main__.py"].islnk()
+        assert members["src/__main__.py"].linkname == "src/__init__.py"
+        assert archive.extractfile("README.md").read() == b"# Sinks"  # type: ignore
@@ -0,0 +1,210 @@
+import pathlib
+import shutil
+import unittest
+
+from fabricius.exceptions import ConflictError
+from fabricius.models.file import File
+from fabricius.models.renderer import Renderer
+from fabricius.models.stats import TemplateStats
+from fabricius.models.template import Template
+from fabricius.renderers import PythonFormatRenderer
+
+
+class CountingRenderer(Renderer):
+    renders = 0
+
+    def render(self, content: str) -> str:
+        CountingRenderer.renders += 1
+        return content.format_map(self.data)
+
+
+class TestTemplate(unittest.TestCase):
+    """
+    Test Fabricius's Template.
+    """
+
+    DESTINATION_PATH = pathlib.Path(__file__, "..", "results", "template").resolve()
+
+    def setUp(self) -> None:
+        shutil.rmtree(self.DESTINATION_PATH, ignore_errors=True)
+        CountingRenderer.renders = 0
+
+    def make_files(self, *names: str, content: str = "Hello {name}!") -> list[File]:
+        return [
+            File(name)
+            .from_content(content)
+            .to_directory(self.DESTINATION_PATH)
+            .with_renderer(CountingRenderer)
+            for name in names
+        ]
+
+    def test_template_commit(self):
+        """
+        Test Template's proper commit.
+        """
+        template = Template(self.DESTINATION_PATH, PythonFormatRenderer)
+        template.add_files(self.make_files("first.txt", "second.txt"))
+        template.push_data({"name": "Template"})
+
+        results = template.commit()
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(CountingRenderer.renders, 2)
+        for result in results:
+            self.assertEqual(result["state"], "persisted")
+            self.assertEqual(result["destination"].read_text(), "Hello Template!")
+
+    def test_template_commit_jobs(self):
+        """
+        Test Template's commit with files rendered concurrently.
+        """
+        names = [f"file_{index}.txt" for index in range(20)]
+        template = Template(self.DESTINATION_PATH, PythonFormatRenderer)
+        template.add_files(self.make_files(*names))
+        template.push_data({"name": "Jobs"})
+
+        results = template.commit(jobs=4)
+
+        self.assertEqual([result["name"] for result in results], names)
+        self.assertEqual(CountingRenderer.renders, 20)
+        for result in results:
+            self.assertEqual(result["destination"].read_text(), "Hello Jobs!")
+
+    def test_template_empty_file(self):
+        """
+        Test Template's commit of empty files.
+        """
+        template = Template(self.DESTINATION_PATH, PythonFormatRenderer)
+        template.add_files(self.make_files("__init__.py", content=""))
+
+        results = template.commit()
+
+        self.assertEqual(results[0]["state"], "persisted")
+        self.assertEqual(results[0]["destination"].read_text(), "")
+
+    def test_template_deduplicate(self):
+        """
+        Test Template's deduplication of identical files.
+        """
+        template = Template(self.DESTINATION_PATH, PythonFormatRenderer)
+        template.add_files(self.make_files("first.txt", "second.txt", "third.txt"))
+        template.add_files(self.make_files("other.txt", content="Hello Template!"))
+        template.push_data({"name": "Template"})
+
+        results = template.commit(deduplicate=True, link="hardlink")
+
+        self.assertEqual(CountingRenderer.renders, 2)
+        inodes = {result["destination"].stat().st_ino for result in results}
+        self.assertEqual(len(inodes), 1)
+        for result in results:
+            self.assertEqual(result["content"], "Hello Template!")
+            self.assertEqual(result["destination"].read_text(), "Hello Template!")
+
+    def test_template_from_directory(self):
+        """
+        Test Template's creation from a directory.
+        """
+        source = self.DESTINATION_PATH.joinpath("source")
+        for path, content in {
+            "README.md": "# {name}",
+            "src/main.py": "print('{name}')",
+            "src/main.pyc": "",
+            "docs/index.md": "{name}'s docs",
+            "build/output.txt": "",
+            "src/build/keep.txt": "Kept",
+        }.items():
+            source.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+            source.joinpath(path).write_text(content)
+
+        output = self.DESTINATION_PATH.joinpath("output")
+        template = Template.from_directory(
+            source, output, PythonFormatRenderer, exclude=["*.pyc", "/build/"]
+        )
+        files = {file.compute_destination(): file for file in template.files}
+        self.assertEqual(
+            set(files),
+            {
+                output.joinpath("README.md"),
+                output.joinpath("src", "main.py"),
+                output.joinpath("docs", "index.md"),
+                output.joinpath("src", "build", "keep.txt"),
+            },
+        )
+        # Files are only read once needed.
+        self.assertIsNone(files[output.joinpath("README.md")]._content)
+
+        template.push_data({"name": "Directory"})
+        template.commit()
+        self.assertEqual(output.joinpath("src", "main.py").read_text(), "print('Directory')")
+
+        template = Template.from_directory(
+            source, output, PythonFormatRenderer, include=["docs/", "*.md"]
+        )
+        self.assertEqual(
+            {file.compute_destination() for file in template.files},
+            {output.joinpath("README.md"), output.joinpath("docs", "index.md")},
+        )
+
+    def test_template_from_directory_by_extension(self):
+        """
+        Test Template's creation from a directory, where files are rendered by the renderer of
+        their extension.
+        """
+        source = self.DESTINATION_PATH.joinpath("source")
+        source.mkdir(parents=True)
+        source.joinpath("README.md.j2").write_text("# {{ name }}")
+        source.joinpath("LICENSE.mustache").write_text("{{ name }} authors")
+        source.joinpath("main.py").write_text("print('{name}')")
+
+        output = self.DESTINATION_PATH.joinpath("output")
+        template = Template.from_directory(source, output, PythonFormatRenderer, by_extension=True)
+        template.push_data({"name": "Mixed"})
+        template.commit()
+
+        self.assertEqual(output.joinpath("README.md").read_text(), "# Mixed")
+        self.assertEqual(output.joinpath("LICENSE").read_text(), "Mixed authors")
+        self.assertEqual(output.joinpath("main.py").read_text(), "print('Mixed')")
+
+        # Rendered without its extension, it conflicts with README.md.
+        source.joinpath("README.md").write_text("# Plain")
+        with self.assertRaises(ConflictError):
+            Template.from_directory(source, output, PythonFormatRenderer, by_extension=True)
+
+    def test_template_from_directory_symlink_loop(self):
+        """
+        Test that symbolic links to directories are not followed, so that loops end.
+        """
+        source = self.DESTINATION_PATH.joinpath("source")
+        source.joinpath("nested").mkdir(parents=True)
+        source.joinpath("nested", "file.txt").write_text("{name}")
+        source.joinpath("nested", "loop").symlink_to(source, target_is_directory=True)
+
+        template = Template.from_directory(
+            source, self.DESTINATION_PATH.joinpath("output"), PythonFormatRenderer
+        )
+        self.assertEqual([file.name for file in template.files], ["file.txt"])
+
+    def test_template_timings(self):
+        """
+        Test Template's timings & statistics.
+        """
+        received: list[TemplateStats] = []
+        template = Template(self.DESTINATION_PATH, PythonFormatRenderer)
+        template.add_files(self.make_files("first.txt", "second.txt"))
+        template.push_data({"name": "Stats"})
+        template.signals.on_template_stats.connect(lambda _, stats: received.append(stats))
+
+        results = template.commit(timings=True)
+
+        self.assertIs(received[0], template.stats)
+        stats = received[0]
+        self.assertEqual(stats.files, 2)
+        self.assertEqual(stats.bytes_written, 2 * len("Hello Stats!"))
+        self.assertGreater(stats.total, 0)
+        self.assertGreater(stats.phases["write"], 0)
+        for result in results:
+            self.assertEqual(result["bytes_written"], len("Hello Stats!"))
+            self.assertIsNotNone(result["timings"])
+
+        file = self.make_files("third.txt", content="Hello!")[0]
+        self.assertIsNone(file.commit()["timings"])
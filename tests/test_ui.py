@@ -0,0 +1,69 @@
+import io
+import logging
+
+from rich.console import Console
+
+from fabricius.app.headless import LogProgress
+from fabricius.app.signals import after_file_commit
+from fabricius.app.ui import TemplateProgressBar
+from fabricius.models.file import File
+from fabricius.models.template import Template
+from fabricius.renderers import PythonFormatRenderer
+
+
+def make_template(path) -> Template[type[PythonFormatRenderer]]:
+    template = Template(path, PythonFormatRenderer)
+    template.add_files(
+        File(f"{index}.txt").from_content("é" * index).to_directory(path) for index in range(10)
+    )
+    return template
+
+
+def test_progress_bar(tmp_path):
+    """
+    Test the progress bar aggregates the committed files.
+    """
+    console = Console(file=io.StringIO(), force_terminal=True)
+    progress = TemplateProgressBar(10, refresh_per_second=1, console=console)
+
+    with progress.begin("Testing"):
+        make_template(tmp_path).commit()
+
+    task = progress.progress.tasks[0]
+    assert task.completed == 10
+    assert task.fields["bytes"] == sum(2 * index for index in range(10))
+    assert progress._increase not in after_file_commit.listeners
+
+
+def test_progress_bar_not_terminal(tmp_path):
+    """
+    Test the progress bar does nothing when the console is not a terminal.
+    """
+    output = io.StringIO()
+    progress = TemplateProgressBar(10, console=Console(file=output))
+
+    with progress.begin("Testing"):
+        assert progress._increase not in after_file_commit.listeners
+        make_template(tmp_path).commit()
+
+    assert not progress.enabled
+    assert output.getvalue() == ""
+
+
+def test_log_progress(tmp_path, caplog):
+    """
+    Test the progress is logged when there's no progress bar.
+    """
+    progress = LogProgress(10, interval=0)
+
+    with caplog.at_level(logging.INFO, logger="fabricius.app.headless"):
+        with progress.begin("Testing"):
+            make_template(tmp_path).commit()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages[0] == "Testing"
+    assert messages[-1].startswith(
+        f"Committed 10/10 files ({sum(2 * i for i in range(10))} bytes)"
+    )
+    assert len(messages) == 12
+    assert progress._increase not in after_file_commit.listeners
@@ -0,0 +1,71 @@
+import pathlib
+import sys
+
+import pytest
+
+from fabricius.app.watch import (
+    IncrementalCommit,
+    InotifyWatcher,
+    PollingWatcher,
+    Watcher,
+)
+from fabricius.models.template import Template
+from fabricius.renderers.python_format import PythonFormatRenderer
+
+
+@pytest.mark.parametrize(
+    "watcher_class",
+    [
+        PollingWatcher,
+        pytest.param(
+            InotifyWatcher,
+            marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only"),
+        ),
+    ],
+)
+def test_watcher(tmp_path: pathlib.Path, watcher_class: type[Watcher]):
+    """
+    Test that watchers report created, modified & deleted files, including inside new folders.
+    """
+    tmp_path.joinpath("file.txt").write_text("content")
+    with watcher_class([tmp_path]) as watcher:
+        assert watcher.wait(0.3) == set()
+
+        tmp_path.joinpath("file.txt").write_text("modified content")
+        assert tmp_path.joinpath("file.txt") in watcher.wait(2)
+
+        tmp_path.joinpath("folder").mkdir()
+        watcher.wait(0.3)
+        tmp_path.joinpath("folder", "new.txt").write_text("new")
+        assert tmp_path.joinpath("folder", "new.txt") in watcher.wait(2)
+
+        tmp_path.joinpath("file.txt").unlink()
+        assert tmp_path.joinpath("file.txt") in watcher.wait(2)
+
+
+def test_incremental_commit(tmp_path: pathlib.Path):
+    """
+    Test that only the files whose source or data changed are committed again.
+    """
+    source = tmp_path.joinpath("source")
+    source.mkdir()
+    source.joinpath("a.txt").write_text("{name} A")
+    source.joinpath("b.txt").write_text("{name} B")
+    output = tmp_path.joinpath("output")
+
+    def build(name: str) -> Template[type[PythonFormatRenderer]]:
+        return Template.from_directory(source, output, PythonFormatRenderer).push_data(
+            {"name": name}
+        )
+
+    incremental = IncrementalCommit()
+    assert len(incremental.commit(build("first"))) == 2
+    assert incremental.commit(build("first")) == []
+
+    source.joinpath("b.txt").write_text("{name} B, modified")
+    results = incremental.commit(build("first"), [source.joinpath("b.txt")])
+    assert [result["destination"].name for result in results] == ["b.txt"]
+    assert output.joinpath("b.txt").read_text() == "first B, modified"
+
+    assert len(incremental.commit(build("second"))) == 2
+    assert output.joinpath("a.txt").read_text() == "second A"